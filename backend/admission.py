@@ -0,0 +1,236 @@
+"""
+Lucky Loo - Admission Control
+Decides how many deliberations may run at once, and turns the rest away
+early instead of letting a burst of kiosk traffic pile up on Bedrock.
+
+The concurrency limit adapts AIMD-style (like TCP congestion control):
+- every deliberation that finishes without Bedrock throttling and under
+  ADMISSION_LATENCY_TARGET nudges the limit up by 1/limit (about +1 per
+  full round of deliberations), as long as the limit was actually in use
+- a throttled or slow deliberation multiplies it by ADMISSION_BACKOFF,
+  at most once per round so one throttling burst only counts once
+
+Pleas over the limit wait in a bounded queue. When the queue is full, or
+a plea has waited ADMISSION_QUEUE_TIMEOUT, CourtOverloaded is raised with
+a Retry-After estimate so the API can answer 429 straight away.
+
+Setting ADMISSION_MIN_LIMIT and ADMISSION_MAX_LIMIT to the same value
+gives a fixed limit.
+
+load() reports queue depth and the p95 of recent deliberations, for
+policies (like model routing) that react to how busy the Court is.
+"""
+
+import os
+import math
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+
+from bedrock_gateway import throttle_count
+
+
+ADMISSION_MIN_LIMIT = int(os.getenv("ADMISSION_MIN_LIMIT", "1"))
+ADMISSION_MAX_LIMIT = int(os.getenv("ADMISSION_MAX_LIMIT", "16"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "30"))
+ADMISSION_LATENCY_TARGET = float(os.getenv("ADMISSION_LATENCY_TARGET", "15"))
+ADMISSION_BACKOFF = float(os.getenv("ADMISSION_BACKOFF", "0.7"))
+ADMISSION_LATENCY_WINDOW = int(os.getenv("ADMISSION_LATENCY_WINDOW", "200"))
+
+# Bounds on the Retry-After hint, in seconds
+RETRY_AFTER_MIN = 1
+RETRY_AFTER_MAX = 60
+
+
+class CourtOverloaded(Exception):
+    """The Court is at capacity; try again in `retry_after` seconds."""
+
+    def __init__(self, retry_after: int, reason: str = "queue full"):
+        super().__init__(f"Court overloaded ({reason}), retry after {retry_after}s")
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    AIMD concurrency limit in front of the Court, with a bounded wait queue.
+
+    Usage:
+        try:
+            async with admission.admit():
+                ...deliberate...
+        except CourtOverloaded as e:
+            ...answer 429, Retry-After: e.retry_after...
+
+    State is guarded by a thread lock and each waiter is a future on its own
+    event loop, so one controller serves every loop in the process.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = ADMISSION_MIN_LIMIT,
+        max_limit: int = ADMISSION_MAX_LIMIT,
+        queue_size: int = ADMISSION_QUEUE_SIZE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        latency_target: float = ADMISSION_LATENCY_TARGET,
+        backoff: float = ADMISSION_BACKOFF,
+        latency_window: int = ADMISSION_LATENCY_WINDOW
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.backoff = backoff
+
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self._in_flight = 0
+        self._waiters = deque()
+        self._last_decrease = 0.0
+        self._mean_latency = None
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self._stats = {
+            "admitted": 0, "queued": 0, "rejected": 0, "timeouts": 0,
+            "throttled": 0, "slow": 0, "increases": 0, "decreases": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a deliberation slot for the duration of an async with-block."""
+        await self._acquire()
+        admitted = time.monotonic()
+        throttles = throttle_count()
+        try:
+            yield
+        finally:
+            self._release(admitted, time.monotonic() - admitted, throttle_count() > throttles)
+
+    def retry_after(self) -> int:
+        """Seconds a plea turned away now should wait before trying again."""
+        with self._lock:
+            return self._retry_after()
+
+    def load(self) -> dict:
+        """Queue depth and p95 deliberation latency over the recent window."""
+        with self._lock:
+            samples = sorted(self._latencies)
+            waiting = len(self._waiters)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+        return {"waiting": waiting, "p95_seconds": p95, "samples": len(samples)}
+
+    def queue_full(self) -> bool:
+        """Would a plea arriving now be turned away?"""
+        with self._lock:
+            return self._in_flight >= int(self.limit) and len(self._waiters) >= self.queue_size
+
+    async def _acquire(self):
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self.limit):
+                self._in_flight += 1
+                self._stats["admitted"] += 1
+                return
+            if len(self._waiters) >= self.queue_size:
+                self._stats["rejected"] += 1
+                raise CourtOverloaded(self._retry_after())
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._stats["queued"] += 1
+
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as e:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # The slot arrived just as we gave up - pass it on
+                    self._in_flight -= 1
+                    self._dispatch()
+                # Otherwise the slot is on its way and _grant passes it on
+                if isinstance(e, asyncio.TimeoutError):
+                    self._stats["timeouts"] += 1
+                    raise CourtOverloaded(self._retry_after(), "queue timeout") from None
+            raise
+
+        with self._lock:
+            self._stats["admitted"] += 1
+
+    def _dispatch(self):
+        """Hand free slots to waiting pleas. Call with the lock held."""
+        while self._waiters and self._in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            self._in_flight += 1
+            try:
+                waiter.get_loop().call_soon_threadsafe(self._grant, waiter)
+            except RuntimeError:
+                self._in_flight -= 1  # Its event loop is gone
+
+    def _grant(self, waiter: asyncio.Future):
+        # Runs on the waiter's loop, so it can't race its timeout
+        if not waiter.done():
+            waiter.set_result(None)
+            return
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def _release(self, admitted: float, latency: float, throttled: bool):
+        with self._lock:
+            self._adjust(admitted, latency, throttled)
+            self._in_flight -= 1
+            self._dispatch()
+
+    # ------------------------------------------------------------------
+    # AIMD
+    # ------------------------------------------------------------------
+
+    def _adjust(self, admitted: float, latency: float, throttled: bool):
+        """Move the limit after a deliberation. Call with the lock held."""
+        if self._mean_latency is None:
+            self._mean_latency = latency
+        else:
+            self._mean_latency = 0.8 * self._mean_latency + 0.2 * latency
+        self._latencies.append(latency)
+
+        slow = latency > self.latency_target
+        if throttled or slow:
+            self._stats["throttled" if throttled else "slow"] += 1
+            # Deliberations admitted before the last cut saw the old limit
+            if admitted > self._last_decrease:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = time.monotonic()
+                self._stats["decreases"] += 1
+            return
+
+        # Only grow a limit that's actually being used
+        if self._in_flight + len(self._waiters) >= int(self.limit) and self.limit < self.max_limit:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self._stats["increases"] += 1
+
+    def _retry_after(self) -> int:
+        """Seconds until the queue ahead of a new plea should have cleared."""
+        latency = self._mean_latency or self.latency_target / 2
+        rounds = (len(self._waiters) + 1) / max(1, int(self.limit))
+        return min(RETRY_AFTER_MAX, max(RETRY_AFTER_MIN, math.ceil(rounds * latency)))
+
+    def stats(self) -> dict:
+        load = self.load()
+        with self._lock:
+            return {
+                **self._stats,
+                "limit": round(self.limit, 2),
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "queue_size": self.queue_size,
+                "mean_latency_seconds": round(self._mean_latency or 0.0, 3),
+                "p95_latency_seconds": round(load["p95_seconds"], 3),
+            }
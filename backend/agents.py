@@ -5,25 +5,54 @@ AI Jury & Judge system using AWS Strands Agents with Bedrock Vision
 This module implements the "Agents-as-Tools" pattern where:
 - The Jury (Skeptic, Doctor, Gambler) are child agents
 - The Judge (Pit Boss) orchestrates them and delivers the final verdict
+
+Strands, boto3 and the steering prompts are only loaded on first real use,
+so importing this module in mock or demo mode stays cheap (see
+`python benchmark.py --startup`). warm_up() loads them ahead of time.
 """
 
 import os
 import json
+import logging
 import random
 import base64
-import boto3
+import time
+import asyncio
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, AsyncIterator, Callable, TYPE_CHECKING
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-from strands import Agent, tool
-from strands.models import BedrockModel
+from pydantic import ValidationError
 
 # Import mock responses for offline testing
-from mock_responses import get_mock_response
+from mock_responses import (
+    get_mock_response,
+    get_mock_jury_response,
+    get_mock_latency,
+    mock_latency_enabled,
+)
+from circuit_breaker import CircuitBreaker
+from admission import AdmissionController
+from model_routing import ModelRouter
+from hedging import hedger, HEDGE_REGION, HEDGE_MODEL_ID
+from metrics import timed, record_stage
+from token_usage import token_ledger, request_usage, estimate_tokens, format_usage
+from bedrock_gateway import build_bedrock_model, get_bedrock_runtime
+from json_stream import JsonObjectExtractor
+from schemas import VerdictResponse
+from vision import preprocess_image, preprocess_image_async, decode_image
+from vision_cache import vision_cache, image_cache_key, VISION_CACHE_ENABLED
+from plea_cache import plea_cache, plea_cache_key, PLEA_CACHE_ENABLED
+
+if TYPE_CHECKING:
+    from strands import Agent
 
 # Check if we're in mock mode (no AWS credentials)
 # TEMPORARILY SET TO TRUE TO DEBUG TIMEOUT ISSUE
@@ -33,6 +62,14 @@ MOCK_MODE = os.getenv("MOCK_MODE", "false").lower() == "true"
 STEERING_DIR = Path(__file__).parent / "steering"
 
 
+STEERING_FILES = {
+    "skeptic": "juror_skeptic.md",
+    "doctor": "juror_doctor.md",
+    "gambler": "juror_gambler.md",
+    "judge": "judge_pitboss.md",
+}
+
+
 def load_steering_prompt(filename: str) -> str:
     """Load a steering prompt from the steering directory."""
     filepath = STEERING_DIR / filename
@@ -41,6 +78,56 @@ def load_steering_prompt(filename: str) -> str:
     return ""
 
 
+@lru_cache(maxsize=None)
+def steering_prompt(role: str) -> str:
+    """A Court role's steering prompt, read on first use."""
+    return load_steering_prompt(STEERING_FILES[role])
+
+# Deliberations allowed in flight per process at startup - admission control
+# adapts it between ADMISSION_MIN_LIMIT and ADMISSION_MAX_LIMIT from there
+COURT_MAX_CONCURRENCY = int(os.getenv("COURT_MAX_CONCURRENCY", "4"))
+
+# How the jury is consulted:
+# - "agentic":  the Pit Boss calls each juror as a tool, one after another
+# - "parallel": all three jurors run concurrently, then the Pit Boss rules once
+# - "rules":    all three jurors run concurrently, then the verdict engine
+#               rules locally; the Pit Boss only writes the roast
+ORCHESTRATION_MODES = ("agentic", "parallel", "rules")
+COURT_ORCHESTRATION = os.getenv("COURT_ORCHESTRATION", "agentic").lower()
+
+# Where the roast comes from under the rules engine: "llm" or "template"
+COURT_ROAST_MODE = os.getenv("COURT_ROAST_MODE", "llm").lower()
+
+# Court pool - idle courts built ahead of time (the pool keeps up to the
+# admission limit once load raises it), how often they're rebuilt from
+# scratch, and the most messages any agent may hold during a single deliberation
+COURT_POOL_SIZE = int(os.getenv("COURT_POOL_SIZE", str(COURT_MAX_CONCURRENCY)))
+COURT_RECYCLE_AFTER = int(os.getenv("COURT_RECYCLE_AFTER", "100"))
+COURT_MAX_HISTORY = int(os.getenv("COURT_MAX_HISTORY", "20"))
+
+# Load Strands, boto3 and the court pool in the background when the API
+# starts, instead of on the first plea
+COURT_WARM_UP = os.getenv("COURT_WARM_UP", "true").lower() == "true"
+
+# Output budget (max_tokens) per model call for each agent - output length
+# is most of a call's latency, so jurors are kept short
+COURT_MAX_TOKENS = {
+    "skeptic": int(os.getenv("COURT_MAX_TOKENS_SKEPTIC", "400")),
+    "doctor": int(os.getenv("COURT_MAX_TOKENS_DOCTOR", "400")),
+    "gambler": int(os.getenv("COURT_MAX_TOKENS_GAMBLER", "400")),
+    "judge": int(os.getenv("COURT_MAX_TOKENS_JUDGE", "1024")),
+    "vision": int(os.getenv("COURT_MAX_TOKENS_VISION", "300")),
+}
+
+# Bedrock prompt caching for the static prefix of every call - steering
+# prompts, the Pit Boss's tool specs and case instructions. Bedrock only
+# caches a prefix past the model's minimum (1,024 tokens on Sonnet); shorter
+# ones are sent uncached at no extra cost. TTL is "5m" (default) or "1h".
+# Only used on models Bedrock can cache for (Claude, Nova).
+COURT_PROMPT_CACHE = os.getenv("COURT_PROMPT_CACHE", "true").lower() == "true"
+COURT_PROMPT_CACHE_TTL = os.getenv("COURT_PROMPT_CACHE_TTL", "") or None
+
+
 # Initialize Bedrock model - Claude Sonnet 4.5 with vision
 MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-sonnet-4-5-20250929-v1:0")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
@@ -48,42 +135,163 @@ AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 print(f"🎰 Using model: {MODEL_ID}")
 print(f"🌎 Region: {AWS_REGION}")
 
-bedrock_model = BedrockModel(
-    model_id=MODEL_ID,
-    region_name=AWS_REGION
-)
+# Strands models, one per (role, model ID, region) so each agent gets its own
+# max_tokens budget and can move between the models routed to it. Built on
+# first use.
+_agent_models: dict = {}
+_agent_models_lock = threading.Lock()
+
+
+def get_agent_model(role: str, hedge: bool = False, model_id: Optional[str] = None):
+    """
+    The Bedrock model for a Court role, on the primary or the hedge region.
+    Unless a model ID is given, it's the one currently routed to the role.
+    """
+    model_id = model_id or model_router.model_id(role)
+    region = AWS_REGION
+    if hedge:
+        model_id, region = HEDGE_MODEL_ID or model_id, HEDGE_REGION
+    key = (role, model_id, region)
+    with _agent_models_lock:
+        model = _agent_models.get(key)
+        if model is None:
+            model = build_bedrock_model(model_id, region, max_tokens=COURT_MAX_TOKENS[role])
+            _agent_models[key] = model
+        return model
+
+
+def prompt_cache_enabled(model_id: str = MODEL_ID) -> bool:
+    """Whether to mark cacheable prefixes on calls to this model."""
+    model_id = model_id.lower()
+    return COURT_PROMPT_CACHE and any(family in model_id for family in ("claude", "anthropic", "nova"))
 
-# Bedrock runtime client for direct vision calls
-bedrock_runtime = boto3.client(
-    service_name="bedrock-runtime",
-    region_name=AWS_REGION
-)
+
+def cache_point() -> dict:
+    """A Bedrock cache point block - everything before it is a cacheable prefix."""
+    point = {"type": "default"}
+    if COURT_PROMPT_CACHE_TTL:
+        point["ttl"] = COURT_PROMPT_CACHE_TTL
+    return {"cachePoint": point}
+
+
+def cacheable_system_prompt(prompt: str, model_id: str = MODEL_ID):
+    """
+    A steering prompt marked cacheable. Bedrock puts tool specs ahead of the
+    system prompt, so an agent's tools are cached along with it.
+    
+    Cache points are placed by hand rather than with Strands' CacheConfig,
+    which also marks the end of every turn - each tool round would write a
+    cache entry that is never read back.
+    """
+    if not prompt_cache_enabled(model_id):
+        return prompt
+    return [{"text": prompt}, cache_point()]
+
+
+def cacheable_prompt(instructions: str, case: str):
+    """
+    A prompt whose static instructions are sent first and marked cacheable,
+    followed by the plea-specific part.
+    
+    Returns:
+        Strands content blocks, or plain text when prompt caching is off
+    """
+    if not prompt_cache_enabled(model_router.routes["judge"]):
+        return instructions + case
+    return [{"text": instructions}, cache_point(), {"text": case}]
 
 
 # ============================================================================
 # VISION ANALYSIS - Analyze face with Claude Vision
 # ============================================================================
 
-def analyze_face_with_vision(image_base64: str) -> dict:
+def analyze_face_with_vision(image: bytes, media_type: str = "image/jpeg") -> dict:
     """
     Analyze a face image using Claude's vision capabilities.
     Returns analysis of desperation level.
+    
+    Expects a frame that has already been through vision.preprocess_image.
+    
+    Near-identical frames (kiosk retries) are served from the vision cache.
     """
+    cache_key = None
+    if VISION_CACHE_ENABLED:
+        cache_key = image_cache_key(image)
+        cached = vision_cache.get(cache_key)
+        if cached is not None:
+            print(f"👁️ Vision cache hit ({cached.get('verdict')})")
+            return cached
+    
     try:
-        message = {
-            "role": "user",
-            "content": [
-                {
-                    "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": "image/jpeg",
-                        "data": image_base64
-                    }
-                },
-                {
-                    "type": "text",
-                    "text": """You are a cynical Vegas bouncer analyzing this person's face for signs of BATHROOM DESPERATION.
+        model_id = model_router.model_id("vision")
+        # Hedged to the secondary region if the primary is slow (when enabled)
+        vision_result = hedger.run_sync(
+            "vision",
+            lambda: invoke_vision_model(image, media_type, get_bedrock_runtime(AWS_REGION), model_id),
+            lambda: invoke_vision_model(
+                image,
+                media_type,
+                get_bedrock_runtime(HEDGE_REGION),
+                HEDGE_MODEL_ID or model_id
+            )
+        )
+        
+        # Count the tokens here, on the caller's thread, so they're charged to
+        # this deliberation even when the call ran on a hedge worker
+        usage = vision_result.pop("usage", {})
+        token_ledger.record(
+            "vision",
+            usage.get("input_tokens", 0),
+            usage.get("output_tokens", 0),
+            cache_read=usage.get("cache_read_input_tokens", 0),
+            cache_write=usage.get("cache_creation_input_tokens", 0),
+        )
+        
+        # Only successful analyses are cached - errors should be retried
+        if cache_key is not None:
+            vision_cache.put(cache_key, vision_result)
+        
+        return vision_result
+        
+    except Exception as e:
+        print(f"Vision analysis error: {e}")
+        return {
+            "verdict": "FAKE",
+            "analysis": f"Couldn't see your face clearly. Assuming you're faking it. Error: {str(e)}",
+            "error": True
+        }
+
+
+# Stands in for the image in the serialized request until it is spliced in
+IMAGE_PLACEHOLDER = "__LUCKY_LOO_IMAGE__"
+
+
+def invoke_vision_model(image: bytes, media_type: str, client, model_id: str) -> dict:
+    """
+    Make the raw Bedrock vision call. Raises on any error.
+    
+    The image is base64-encoded straight into the request body bytes - the
+    only time it is encoded - rather than as a str that json.dumps copies
+    and boto3 then encodes again.
+    
+    Returns:
+        dict with verdict (REAL/FAKE), the model's analysis text and the
+        token usage Bedrock reported
+    """
+    message = {
+        "role": "user",
+        "content": [
+            {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": media_type,
+                    "data": IMAGE_PLACEHOLDER
+                }
+            },
+            {
+                "type": "text",
+                "text": """You are a cynical Vegas bouncer analyzing this person's face for signs of BATHROOM DESPERATION.
 
 Look for GENUINE desperation signs:
 - Wide, panicked eyes
@@ -102,168 +310,1069 @@ Respond in this exact format:
 VERDICT: [REAL/FAKE]
 CONFIDENCE: [HIGH/MEDIUM/LOW]
 ANALYSIS: [One cynical sentence about what you see, in noir detective style]"""
-                }
-            ]
-        }
+            }
+        ]
+    }
+    
+    # Base64 needs no JSON escaping, so it can go between the quotes as-is
+    before, after = json.dumps({
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": COURT_MAX_TOKENS["vision"],
+        "messages": [message]
+    }).encode("utf-8").split(IMAGE_PLACEHOLDER.encode("utf-8"))
+    
+    response = client.invoke_model(
+        modelId=model_id,
+        body=b"".join((before, base64.b64encode(image), after))
+    )
+    
+    result = json.loads(response["body"].read())
+    content = result.get("content", [{}])[0].get("text", "")
+    
+    # Parse the response
+    is_real = "VERDICT: REAL" in content.upper()
+    
+    return {
+        "verdict": "REAL" if is_real else "FAKE",
+        "analysis": content,
+        "usage": result.get("usage", {})
+    }
+
+
+# ============================================================================
+# COURT EVENTS - Progress reports for streaming clients
+# ============================================================================
+
+# Listener for the deliberation running in the current context, if anyone
+# is streaming it. Called as listener(event, data) - possibly from a worker
+# thread, so listeners must be thread-safe.
+_court_event_listener: ContextVar[Optional[Callable]] = ContextVar(
+    "court_event_listener", default=None
+)
+
+
+def emit_court_event(event: str, **data):
+    """Report deliberation progress to the streaming client, if there is one."""
+    listener = _court_event_listener.get()
+    if listener is not None:
+        listener(event, data)
+
+
+# Jurors whose call failed during the agentic deliberation running in the
+# current context - the Pit Boss only sees their failures as tool errors
+_absent_jurors: ContextVar[Optional[list]] = ContextVar("absent_jurors", default=None)
+
+
+async def testify_as_tool(juror: str, ask: Callable) -> str:
+    """
+    Run a consult_* tool's juror call. A failure is noted for the circuit
+    breaker and re-raised, for Strands to hand the Pit Boss as a tool error.
+    """
+    try:
+        testimony = await ask()
+    except Exception:
+        absent = _absent_jurors.get()
+        if absent is not None:
+            absent.append(juror)
+        raise
+    emit_court_event("juror", juror=juror, vote=parse_juror_vote(juror, testimony))
+    return testimony
+
+
+def parse_juror_vote(juror: str, output: str) -> str:
+    """
+    Pull a juror's vote out of their free-text testimony.
+    
+    Returns:
+        REAL/FAKE for the Skeptic, CRITICAL/STABLE for the Doctor,
+        IN/OUT for the Gambler, or UNKNOWN if it can't be found.
+    """
+    for line in output.upper().splitlines():
+        line = line.strip().strip("*`").strip()
+        
+        if juror == "skeptic" and line.startswith("VERDICT:"):
+            if "FAKE" in line:
+                return "FAKE"
+            if "REAL" in line:
+                return "REAL"
         
-        response = bedrock_runtime.invoke_model(
-            modelId=MODEL_ID,
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 300,
-                "messages": [message]
-            })
+        elif juror == "doctor" and line.startswith("URGENCY:"):
+            if "CRITICAL" in line:
+                return "CRITICAL"
+            if "STABLE" in line or "MODERATE" in line:
+                return "STABLE"
+        
+        elif juror == "gambler" and line.startswith("THE CARDS SAY:"):
+            if "LET THEM IN" in line:
+                return "IN"
+            if "SEND THEM PACKING" in line:
+                return "OUT"
+    
+    return "UNKNOWN"
+
+
+# ============================================================================
+# JURY PROMPTS
+# ============================================================================
+
+def build_skeptic_prompt(face_analysis: str) -> str:
+    """Build the prompt handed to The Skeptic."""
+    return f"""Here is the face analysis from our security cameras:
+
+{face_analysis}
+
+Based on this evidence, deliver your verdict. Are they REAL desperate or FAKE desperate?"""
+
+
+def build_doctor_prompt(user_plea: str) -> str:
+    """Build the prompt handed to The Doctor."""
+    return f"""A patient has submitted the following plea for bathroom access:
+
+"{user_plea}"
+
+Provide your medical diagnosis and urgency assessment. Be dramatic."""
+
+
+def build_gambler_prompt() -> str:
+    """Build the prompt handed to The Gambler, seeded with a random omen."""
+    luck_seed = random.choice([
+        "The dice are hot tonight.",
+        "I just saw a black cat. Bad omen.",
+        "Someone just hit the jackpot on floor 3. Good vibes.",
+        "Mercury is in retrograde. Tread carefully.",
+        "I found a penny heads-up this morning. Lucky day.",
+        "The cards have been cold all night.",
+    ])
+    
+    return f"""It's time to make your call. {luck_seed}
+
+Should this person get bathroom access? Consult your gambling instincts and deliver your verdict."""
+
+
+# ============================================================================
+# JURORS
+# ============================================================================
+
+JUROR_NAMES = {
+    "skeptic": "The_Skeptic",
+    "doctor": "The_Doctor",
+    "gambler": "The_Gambler",
+}
+
+def build_juror(juror: str, model=None) -> "Agent":
+    """Build a juror agent (on the primary model unless told otherwise)."""
+    from strands import Agent
+    from strands.agent import SlidingWindowConversationManager
+    
+    model = model or get_agent_model(juror)
+    return Agent(
+        name=JUROR_NAMES[juror],
+        model=model,
+        system_prompt=cacheable_system_prompt(steering_prompt(juror), model.get_config()["model_id"]),
+        conversation_manager=SlidingWindowConversationManager(window_size=COURT_MAX_HISTORY),
+    )
+
+
+def build_hedge_juror(juror: str) -> "Agent":
+    """A stand-in juror on the hedge region, for one hedged question."""
+    return build_juror(juror, get_agent_model(juror, hedge=True))
+
+
+def agent_usage(agent: "Agent") -> tuple:
+    """
+    An agent's lifetime token counts as reported by Bedrock.
+    
+    Returns:
+        (input, output, cache read, cache write) - input excludes the
+        tokens read from or written to the prompt cache
+    """
+    usage = agent.event_loop_metrics.accumulated_usage
+    return (
+        usage.get("inputTokens", 0),
+        usage.get("outputTokens", 0),
+        usage.get("cacheReadInputTokens", 0),
+        usage.get("cacheWriteInputTokens", 0),
+    )
+
+
+def record_agent_usage(role: str, agent: "Agent", before: tuple):
+    """Charge the tokens an agent used since `before` to its role."""
+    delta = [now - then for now, then in zip(agent_usage(agent), before)]
+    if any(delta):
+        input_tokens, output_tokens, cache_read, cache_write = delta
+        token_ledger.record(
+            role, input_tokens, output_tokens, cache_read=cache_read, cache_write=cache_write
         )
+
+
+async def ask_juror(juror: str, agent: "Agent", prompt: str) -> str:
+    """
+    Put a question to a juror and return their testimony.
+    
+    If hedging is on and the juror is slower than usual, a stand-in juror on
+    the secondary region gets the same question and the first answer wins.
+    """
+    async def primary() -> str:
+        before = agent_usage(agent)
+        testimony = str(await agent.invoke_async(prompt))
+        record_agent_usage(juror, agent, before)
+        return testimony
+    
+    async def secondary() -> str:
+        # Building the stand-in (and, the first time, its model) is slow
+        # blocking work - keep it off the event loop
+        stand_in = await asyncio.to_thread(build_hedge_juror, juror)
+        testimony = str(await stand_in.invoke_async(prompt))
+        record_agent_usage(juror, stand_in, (0, 0, 0, 0))
+        return testimony
+    
+    with timed(f"juror_{juror}"):
+        return await hedger.run(f"juror_{juror}", primary, secondary)
+
+
+async def ask_doctor(agent: "Agent", user_plea: str) -> str:
+    """
+    Get The Doctor's diagnosis of a plea.
+    
+    He only ever sees the plea text, so the same (or nearly the same) plea
+    gets his cached diagnosis without a model call.
+    """
+    cache_key = None
+    if PLEA_CACHE_ENABLED:
+        cache_key = plea_cache_key(user_plea)
+        cached = await plea_cache.get_async(cache_key)
+        if cached is not None:
+            print(f"🩺 Plea cache hit ({parse_juror_vote('doctor', cached)})")
+            return cached
+    
+    testimony = await ask_juror("doctor", agent, build_doctor_prompt(user_plea))
+    
+    # Only diagnoses with a readable URGENCY are worth reusing
+    if cache_key is not None and parse_juror_vote("doctor", testimony) != "UNKNOWN":
+        plea_cache.put_async(cache_key, testimony)
+    
+    return testimony
+
+
+# ============================================================================
+# THE COURT - Jury agents, jury tools and the Pit Boss
+# ============================================================================
+
+def build_court(jury_tools: bool = True) -> dict:
+    """
+    Build a fresh set of jury agents and a Pit Boss wired to them.
+    
+    Strands agents keep their conversation history and refuse concurrent
+    invocations, so a court must only serve one deliberation at a time.
+    Deliberations borrow courts from a CourtPool rather than calling this
+    directly.
+    
+    Args:
+        jury_tools: If False, the Pit Boss gets no consult_* tools (used by
+            the parallel orchestration, where the jury runs up front).
+    
+    Returns:
+        dict with skeptic, doctor, gambler and judge agents
+    """
+    from strands import Agent, tool
+    from strands.agent import SlidingWindowConversationManager
+    
+    juror_skeptic = build_juror("skeptic")
+    juror_doctor = build_juror("doctor")
+    juror_gambler = build_juror("gambler")
+    
+    @tool
+    async def consult_skeptic(face_analysis: str) -> str:
+        """
+        Consult The Skeptic with the face analysis results.
+        The Skeptic is a cynical Vegas bouncer who detects fake desperation.
         
-        result = json.loads(response["body"].read())
-        content = result.get("content", [{}])[0].get("text", "")
+        Args:
+            face_analysis: The vision analysis of the user's face, or note about missing image.
         
-        # Parse the response
-        is_real = "VERDICT: REAL" in content.upper()
+        Returns:
+            The Skeptic's verdict on whether the desperation is REAL or FAKE.
+        """
+        return await testify_as_tool(
+            "skeptic", lambda: ask_juror("skeptic", juror_skeptic, build_skeptic_prompt(face_analysis))
+        )
+    
+    @tool  
+    async def consult_doctor(user_plea: str) -> str:
+        """
+        Consult The Doctor to evaluate the user's plea for medical urgency.
+        The Doctor is an overly dramatic medical professional.
         
-        return {
-            "verdict": "REAL" if is_real else "FAKE",
-            "analysis": content
-        }
+        Args:
+            user_plea: The text the user submitted describing their bathroom need.
         
-    except Exception as e:
-        print(f"Vision analysis error: {e}")
-        return {
-            "verdict": "FAKE",
-            "analysis": f"Couldn't see your face clearly. Assuming you're faking it. Error: {str(e)}"
-        }
+        Returns:
+            The Doctor's dramatic medical diagnosis and urgency assessment.
+        """
+        return await testify_as_tool("doctor", lambda: ask_doctor(juror_doctor, user_plea))
+    
+    @tool
+    async def consult_gambler() -> str:
+        """
+        Consult The Gambler for a luck-based decision.
+        The Gambler doesn't care about facts - only fate and fortune.
+        
+        Returns:
+            The Gambler's chaotic, luck-based verdict.
+        """
+        return await testify_as_tool("gambler", lambda: ask_juror("gambler", juror_gambler, build_gambler_prompt()))
+    
+    judge_model = get_agent_model("judge")
+    pit_boss_judge = Agent(
+        name="Pit_Boss",
+        model=judge_model,
+        tools=[consult_skeptic, consult_doctor, consult_gambler] if jury_tools else [],
+        system_prompt=cacheable_system_prompt(steering_prompt("judge"), judge_model.get_config()["model_id"]),
+        conversation_manager=SlidingWindowConversationManager(window_size=COURT_MAX_HISTORY),
+    )
+    
+    return {
+        "skeptic": juror_skeptic,
+        "doctor": juror_doctor,
+        "gambler": juror_gambler,
+        "judge": pit_boss_judge,
+    }
+
+
+COURT_ROLES = ("skeptic", "doctor", "gambler", "judge")
+
+
+def reset_court(court: dict):
+    """Wipe every agent's conversation so the next plea starts from a clean slate."""
+    for role in COURT_ROLES:
+        agent = court[role]
+        agent.messages = []
+        agent.conversation_manager.removed_message_count = 0
+
+
+async def route_court(court: dict):
+    """Put every agent on the model routed to its role right now (see model_routing)."""
+    for role in COURT_ROLES:
+        model_id = model_router.model_id(role)
+        model = _agent_models.get((role, model_id, AWS_REGION))
+        if model is None:
+            # First use of this model (warm_up normally builds them) - slow, so off the loop
+            model = await asyncio.to_thread(get_agent_model, role, False, model_id)
+        agent = court[role]
+        if agent.model is not model:
+            agent.model = model
+            # The steering prompt's cache point depends on the model
+            agent.system_prompt = cacheable_system_prompt(steering_prompt(role), model.get_config()["model_id"])
 
 
 # ============================================================================
-# JURY AGENTS
+# COURT POOL - Recycled courts, one deliberation at a time
 # ============================================================================
 
-juror_skeptic = Agent(
-    name="The_Skeptic",
-    model=bedrock_model,
-    system_prompt=load_steering_prompt("juror_skeptic.md"),
-)
+class CourtPool:
+    """
+    A pool of pre-built courts with checkout/checkin semantics.
+    
+    A checked-out court belongs to exactly one deliberation, and is put on
+    the models currently routed to each role. On checkin its history is
+    wiped, so per-plea input tokens stay flat however long the worker has
+    been up. Courts are rebuilt after COURT_RECYCLE_AFTER uses,
+    and a court whose deliberation failed is thrown away rather than reused.
+    
+    Checkout never waits for another deliberation: if every idle court is
+    taken a new one is built, on a worker thread so the event loop keeps
+    serving. Overall concurrency is capped by admission control, not here.
+    
+    `size` courts are built up front. `capacity` (e.g. the current admission
+    limit) lets the pool keep more than that on checkin, so courts built
+    while the limit is raised are reused instead of rebuilt for every plea.
+    """
+    
+    def __init__(
+        self,
+        jury_tools: bool = True,
+        size: int = COURT_POOL_SIZE,
+        recycle_after: int = COURT_RECYCLE_AFTER,
+        capacity: Optional[Callable[[], int]] = None
+    ):
+        self.jury_tools = jury_tools
+        self.size = size
+        self.recycle_after = recycle_after
+        self.capacity = capacity
+        self._idle = []
+        self._lock = threading.Lock()
+        self._stats = {"built": 0, "checkouts": 0, "recycled": 0, "discarded": 0}
+        
+        # Pre-build the pool so the first pleas don't pay for construction
+        for _ in range(size):
+            self._idle.append(self._build())
+    
+    def _build(self) -> dict:
+        # Slow (agents, tool specs, Bedrock models) - never under the lock
+        agents = build_court(jury_tools=self.jury_tools)
+        with self._lock:
+            self._stats["built"] += 1
+        return {"agents": agents, "uses": 0}
+    
+    async def checkout(self) -> dict:
+        """Borrow a court. Must be handed back with checkin()."""
+        with self._lock:
+            self._stats["checkouts"] += 1
+            entry = self._idle.pop() if self._idle else None
+        if entry is None:
+            entry = await asyncio.to_thread(self._build)
+        await route_court(entry["agents"])
+        return entry
+    
+    async def checkin(self, entry: dict, healthy: bool = True):
+        """Return a borrowed court, resetting or retiring it."""
+        entry["uses"] += 1
+        
+        if not healthy:
+            with self._lock:
+                self._stats["discarded"] += 1
+            return
+        if entry["uses"] >= self.recycle_after:
+            entry = await asyncio.to_thread(self._build)
+            with self._lock:
+                self._stats["recycled"] += 1
+        else:
+            reset_court(entry["agents"])
+        
+        keep = self.max_idle()
+        with self._lock:
+            if len(self._idle) < keep:
+                self._idle.append(entry)
+            else:
+                self._stats["discarded"] += 1
+    
+    @asynccontextmanager
+    async def court(self):
+        """Check out a court for the duration of an async with-block."""
+        entry = await self.checkout()
+        healthy = False
+        try:
+            yield entry["agents"]
+            healthy = True
+        finally:
+            await self.checkin(entry, healthy=healthy)
+    
+    def max_idle(self) -> int:
+        """Most idle courts kept: the pool size, or the capacity if that's higher."""
+        return max(self.size, self.capacity()) if self.capacity else self.size
+    
+    def stats(self) -> dict:
+        keep = self.max_idle()
+        with self._lock:
+            return {**self._stats, "idle": len(self._idle), "size": self.size, "max_idle": keep}
 
-juror_doctor = Agent(
-    name="The_Doctor", 
-    model=bedrock_model,
-    system_prompt=load_steering_prompt("juror_doctor.md"),
-)
 
-juror_gambler = Agent(
-    name="The_Gambler",
-    model=bedrock_model,
-    system_prompt=load_steering_prompt("juror_gambler.md"),
-)
+_court_pools: dict = {}
+_court_pools_lock = threading.Lock()
+
+
+def get_court_pool(jury_tools: bool = True) -> CourtPool:
+    """Get (building on first use) the court pool for an orchestration style."""
+    with _court_pools_lock:
+        pool = _court_pools.get(jury_tools)
+        if pool is None:
+            pool = CourtPool(jury_tools=jury_tools, capacity=lambda: int(court_admission.limit))
+            _court_pools[jury_tools] = pool
+        return pool
+
+
+async def get_court_pool_async(jury_tools: bool = True) -> CourtPool:
+    """
+    get_court_pool for the event loop. Until the pool exists - it may be
+    mid-build in warm_up, holding the lock - wait for it on a worker thread
+    so other requests (health checks included) keep being served.
+    """
+    pool = _court_pools.get(jury_tools)
+    if pool is None:
+        pool = await asyncio.to_thread(get_court_pool, jury_tools)
+    return pool
+
+
+def warm_up():
+    """
+    Do the expensive first-use work - Strands and boto3 imports, Bedrock
+    clients, steering prompts, the court pool, the fast-tier and hedge
+    models - ahead of the first plea.
+    Nothing to do in mock mode.
+    """
+    if MOCK_MODE:
+        return
+    
+    started = time.perf_counter()
+    try:
+        get_bedrock_runtime(AWS_REGION)
+        get_court_pool(jury_tools=COURT_ORCHESTRATION == "agentic")
+        if model_router.enabled:
+            # So the first downgrade under load doesn't stop to build the fast tier
+            for role in set(model_router.downgrade_roles) & set(COURT_ROLES):
+                get_agent_model(role, model_id=model_router.fast_model_id)
+        if hedger.enabled:
+            # So the first hedged juror doesn't wait for its model
+            get_bedrock_runtime(HEDGE_REGION)
+            for juror in JUROR_NAMES:
+                get_agent_model(juror, hedge=True)
+    except Exception as e:
+        print(f"⚠️ Warm-up failed, courts will be built on demand: {e}")
+        return
+    print(f"🔥 Court warmed up in {time.perf_counter() - started:.2f}s")
 
 
 # ============================================================================
-# JURY TOOLS
+# DELIBERATION HELPERS
 # ============================================================================
 
-@tool
-def consult_skeptic(face_analysis: str) -> str:
+def demo_verdict() -> dict:
+    """The rigged verdict used for stage demos."""
+    return {
+        "verdict": "GRANTED",
+        "reasoning": "DEMO MODE: The Court has been rigged in your favor.",
+        "roast": "Jackpot! The Porcelain Gods recognize a VIP when they see one.",
+        "jury_votes": {
+            "skeptic": "REAL",
+            "doctor": "CRITICAL",
+            "gambler": "IN"
+        }
+    }
+
+
+VERDICT_FORMAT = """
+Remember: Your output MUST end with valid JSON in this format:
+{
+    "verdict": "GRANTED" or "DENIED",
+    "reasoning": "Your summary",
+    "roast": "Your one-liner",
+    "jury_votes": {"skeptic": "REAL/FAKE", "doctor": "CRITICAL/STABLE", "gambler": "IN/OUT"}
+}
+"""
+
+# The unchanging half of each case, sent ahead of the plea so it can be
+# cached together with the Pit Boss's system prompt and tools
+CASE_INSTRUCTIONS = """
+A desperate soul seeks bathroom access at Lucky Loo Casino. Their case follows.
+
+Your task:
+1. Call consult_skeptic with the face analysis (or note about missing photo)
+2. Call consult_doctor with the user's plea text
+3. Call consult_gambler for the luck factor
+4. Weigh their opinions and deliver your FINAL VERDICT as JSON
+""" + VERDICT_FORMAT
+
+VERDICT_INSTRUCTIONS = """
+A desperate soul seeks bathroom access at Lucky Loo Casino. Their case follows.
+
+The jury has already deliberated. Do NOT call any tools - their testimony is given with the case.
+
+Your task: weigh their opinions and deliver your FINAL VERDICT as JSON.
+""" + VERDICT_FORMAT
+
+
+def build_case_presentation(user_plea: str, face_analysis: Optional[str] = None):
+    """Build the case the Pit Boss is asked to rule on (see cacheable_prompt)."""
+    case_presentation = f"""
+USER'S PLEA: "{user_plea}"
+"""
+    
+    if face_analysis:
+        case_presentation += f"""
+FACE ANALYSIS FROM SECURITY CAMERAS:
+{face_analysis}
+
+When consulting The Skeptic, provide this face analysis.
+"""
+    else:
+        case_presentation += """
+VISUAL EVIDENCE: None provided. No photo submitted.
+When consulting The Skeptic, note that no visual proof was provided.
+"""
+    
+    return cacheable_prompt(CASE_INSTRUCTIONS, case_presentation)
+
+
+def build_verdict_presentation(
+    user_plea: str,
+    skeptic_output: str,
+    doctor_output: str,
+    gambler_output: str
+):
+    """Build the case for a Pit Boss whose jury has already deliberated (see cacheable_prompt)."""
+    return cacheable_prompt(VERDICT_INSTRUCTIONS, f"""
+USER'S PLEA: "{user_plea}"
+
+THE SKEPTIC SAYS:
+{skeptic_output}
+
+THE DOCTOR SAYS:
+{doctor_output}
+
+THE GAMBLER SAYS:
+{gambler_output}
+""")
+
+
+def validate_verdict(candidate: dict) -> Optional[dict]:
+    """Accept a verdict object only if it matches the VerdictResponse schema."""
+    candidate.pop("door_code", None)
+    try:
+        return VerdictResponse.model_validate(candidate).model_dump(exclude={"token_usage"})
+    except ValidationError:
+        return None
+
+
+# Closing a Strands stream early leaves its inner generators to be finalized
+# by asyncio in a fresh task, where OpenTelemetry can't detach its span
+# context. Harmless, but it logs a full traceback per call.
+logging.getLogger("opentelemetry.context").setLevel(logging.CRITICAL)
+
+
+async def stream_json_object(agent: "Agent", prompt, validate: Callable, role: str = "judge") -> tuple:
     """
-    Consult The Skeptic with the face analysis results.
-    The Skeptic is a cynical Vegas bouncer who detects fake desperation.
+    Stream an agent's response, stopping the moment a valid JSON object closes.
     
-    Args:
-        face_analysis: The vision analysis of the user's face, or note about missing image.
+    The prompt is text or content blocks (see cacheable_prompt). Tokens are
+    charged to `role`. Bedrock reports usage at the end of each model call,
+    so a call cut off early has its tokens estimated instead.
     
     Returns:
-        The Skeptic's verdict on whether the desperation is REAL or FAKE.
+        (object, text) - the validated object (None if none was found) and
+        the text streamed so far
     """
-    prompt = f"""Here is the face analysis from our security cameras:
+    extractor = JsonObjectExtractor(validate)
+    final_result = None
+    parse_seconds = 0.0
+    before = reported = agent_usage(agent)
+    unreported_text = ""
+    
+    stream = agent.stream_async(prompt)
+    try:
+        async for event in stream:
+            if "data" in event:
+                # A new model call (e.g. after a tool round) means the last one reported in
+                if agent_usage(agent) != reported:
+                    reported = agent_usage(agent)
+                    unreported_text = ""
+                unreported_text += event["data"]
+                
+                parse_started = time.perf_counter()
+                found = extractor.feed(event["data"])
+                parse_seconds += time.perf_counter() - parse_started
+                if found is not None:
+                    break
+            elif "result" in event:
+                final_result = event["result"]
+    finally:
+        await stream.aclose()
+    
+    # Non-streaming models only hand over the finished result
+    if not extractor.done and not extractor.text and final_result is not None:
+        parse_started = time.perf_counter()
+        extractor.feed(str(final_result))
+        parse_seconds += time.perf_counter() - parse_started
+    
+    record_stage("json_parse", parse_seconds)
+    
+    record_agent_usage(role, agent, before)
+    if unreported_text and agent_usage(agent) == reported:
+        context = (agent.system_prompt or "") + json.dumps(agent.messages, default=str)
+        token_ledger.record(
+            role, estimate_tokens(context), estimate_tokens(unreported_text), estimated=True
+        )
+    
+    return extractor.result, extractor.text
 
-{face_analysis}
 
-Based on this evidence, deliver your verdict. Are they REAL desperate or FAKE desperate?"""
+async def stream_judge_verdict(judge: "Agent", prompt) -> dict:
+    """
+    Get the Pit Boss's verdict, returning as soon as his JSON is complete.
+    
+    In agentic mode the "judge" stage includes the jury's tool calls.
+    """
+    with timed("judge"):
+        verdict, result_text = await stream_json_object(judge, prompt, validate_verdict)
+    if verdict is not None:
+        return verdict
+    with timed("json_parse"):
+        return parse_judge_response(result_text)
+
+
+def parse_judge_response(result_text: str) -> dict:
+    """Extract the verdict JSON from the Pit Boss's free-text response."""
+    try:
+        json_start = result_text.find('{')
+        json_end = result_text.rfind('}') + 1
+        if json_start != -1 and json_end > json_start:
+            json_str = result_text[json_start:json_end]
+            result = json.loads(json_str)
+            # Remove door_code if present
+            result.pop("door_code", None)
+            return result
+    except json.JSONDecodeError:
+        pass
     
-    response = juror_skeptic(prompt)
-    return str(response)
+    # Fallback if JSON parsing fails
+    return {
+        "verdict": "DENIED",
+        "reasoning": "The Court experienced technical difficulties during deliberation.",
+        "roast": result_text[:200] if result_text else "The house always wins. Try again.",
+        "jury_votes": {
+            "skeptic": "UNKNOWN",
+            "doctor": "UNKNOWN", 
+            "gambler": "UNKNOWN"
+        }
+    }
+
+
+def court_error_verdict(error: Exception) -> dict:
+    """Verdict returned when the deliberation itself blows up."""
+    return {
+        "verdict": "DENIED",
+        "reasoning": f"Court error: {str(error)}",
+        "roast": "Even the machines are against you today. House wins by default.",
+        "jury_votes": {
+            "skeptic": "ERROR",
+            "doctor": "ERROR",
+            "gambler": "ERROR"
+        }
+    }
+
+
+# ============================================================================
+# VERDICT ENGINE - The Pit Boss's rules, without the Pit Boss
+# ============================================================================
+
+# The vote each juror casts when they're on the pleader's side
+FAVORABLE_VOTES = {"skeptic": "REAL", "doctor": "CRITICAL", "gambler": "IN"}
+UNFAVORABLE_VOTES = {"skeptic": "FAKE", "doctor": "STABLE", "gambler": "OUT"}
+
+VERDICT_PHRASES = {
+    "skeptic": {
+        "REAL": "The Skeptic detected genuine terror.",
+        "FAKE": "The Skeptic saw through your act.",
+        "UNKNOWN": "The Skeptic kept his cards close to his chest.",
+    },
+    "doctor": {
+        "CRITICAL": "The Doctor diagnosed critical bladder failure.",
+        "STABLE": "The Doctor says you'll live.",
+        "UNKNOWN": "The Doctor's chart came back blank.",
+    },
+    "gambler": {
+        "IN": "The Gambler's dice rolled in your favor.",
+        "OUT": "The Gambler drew snake eyes on your behalf.",
+        "UNKNOWN": "The Gambler never placed a bet.",
+    },
+}
+
+ROAST_TEMPLATES = {
+    "GRANTED": [
+        "Jackpot, kid. The Porcelain Gods smile upon you today. Don't make me regret this.",
+        "Against all odds, you hit the jackpot. Go on, before I change my mind.",
+        "The house lost this hand. Enjoy it, tourist - it won't happen twice.",
+    ],
+    "DENIED": [
+        "House wins, tourist. Find a Starbucks and buy a coffee like everyone else.",
+        "House wins. Find a bush, tourist. This ain't your lucky day.",
+        "You bet it all on a bluff and the table called it. Cross your legs and walk.",
+    ],
+}
 
 
-@tool  
-def consult_doctor(user_plea: str) -> str:
+def decide_verdict(jury_votes: dict) -> str:
     """
-    Consult The Doctor to evaluate the user's plea for medical urgency.
-    The Doctor is an overly dramatic medical professional.
+    Apply the Pit Boss's voting rules (see steering/judge_pitboss.md).
     
-    Args:
-        user_plea: The text the user submitted describing their bathroom need.
+    2+ jurors in favor grants access and 2+ against denies it. Anything
+    else is a split - a FAKE Skeptic cancels out a CRITICAL Doctor - so
+    The Gambler breaks the tie, and a Gambler who didn't say IN means DENIED.
+    """
+    favor = sum(jury_votes.get(j) == vote for j, vote in FAVORABLE_VOTES.items())
+    against = sum(jury_votes.get(j) == vote for j, vote in UNFAVORABLE_VOTES.items())
+    
+    if favor >= 2:
+        return "GRANTED"
+    if against >= 2:
+        return "DENIED"
+    return "GRANTED" if jury_votes.get("gambler") == "IN" else "DENIED"
+
+
+def judge_by_rules(testimony: dict) -> dict:
+    """
+    Rule on the jury's testimony locally.
     
     Returns:
-        The Doctor's dramatic medical diagnosis and urgency assessment.
+        dict with verdict, reasoning and jury_votes (no roast)
     """
-    prompt = f"""A patient has submitted the following plea for bathroom access:
+    jury_votes = {
+        juror: parse_juror_vote(juror, testimony.get(juror, ""))
+        for juror in ("skeptic", "doctor", "gambler")
+    }
+    reasoning = " ".join(
+        VERDICT_PHRASES[juror].get(vote, VERDICT_PHRASES[juror]["UNKNOWN"])
+        for juror, vote in jury_votes.items()
+    )
+    return {
+        "verdict": decide_verdict(jury_votes),
+        "reasoning": reasoning,
+        "jury_votes": jury_votes,
+    }
 
-"{user_plea}"
 
-Provide your medical diagnosis and urgency assessment. Be dramatic."""
+def template_roast(verdict: str) -> str:
+    """A canned Pit Boss one-liner for when there's no time to ask him."""
+    return random.choice(ROAST_TEMPLATES.get(verdict, ROAST_TEMPLATES["DENIED"]))
+
+
+ROAST_INSTRUCTIONS = """
+A desperate soul begged for bathroom access at Lucky Loo Casino, and the
+Court has already ruled. Their plea and the ruling follow.
+
+Do NOT change the verdict and do NOT call any tools. Deliver only your roast.
+Your output MUST be valid JSON in this format:
+{"roast": "Your one-liner (mean if denied, begrudging if granted)"}
+"""
+
+
+def build_roast_prompt(user_plea: str, ruling: dict):
+    """Build the prompt asking the Pit Boss to roast an already-decided verdict."""
+    return cacheable_prompt(ROAST_INSTRUCTIONS, f"""
+USER'S PLEA: "{user_plea}"
+
+The Court has already ruled: {ruling["verdict"]}.
+{ruling["reasoning"]}
+""")
+
+
+async def deliver_roast(court: dict, user_plea: str, ruling: dict) -> tuple:
+    """
+    Ask the Pit Boss for a roast, falling back to a template if he fumbles.
+    
+    Returns:
+        (roast, failed) - failed is True when the model call itself raised
+    """
+    if COURT_ROAST_MODE != "llm":
+        return template_roast(ruling["verdict"]), False
+    
+    try:
+        with timed("roast"):
+            roast, response = await stream_json_object(
+                court["judge"],
+                build_roast_prompt(user_plea, ruling),
+                lambda candidate: candidate if candidate.get("roast") else None
+            )
+        if roast is not None:
+            return roast["roast"], False
+        if response.strip():
+            return response.strip()[:200], False
+    except Exception as e:
+        print(f"❌ Roast error: {e}")
+        return template_roast(ruling["verdict"]), True
     
-    response = juror_doctor(prompt)
-    return str(response)
+    return template_roast(ruling["verdict"]), False
 
 
-@tool
-def consult_gambler() -> str:
+# ============================================================================
+# ORCHESTRATION
+# ============================================================================
+
+async def consult_jury_in_parallel(court: dict, user_plea: str, face_analysis: Optional[str]) -> dict:
     """
-    Consult The Gambler for a luck-based decision.
-    The Gambler doesn't care about facts - only fate and fortune.
+    Consult all three jurors concurrently.
+    
+    A juror that fails is recorded as absent rather than sinking the whole
+    deliberation.
     
     Returns:
-        The Gambler's chaotic, luck-based verdict.
+        (testimony, absent) - dict with the skeptic, doctor and gambler
+        testimony, and the names of the jurors whose call failed
     """
-    luck_seed = random.choice([
-        "The dice are hot tonight.",
-        "I just saw a black cat. Bad omen.",
-        "Someone just hit the jackpot on floor 3. Good vibes.",
-        "Mercury is in retrograde. Tread carefully.",
-        "I found a penny heads-up this morning. Lucky day.",
-        "The cards have been cold all night.",
-    ])
+    evidence = face_analysis or "No visual proof was provided. No photo submitted."
+    jurors = {
+        "skeptic": lambda: ask_juror("skeptic", court["skeptic"], build_skeptic_prompt(evidence)),
+        "doctor": lambda: ask_doctor(court["doctor"], user_plea),
+        "gambler": lambda: ask_juror("gambler", court["gambler"], build_gambler_prompt()),
+    }
+    
+    absent = []
+    
+    async def testify(name: str, ask: Callable) -> str:
+        try:
+            output = await ask()
+        except Exception as e:
+            print(f"❌ Juror {name} error: {e}")
+            output = f"The {name.title()} was unavailable and did not testify."
+            absent.append(name)
+        emit_court_event("juror", juror=name, vote=parse_juror_vote(name, output))
+        return output
     
-    prompt = f"""It's time to make your call. {luck_seed}
+    outputs = await asyncio.gather(*(testify(name, ask) for name, ask in jurors.items()))
+    return dict(zip(jurors, outputs)), absent
 
-Should this person get bathroom access? Consult your gambling instincts and deliver your verdict."""
+
+async def deliberate(
+    user_plea: str,
+    face_analysis: Optional[str] = None,
+    orchestration: Optional[str] = None
+) -> dict:
+    """
+    Run the jury and reach a verdict.
+    
+    Args:
+        user_plea: The user's text plea for bathroom access
+        face_analysis: Vision analysis of the user's face, if any
+        orchestration: "agentic", "parallel" or "rules". Defaults to COURT_ORCHESTRATION.
     
-    response = juror_gambler(prompt)
-    return str(response)
+    Returns:
+        (ruling, healthy) - ruling is a dict with verdict, reasoning, roast
+        and jury_votes. healthy is False when a juror or the roast fell back
+        because its Bedrock call failed, so the circuit breaker can count
+        a verdict that was reached without the jury.
+    """
+    mode = (orchestration or COURT_ORCHESTRATION).lower()
+    if mode not in ORCHESTRATION_MODES:
+        raise ValueError(f"Unknown orchestration mode: {mode}")
+    
+    if mode == "rules":
+        async with (await get_court_pool_async(jury_tools=False)).court() as court:
+            testimony, absent = await consult_jury_in_parallel(court, user_plea, face_analysis)
+            with timed("verdict_engine"):
+                ruling = judge_by_rules(testimony)
+            emit_court_event("verdict", **ruling)
+            ruling["roast"], roast_failed = await deliver_roast(court, user_plea, ruling)
+            return ruling, not absent and not roast_failed
+    
+    if mode == "parallel":
+        async with (await get_court_pool_async(jury_tools=False)).court() as court:
+            testimony, absent = await consult_jury_in_parallel(court, user_plea, face_analysis)
+            verdict_presentation = build_verdict_presentation(
+                user_plea,
+                testimony["skeptic"],
+                testimony["doctor"],
+                testimony["gambler"]
+            )
+            return await stream_judge_verdict(court["judge"], verdict_presentation), not absent
+    
+    # Juror failures surface as tool errors to the Pit Boss, who rules anyway -
+    # the tools note them here so the breaker still hears about them
+    absent = []
+    token = _absent_jurors.set(absent)
+    try:
+        async with (await get_court_pool_async()).court() as court:
+            ruling = await stream_judge_verdict(
+                court["judge"],
+                build_case_presentation(user_plea, face_analysis)
+            )
+    finally:
+        _absent_jurors.reset(token)
+    return ruling, not absent
 
 
 # ============================================================================
-# THE JUDGE (PIT BOSS) - Orchestrates the Jury
+# CIRCUIT BREAKER - Fall back to the backup jury when Bedrock is struggling
 # ============================================================================
 
-pit_boss_judge = Agent(
-    name="Pit_Boss",
-    model=bedrock_model,
-    tools=[consult_skeptic, consult_doctor, consult_gambler],
-    system_prompt=load_steering_prompt("judge_pitboss.md"),
-)
+# Trips on a high error rate or too many slow deliberations; while open,
+# pleas are answered instantly from mock_responses
+court_breaker = CircuitBreaker("bedrock")
+
+
+def degraded_verdict() -> dict:
+    """
+    Rule on a plea without calling Bedrock.
+    
+    The backup jury's testimony comes from mock_responses and is judged by
+    the local verdict engine, so the verdict still follows the Court's rules.
+    """
+    testimony = {juror: get_mock_jury_response(juror) for juror in ("skeptic", "doctor", "gambler")}
+    ruling = judge_by_rules(testimony)
+    ruling["roast"] = template_roast(ruling["verdict"])
+    return ruling
+
+
+# ============================================================================
+# MOCK MODE - Simulated Bedrock latency for load tests
+# ============================================================================
+
+async def simulate_court_latency(image: Optional[bytes], orchestration: Optional[str] = None):
+    """
+    Take as long as a real deliberation would, per MOCK_LATENCY.
+    
+    Follows the real call pattern for the orchestration mode (jurors one
+    after another under the agentic Pit Boss, all at once otherwise) and
+    records the same stages. Image preprocessing is real work, so it runs
+    for real.
+    """
+    if image:
+        with timed("image_decode"):
+            await preprocess_image_async(image)
+    
+    if not mock_latency_enabled():
+        return
+    
+    if image:
+        with timed("vision"):
+            await asyncio.sleep(get_mock_latency("vision"))
+    
+    async def testify(juror: str):
+        with timed(f"juror_{juror}"):
+            await asyncio.sleep(get_mock_latency(juror))
+    
+    mode = (orchestration or COURT_ORCHESTRATION).lower()
+    if mode == "agentic":
+        for juror in JUROR_NAMES:
+            await testify(juror)
+    else:
+        await asyncio.gather(*(testify(juror) for juror in JUROR_NAMES))
+    
+    if mode == "rules":
+        if COURT_ROAST_MODE != "template":
+            with timed("roast"):
+                await asyncio.sleep(get_mock_latency("judge"))
+    else:
+        with timed("judge"):
+            await asyncio.sleep(get_mock_latency("judge"))
 
 
 # ============================================================================
 # MAIN API FUNCTION
 # ============================================================================
 
+def decode_plea_image(image_base64: str) -> Optional[bytes]:
+    """Decode a caller's base64 photo, or hear the plea without one if it isn't base64."""
+    try:
+        return decode_image(image_base64)
+    except ValueError:
+        print("⚠️ image_base64 isn't valid base64 - hearing the plea without a photo")
+        return None
+
+
 def run_court_of_relief(
     user_plea: str,
     image_base64: Optional[str] = None,
     demo_mode: bool = False,
-    mock_mode: bool = None
+    mock_mode: bool = None,
+    orchestration: Optional[str] = None,
+    image: Optional[bytes] = None
 ) -> dict:
     """
     Run the full Court of Relief deliberation.
     
+    This call blocks until the verdict is in. From async code (the FastAPI
+    endpoints) use run_court_of_relief_async instead.
+    
     Args:
         user_plea: The user's text plea for bathroom access
         image_base64: Optional base64-encoded image of the user's face
         demo_mode: If True, always grants access (for stage demos)
         mock_mode: If True, use mock responses (no AWS calls). Defaults to env var.
+        orchestration: "agentic", "parallel" or "rules". Defaults to COURT_ORCHESTRATION.
+        image: Optional raw image bytes, instead of image_base64
     
     Returns:
-        dict with verdict, reasoning, roast, and jury_votes
+        dict with verdict, reasoning, roast, jury_votes and (for real
+        deliberations) token_usage per agent
     """
     
     # Check mock mode
@@ -271,109 +1380,233 @@ def run_court_of_relief(
     
     # Demo mode - always win for stage presentations
     if demo_mode:
-        return {
-            "verdict": "GRANTED",
-            "reasoning": "DEMO MODE: The Court has been rigged in your favor.",
-            "roast": "Jackpot! The Porcelain Gods recognize a VIP when they see one.",
-            "jury_votes": {
-                "skeptic": "REAL",
-                "doctor": "CRITICAL",
-                "gambler": "IN"
-            }
-        }
+        return demo_verdict()
+    
+    if image_base64:
+        image = decode_plea_image(image_base64)
     
     # Mock mode - use pre-written responses (for testing without AWS)
     if use_mock:
         print("🎭 Running in MOCK MODE - using pre-written responses")
+        asyncio.run(simulate_court_latency(image, orchestration))
         return get_mock_response()
     
-    # Analyze face if image provided
-    face_analysis = None
-    if image_base64:
-        print("👁️ Analyzing face with Claude Vision...")
-        vision_result = analyze_face_with_vision(image_base64)
-        face_analysis = vision_result.get("analysis", "No analysis available")
-        print(f"👁️ Vision result: {vision_result.get('verdict')}")
+    # Circuit open - Bedrock is struggling, don't make them wait for it
+    if not court_breaker.allow_request():
+        print("🔌 Circuit open - the backup jury is hearing this case")
+        return degraded_verdict()
     
-    # Build the case presentation for the Judge
-    case_presentation = f"""
-A desperate soul seeks bathroom access at Lucky Loo Casino.
-
-USER'S PLEA: "{user_plea}"
-"""
+    started = time.monotonic()
+    vision_failed = False
     
-    if face_analysis:
-        case_presentation += f"""
-FACE ANALYSIS FROM SECURITY CAMERAS:
-{face_analysis}
+    with request_usage() as usage:
+        # Analyze face if image provided
+        face_analysis = None
+        if image:
+            print("👁️ Analyzing face with Claude Vision...")
+            with timed("image_decode"):
+                image, media_type = preprocess_image(image)
+            with timed("vision"):
+                vision_result = analyze_face_with_vision(image, media_type)
+            vision_failed = vision_result.get("error", False)
+            face_analysis = vision_result.get("analysis", "No analysis available")
+            print(f"👁️ Vision result: {vision_result.get('verdict')}")
+            emit_court_event("vision", verdict=vision_result.get("verdict"))
+        
+        try:
+            # Run the Judge agent - it will orchestrate the jury
+            print("⚖️ The Court is now in session...")
+            result, healthy = asyncio.run(deliberate(user_plea, face_analysis, orchestration))
+            court_breaker.record(healthy and not vision_failed, time.monotonic() - started)
+            
+        except Exception as e:
+            print(f"❌ Court error: {e}")
+            court_breaker.record(False, time.monotonic() - started)
+            result = court_error_verdict(e)
+    
+    print(f"🪙 Tokens: {format_usage(usage)}")
+    result["token_usage"] = usage
+    return result
 
-When consulting The Skeptic, provide this face analysis.
-"""
-    else:
-        case_presentation += """
-VISUAL EVIDENCE: None provided. No photo submitted.
-When consulting The Skeptic, note that no visual proof was provided.
-"""
+
+# ============================================================================
+# ASYNC API FUNCTION
+# ============================================================================
+
+# Adaptive concurrency limit and bounded queue in front of every deliberation
+court_admission = AdmissionController(initial_limit=COURT_MAX_CONCURRENCY)
+
+# Which model each agent runs on, moving the jurors to the fast tier when the
+# admission queue backs up or deliberations slow down
+model_router = ModelRouter(MODEL_ID, load=court_admission.load)
+
+for _role, _model_id in model_router.routes.items():
+    if _model_id != MODEL_ID:
+        print(f"🧭 {_role.title()} routed to {_model_id}")
+
+
+async def run_court_of_relief_async(
+    user_plea: str,
+    image_base64: Optional[str] = None,
+    demo_mode: bool = False,
+    mock_mode: bool = None,
+    orchestration: Optional[str] = None,
+    image: Optional[bytes] = None
+) -> dict:
+    """
+    Run the full Court of Relief deliberation without blocking the event loop.
     
-    case_presentation += """
-Your task:
-1. Call consult_skeptic with the face analysis (or note about missing photo)
-2. Call consult_doctor with the user's plea text
-3. Call consult_gambler for the luck factor
-4. Weigh their opinions and deliver your FINAL VERDICT as JSON
+    The blocking vision call runs in a worker thread and the Pit Boss is
+    driven through Strands' async API. Admission control decides how many
+    deliberations run at once; extra pleas wait their turn in a bounded
+    queue, and CourtOverloaded is raised when it's full.
+    
+    Args:
+        user_plea: The user's text plea for bathroom access
+        image_base64: Optional base64-encoded image of the user's face
+        demo_mode: If True, always grants access (for stage demos)
+        mock_mode: If True, use mock responses (no AWS calls). Defaults to env var.
+        orchestration: "agentic", "parallel" or "rules". Defaults to COURT_ORCHESTRATION.
+        image: Optional raw image bytes, instead of image_base64
+    
+    Returns:
+        dict with verdict, reasoning, roast, jury_votes and (for real
+        deliberations) token_usage per agent
+    """
+    
+    use_mock = mock_mode if mock_mode is not None else MOCK_MODE
+    
+    if demo_mode:
+        return demo_verdict()
+    
+    if image_base64:
+        image = decode_plea_image(image_base64)
+    
+    if use_mock:
+        print("🎭 Running in MOCK MODE - using pre-written responses")
+        # Simulated deliberations queue for a court slot just like real ones
+        queued = time.perf_counter()
+        async with court_admission.admit():
+            record_stage("queue_wait", time.perf_counter() - queued)
+            await simulate_court_latency(image, orchestration)
+        return get_mock_response()
+    
+    if not court_breaker.allow_request():
+        print("🔌 Circuit open - the backup jury is hearing this case")
+        return degraded_verdict()
+    
+    queued = time.perf_counter()
+    async with court_admission.admit():
+        record_stage("queue_wait", time.perf_counter() - queued)
+        
+        # Timed from here so queueing for a slot doesn't count as Bedrock latency
+        started = time.monotonic()
+        vision_failed = False
+        
+        with request_usage() as usage:
+            face_analysis = None
+            if image:
+                print("👁️ Analyzing face with Claude Vision...")
+                with timed("image_decode"):
+                    image, media_type = await preprocess_image_async(image)
+                with timed("vision"):
+                    vision_result = await asyncio.to_thread(analyze_face_with_vision, image, media_type)
+                vision_failed = vision_result.get("error", False)
+                face_analysis = vision_result.get("analysis", "No analysis available")
+                print(f"👁️ Vision result: {vision_result.get('verdict')}")
+                emit_court_event("vision", verdict=vision_result.get("verdict"))
+            
+            try:
+                print("⚖️ The Court is now in session...")
+                result, healthy = await deliberate(user_plea, face_analysis, orchestration)
+                court_breaker.record(healthy and not vision_failed, time.monotonic() - started)
+                
+            except Exception as e:
+                print(f"❌ Court error: {e}")
+                court_breaker.record(False, time.monotonic() - started)
+                result = court_error_verdict(e)
+        
+        print(f"🪙 Tokens: {format_usage(usage)}")
+        result["token_usage"] = usage
+        return result
 
-Remember: Your output MUST end with valid JSON in this format:
-{
-    "verdict": "GRANTED" or "DENIED",
-    "reasoning": "Your summary",
-    "roast": "Your one-liner",
-    "jury_votes": {"skeptic": "REAL/FAKE", "doctor": "CRITICAL/STABLE", "gambler": "IN/OUT"}
-}
-"""
+
+# ============================================================================
+# STREAMING API FUNCTION
+# ============================================================================
+
+async def stream_court_of_relief(
+    user_plea: str,
+    image_base64: Optional[str] = None,
+    demo_mode: bool = False,
+    mock_mode: bool = None,
+    orchestration: Optional[str] = None,
+    image: Optional[bytes] = None
+) -> AsyncIterator[tuple]:
+    """
+    Run a deliberation, yielding (event, data) pairs as each stage completes.
+    
+    Events, in order:
+        vision  - {"verdict"}            (only when an image was submitted)
+        juror   - {"juror", "vote"}      (once per juror, as each one rules)
+        verdict - {"verdict", "reasoning", "jury_votes"}
+        roast   - {"roast"}
+    
+    If the consumer stops listening, the deliberation is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    def listener(event: str, data: dict):
+        loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+    
+    async def run() -> dict:
+        # Runs in its own task, so this only affects this deliberation
+        _court_event_listener.set(listener)
+        try:
+            return await run_court_of_relief_async(
+                user_plea=user_plea,
+                image_base64=image_base64,
+                demo_mode=demo_mode,
+                mock_mode=mock_mode,
+                orchestration=orchestration,
+                image=image
+            )
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+    
+    task = asyncio.create_task(run())
+    reported = set()
     
     try:
-        # Run the Judge agent - it will orchestrate the jury
-        print("⚖️ The Court is now in session...")
-        response = pit_boss_judge(case_presentation)
-        result_text = str(response)
+        while (item := await queue.get()) is not None:
+            event, data = item
+            if event == "juror":
+                reported.add(data["juror"])
+            elif event == "verdict":
+                # The verdict engine rules before the roast is written
+                reported.add("verdict")
+            yield event, data
         
-        # Try to parse JSON from the response
-        try:
-            json_start = result_text.find('{')
-            json_end = result_text.rfind('}') + 1
-            if json_start != -1 and json_end > json_start:
-                json_str = result_text[json_start:json_end]
-                result = json.loads(json_str)
-                # Remove door_code if present
-                result.pop("door_code", None)
-                return result
-        except json.JSONDecodeError:
-            pass
+        result = await task
+        jury_votes = result.get("jury_votes", {})
         
-        # Fallback if JSON parsing fails
-        return {
-            "verdict": "DENIED",
-            "reasoning": "The Court experienced technical difficulties during deliberation.",
-            "roast": result_text[:200] if result_text else "The house always wins. Try again.",
-            "jury_votes": {
-                "skeptic": "UNKNOWN",
-                "doctor": "UNKNOWN", 
-                "gambler": "UNKNOWN"
-            }
-        }
+        # Demo/mock verdicts (and Pit Bosses that skip a juror) never report
+        # individual votes, so fill them in from the final tally
+        for juror in ("skeptic", "doctor", "gambler"):
+            if juror not in reported:
+                yield "juror", {"juror": juror, "vote": jury_votes.get(juror, "UNKNOWN")}
         
-    except Exception as e:
-        print(f"❌ Court error: {e}")
-        return {
-            "verdict": "DENIED",
-            "reasoning": f"Court error: {str(e)}",
-            "roast": "Even the machines are against you today. House wins by default.",
-            "jury_votes": {
-                "skeptic": "ERROR",
-                "doctor": "ERROR",
-                "gambler": "ERROR"
+        if "verdict" not in reported:
+            yield "verdict", {
+                "verdict": result.get("verdict", "DENIED"),
+                "reasoning": result.get("reasoning", "The Court has ruled."),
+                "jury_votes": jury_votes,
             }
-        }
+        yield "roast", {"roast": result.get("roast", "No comment.")}
+    finally:
+        if not task.done():
+            task.cancel()
 
 
 # ============================================================================
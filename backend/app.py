@@ -4,60 +4,63 @@ The High-Stakes Restroom Finder API
 
 Endpoints:
 - POST /api/judge - Submit a plea for bathroom access
+- POST /api/judge/stream - Same, streamed as Server-Sent Events
+- POST /api/judge/upload - Plea with the photo as a multipart file upload
+- POST /api/judge/image - Plea in the query string, raw photo bytes as the body
 - GET /api/health - Health check
 - POST /api/demo - Demo mode (always wins)
+- GET /api/cache/stats - Cache hit/miss counters (and coalesced duplicate pleas)
+- GET /api/hedge/stats - Hedged request rate and win counters
+- GET /api/admission/stats - Adaptive concurrency limit and queue counters
+- GET /api/routing/stats - The model each agent is routed to, and fast-tier downgrades
+- GET /api/usage/stats - Cumulative token usage (and prompt cache hits) per agent
+- GET /api/metrics - Per-stage latency histograms (Prometheus text format)
+- GET /api/stats - Grant rate, vote distribution and latency percentiles from the verdict log
 """
 
 import os
 import json
-import base64
-from typing import Optional
+import time
+import asyncio
+from typing import Optional, AsyncIterator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 # Import our agents
-from agents import run_court_of_relief
-
-
-# ============================================================================
-# PYDANTIC MODELS
-# ============================================================================
-
-class PleaRequest(BaseModel):
-    """Request body for bathroom access plea."""
-    plea: str
-    image_base64: Optional[str] = None
-    demo_mode: bool = False
-
-
-class JuryVotes(BaseModel):
-    """Individual jury member votes."""
-    skeptic: str
-    doctor: str
-    gambler: str
-
+from agents import (
+    run_court_of_relief_async,
+    stream_court_of_relief,
+    court_breaker,
+    court_admission,
+    model_router,
+    warm_up,
+    COURT_WARM_UP,
+)
+from admission import CourtOverloaded
+from vision import decode_image, IMAGE_MAX_BYTES
+from vision_cache import vision_cache
+from plea_cache import plea_cache
+from single_flight import plea_flights, plea_flight_key
+from verdict_log import verdict_log
+from hedging import hedger
+from token_usage import token_ledger
+from metrics import request_timer, timed, server_timing, current_timings, render_prometheus, render_gauges
+from schemas import PleaRequest, JuryVotes, VerdictResponse, HealthResponse
 
-class VerdictResponse(BaseModel):
-    """Response from the Court of Relief."""
-    verdict: str  # "GRANTED" or "DENIED"
-    reasoning: str
-    roast: str
-    jury_votes: JuryVotes
 
+# Uploads are read this many bytes at a time
+UPLOAD_CHUNK_BYTES = 64 * 1024
 
-class HealthResponse(BaseModel):
-    """Health check response."""
-    status: str
-    service: str
-    version: str
+# Largest request body: a base64 image at the limit, plus room for the plea
+# and the multipart/JSON framing
+MAX_REQUEST_BYTES = 4 * -(-IMAGE_MAX_BYTES // 3) + 64 * 1024
 
 
 # ============================================================================
@@ -68,7 +71,16 @@ class HealthResponse(BaseModel):
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     print("🚽 Lucky Loo Court of Relief is now in session!")
+    
+    # Warm up off the event loop so the worker takes requests right away -
+    # a plea that arrives first just waits for the court being built
+    warming = asyncio.create_task(asyncio.to_thread(warm_up)) if COURT_WARM_UP else None
     yield
+    if warming is not None:
+        await warming
+    if verdict_log is not None:
+        # Write out any verdicts still queued
+        await asyncio.to_thread(verdict_log.close)
     print("🎰 Court adjourned. House always wins.")
 
 
@@ -79,6 +91,30 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+
+class RequestSizeLimit:
+    """Turn away bodies declared larger than MAX_REQUEST_BYTES before they are read."""
+    
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            length = dict(scope["headers"]).get(b"content-length")
+            if length is not None and length.isdigit() and int(length) > self.max_bytes:
+                response = JSONResponse(
+                    {"detail": "That's more evidence than the Court can carry."},
+                    status_code=413
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+# Inside CORS, so the 413 still reaches the browser
+app.add_middleware(RequestSizeLimit, max_bytes=MAX_REQUEST_BYTES)
+
 # CORS middleware for frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -89,53 +125,147 @@ app.add_middleware(
 )
 
 
+# ============================================================================
+# IMAGE INGESTION - Photos stay raw bytes until the Bedrock request
+# ============================================================================
+
+def image_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Photos are limited to {IMAGE_MAX_BYTES // (1024 * 1024)} MB. The Court has seen enough."
+    )
+
+
+def take_image(request: PleaRequest) -> Optional[bytes]:
+    """
+    Decode a JSON plea's base64 photo, once.
+    
+    The base64 string is dropped from the request as soon as it's decoded,
+    so it isn't held for the rest of the deliberation.
+    """
+    if not request.image_base64:
+        return None
+    try:
+        image = decode_image(request.image_base64)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="image_base64 is not valid base64.")
+    request.image_base64 = None
+    if len(image) > IMAGE_MAX_BYTES:
+        raise image_too_large()
+    return image
+
+
+async def read_limited(chunks: AsyncIterator[bytes]) -> bytes:
+    """Collect a streamed body, giving up (413) as soon as it passes IMAGE_MAX_BYTES."""
+    parts, size = [], 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > IMAGE_MAX_BYTES:
+            raise image_too_large()
+        parts.append(chunk)
+    return b"".join(parts)
+
+
+async def upload_chunks(upload: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+        yield chunk
+
+
+def court_overloaded(error: CourtOverloaded) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="The Court is packed. Cross your legs and try again shortly.",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+def validate_plea(plea: Optional[str]):
+    if not plea or len(plea.strip()) < 3:
+        raise HTTPException(
+            status_code=400,
+            detail="Your plea must be at least 3 characters. The Court requires substance."
+        )
+
+
+def log_verdict(inputs_hash: str, result: dict, started: float, has_image: bool):
+    """Queue a finished deliberation for the verdict log (demo verdicts aren't logged)."""
+    if verdict_log is not None:
+        verdict_log.record(inputs_hash, result, current_timings(), time.perf_counter() - started, has_image)
+
+
+async def hear(inputs_hash: str, plea: str, image: Optional[bytes], demo_mode: bool) -> dict:
+    """One deliberation, logged once however many identical pleas share it."""
+    started = time.perf_counter()
+    result = await run_court_of_relief_async(
+        user_plea=plea,
+        image=image,
+        demo_mode=demo_mode
+    )
+    if not demo_mode:
+        log_verdict(inputs_hash, result, started, image is not None)
+    return result
+
+
+async def judge(plea: str, image: Optional[bytes], demo_mode: bool, response: Response) -> VerdictResponse:
+    """
+    Run the Court of Relief (off the event loop) and build the verdict.
+    
+    Identical pleas already being heard share that deliberation's verdict.
+    """
+    with request_timer() as timings:
+        inputs_hash = plea_flight_key(plea, image, demo_mode)
+        try:
+            result = await plea_flights.run(
+                inputs_hash,
+                lambda: hear(inputs_hash, plea, image, demo_mode)
+            )
+        except CourtOverloaded as e:
+            raise court_overloaded(e)
+        
+        with timed("response_build"):
+            verdict = VerdictResponse(
+                verdict=result.get("verdict", "DENIED"),
+                reasoning=result.get("reasoning", "The Court has ruled."),
+                roast=result.get("roast", "No comment."),
+                jury_votes=JuryVotes(**result.get("jury_votes", {
+                    "skeptic": "UNKNOWN",
+                    "doctor": "UNKNOWN",
+                    "gambler": "UNKNOWN"
+                })),
+                token_usage=result.get("token_usage")
+            )
+    
+    response.headers["Server-Timing"] = server_timing(timings)
+    return verdict
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
 
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint. Reports "degraded" while the Bedrock circuit is open."""
     return HealthResponse(
-        status="healthy",
+        status="healthy" if court_breaker.state == "closed" else "degraded",
         service="lucky-loo-court",
         version="1.0.0"
     )
 
 
 @app.post("/api/judge", response_model=VerdictResponse)
-async def submit_plea(request: PleaRequest):
+async def submit_plea(request: PleaRequest, response: Response):
     """
     Submit a plea for bathroom access to the Court of Relief.
     
     The AI Jury (The Skeptic, The Doctor, The Gambler) will deliberate,
-    and The Pit Boss will deliver the final verdict.
+    and The Pit Boss will deliver the final verdict. Per-stage timings are
+    returned in the Server-Timing header.
     """
     try:
-        # Validate plea
-        if not request.plea or len(request.plea.strip()) < 3:
-            raise HTTPException(
-                status_code=400,
-                detail="Your plea must be at least 3 characters. The Court requires substance."
-            )
-        
-        # Run the Court of Relief
-        result = run_court_of_relief(
-            user_plea=request.plea,
-            image_base64=request.image_base64,
-            demo_mode=request.demo_mode
-        )
-        
-        return VerdictResponse(
-            verdict=result.get("verdict", "DENIED"),
-            reasoning=result.get("reasoning", "The Court has ruled."),
-            roast=result.get("roast", "No comment."),
-            jury_votes=JuryVotes(**result.get("jury_votes", {
-                "skeptic": "UNKNOWN",
-                "doctor": "UNKNOWN",
-                "gambler": "UNKNOWN"
-            }))
-        )
+        validate_plea(request.plea)
+        image = take_image(request)
+        return await judge(request.plea, image, request.demo_mode, response)
         
     except HTTPException:
         raise
@@ -147,42 +277,125 @@ async def submit_plea(request: PleaRequest):
         )
 
 
-@app.post("/api/judge/upload")
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/judge/stream")
+async def submit_plea_stream(request: PleaRequest):
+    """
+    Submit a plea and watch the Court deliberate live.
+    
+    Streams Server-Sent Events as each stage completes: `vision` (if an
+    image was sent), one `juror` event per juror vote, then `verdict`
+    and `roast`. Failures are reported as an `error` event.
+    """
+    validate_plea(request.plea)
+    image = take_image(request)
+    
+    # Turn the plea away before the stream starts if it can't get in line
+    if not request.demo_mode and court_admission.queue_full():
+        raise court_overloaded(CourtOverloaded(court_admission.retry_after()))
+    
+    async def event_stream():
+        started = time.perf_counter()
+        try:
+            with request_timer():
+                ruling = None
+                async for event, data in stream_court_of_relief(
+                    user_plea=request.plea,
+                    image=image,
+                    demo_mode=request.demo_mode
+                ):
+                    if event == "verdict":
+                        data["jury_votes"] = JuryVotes(**{
+                            "skeptic": "UNKNOWN",
+                            "doctor": "UNKNOWN",
+                            "gambler": "UNKNOWN",
+                            **data["jury_votes"]
+                        }).model_dump()
+                        ruling = data
+                    yield sse_event(event, data)
+                
+                if ruling is not None and not request.demo_mode:
+                    log_verdict(
+                        plea_flight_key(request.plea, image), ruling, started, image is not None
+                    )
+        except CourtOverloaded as e:
+            yield sse_event("error", {
+                "detail": "The Court is packed. Cross your legs and try again shortly.",
+                "retry_after": e.retry_after
+            })
+        except Exception as e:
+            print(f"Court error: {e}")
+            yield sse_event("error", {
+                "detail": f"The Court experienced an unexpected error: {str(e)}"
+            })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/judge/upload", response_model=VerdictResponse)
 async def submit_plea_with_image(
+    response: Response,
     plea: str = Form(...),
     demo_mode: bool = Form(False),
     image: Optional[UploadFile] = File(None)
 ):
     """
     Submit a plea with an uploaded image file.
-    Alternative to base64 encoding for easier frontend integration.
+    Alternative to base64 encoding for easier frontend integration - the
+    file is read in chunks and never base64-encoded until it goes to Bedrock.
     """
     try:
-        image_base64 = None
-        
+        contents = None
         if image:
-            # Read and encode the image
-            contents = await image.read()
-            image_base64 = base64.b64encode(contents).decode('utf-8')
+            if image.size is not None and image.size > IMAGE_MAX_BYTES:
+                raise image_too_large()
+            contents = await read_limited(upload_chunks(image)) or None
         
-        # Run the Court of Relief
-        result = run_court_of_relief(
-            user_plea=plea,
-            image_base64=image_base64,
-            demo_mode=demo_mode
-        )
+        return await judge(plea, contents, demo_mode, response)
         
-        return VerdictResponse(
-            verdict=result.get("verdict", "DENIED"),
-            reasoning=result.get("reasoning", "The Court has ruled."),
-            roast=result.get("roast", "No comment."),
-            jury_votes=JuryVotes(**result.get("jury_votes", {
-                "skeptic": "UNKNOWN",
-                "doctor": "UNKNOWN",
-                "gambler": "UNKNOWN"
-            }))
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Court error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"The Court experienced an unexpected error: {str(e)}"
         )
+
+
+@app.post("/api/judge/image", response_model=VerdictResponse)
+async def submit_plea_raw_image(
+    request: Request,
+    response: Response,
+    plea: str,
+    demo_mode: bool = False
+):
+    """
+    Submit a plea with the photo as the raw request body.
+    
+    The cheapest way in for kiosks: `POST /api/judge/image?plea=...` with
+    the JPEG/PNG bytes as the body (Content-Type: image/*). The body is
+    streamed in and its size checked as it arrives.
+    """
+    try:
+        validate_plea(plea)
+        length = request.headers.get("content-length")
+        if length is not None and length.isdigit() and int(length) > IMAGE_MAX_BYTES:
+            raise image_too_large()
+        image = await read_limited(request.stream()) or None
+        
+        return await judge(plea, image, demo_mode, response)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Court error: {e}")
         raise HTTPException(
@@ -197,7 +410,7 @@ async def demo_mode():
     Demo mode endpoint - always grants access.
     Use this for stage presentations.
     """
-    result = run_court_of_relief(
+    result = await run_court_of_relief_async(
         user_plea="Demo mode activated",
         demo_mode=True
     )
@@ -214,6 +427,89 @@ async def demo_mode():
     )
 
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the in-process caches, plus coalesced duplicate pleas."""
+    return {
+        "vision": vision_cache.stats(),
+        "plea": plea_cache.stats(),
+        "single_flight": plea_flights.stats()
+    }
+
+
+@app.get("/api/hedge/stats")
+async def hedge_stats():
+    """Hedge rate, win counters and current deadlines per kind of call."""
+    return hedger.stats()
+
+
+@app.get("/api/admission/stats")
+async def admission_stats():
+    """Current concurrency limit, queue depth and admit/reject counters."""
+    return court_admission.stats()
+
+
+@app.get("/api/routing/stats")
+async def routing_stats():
+    """The model each agent is routed to right now, and how often jurors were moved to the fast tier."""
+    return model_router.stats()
+
+
+@app.get("/api/stats")
+async def verdict_stats():
+    """
+    Aggregates over every logged deliberation: grant rate, verdict and vote
+    counts, and latency percentiles overall and per stage. Maintained as
+    verdicts are written, so this never scans the log (and lags it by at
+    most VERDICT_LOG_FLUSH_INTERVAL).
+    """
+    if verdict_log is None:
+        return {"enabled": False}
+    # SQLite (and, on first use, creating the schema) stays off the event loop
+    return {"enabled": True, **await asyncio.to_thread(verdict_log.stats)}
+
+
+@app.get("/api/usage/stats")
+async def usage_stats():
+    """Input/output tokens used by each agent since startup."""
+    return token_ledger.stats()
+
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus scrape endpoint.
+    
+    Latency histograms for every Court stage (queue wait, image decode,
+    vision, each juror, judge, JSON parse, roast, response build) plus
+    cache, circuit breaker, hedging, model routing and token counters as
+    gauges.
+    """
+    breaker = court_breaker.stats()
+    lines = [
+        render_gauges("court_vision_cache", vision_cache.stats(), "Vision cache counter."),
+        render_gauges("court_plea_cache", plea_cache.stats(), "Plea cache counter."),
+        render_gauges("court_single_flight", plea_flights.stats(), "Coalesced duplicate plea counter."),
+        render_gauges("court_breaker", {**breaker, "open": int(breaker["state"] != "closed")},
+                      "Bedrock circuit breaker counter."),
+    ]
+    lines.append(render_gauges("court_admission", court_admission.stats(), "Admission control gauge."))
+    routing = model_router.stats()
+    lines.append(render_gauges("court_routing", {**routing, "downgraded": int(routing["downgraded"])},
+                               "Model routing counter."))
+    for kind, counters in hedger.stats()["kinds"].items():
+        lines.append(render_gauges(f"court_hedge_{kind}", counters, "Hedged request counter."))
+    usage = token_ledger.stats()
+    for agent, counters in usage["agents"].items():
+        lines.append(render_gauges(f"court_tokens_{agent}", counters, "Token usage counter."))
+    lines.append(render_gauges("court_tokens_total", usage["total"], "Token usage across all agents."))
+    
+    return PlainTextResponse(
+        render_prometheus(*lines),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API info."""
@@ -223,8 +519,17 @@ async def root():
         "endpoints": {
             "health": "GET /api/health",
             "judge": "POST /api/judge",
+            "judge_stream": "POST /api/judge/stream",
             "judge_upload": "POST /api/judge/upload",
-            "demo": "POST /api/demo"
+            "judge_image": "POST /api/judge/image?plea=...",
+            "demo": "POST /api/demo",
+            "cache_stats": "GET /api/cache/stats",
+            "hedge_stats": "GET /api/hedge/stats",
+            "admission_stats": "GET /api/admission/stats",
+            "routing_stats": "GET /api/routing/stats",
+            "usage_stats": "GET /api/usage/stats",
+            "metrics": "GET /api/metrics",
+            "stats": "GET /api/stats"
         },
         "jury": ["The Skeptic", "The Doctor", "The Gambler"],
         "judge": "The Pit Boss"
@@ -236,9 +541,21 @@ async def root():
 # ============================================================================
 
 if __name__ == "__main__":
+    import argparse
+    import tempfile
     import uvicorn
     
+    parser = argparse.ArgumentParser(description="Run the Lucky Loo API.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", "0")),
+        help="Worker processes for production (0 = one dev server with auto-reload)"
+    )
+    args = parser.parse_args()
+    
     port = int(os.getenv("PORT", 8000))
+    mode = f"{args.workers} workers" if args.workers else "dev mode, auto-reload"
     
     print(f"""
     🎰 ══════════════════════════════════════════ 🎰
@@ -246,14 +563,29 @@ if __name__ == "__main__":
        LUCKY LOO - COURT OF RELIEF
        "The High-Stakes Restroom Finder"
        
-       Server starting on port {port}...
+       Server starting on port {port} ({mode})...
        
     🎰 ══════════════════════════════════════════ 🎰
     """)
     
-    uvicorn.run(
-        "app:app",
-        host="0.0.0.0",
-        port=port,
-        reload=True
-    )
+    if args.workers:
+        # Production: one process per core, sharing their caches through a
+        # SQLite file. The supervisor replaces workers that die, and SIGHUP
+        # restarts them all, each finishing its in-flight pleas first.
+        if not os.getenv("SHARED_CACHE_PATH"):
+            os.environ["SHARED_CACHE_PATH"] = os.path.join(tempfile.gettempdir(), "lucky_loo_cache.sqlite3")
+        print(f"🗄️ Shared cache: {os.environ['SHARED_CACHE_PATH']}")
+        uvicorn.run(
+            "app:app",
+            host="0.0.0.0",
+            port=port,
+            workers=args.workers,
+            timeout_graceful_shutdown=int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+        )
+    else:
+        uvicorn.run(
+            "app:app",
+            host="0.0.0.0",
+            port=port,
+            reload=True
+        )
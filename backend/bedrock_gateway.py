@@ -0,0 +1,141 @@
+"""
+Lucky Loo - Bedrock Gateway
+The one place that talks to boto3. Every vision call and every Strands
+agent gets its Bedrock client from here, so credentials are resolved once
+per region and HTTPS connections are pooled and kept alive instead of
+being rebuilt on every call.
+
+boto3 and Strands are imported on first use, so mock-mode processes never
+pay for them.
+
+Every throttled Bedrock attempt (including ones botocore retries away) is
+counted, so admission control can tell when the Court is pushing too hard.
+
+With BEDROCK_CASSETTE_MODE set, every client handed out here records its
+traffic to (or replays it from) a cassette - see cassette.py.
+"""
+
+import os
+import threading
+from typing import Optional, TYPE_CHECKING
+
+from cassette import wrap_client
+
+if TYPE_CHECKING:
+    import boto3
+    from botocore.config import Config as BotocoreConfig
+    from strands.models import BedrockModel
+
+
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+
+# Send all Bedrock traffic somewhere other than AWS - e.g. fake_bedrock.py
+# for offline load tests. Empty = the real regional endpoint.
+BEDROCK_ENDPOINT_URL = os.getenv("BEDROCK_ENDPOINT_URL", "") or None
+
+# Connection pool and retry tuning
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "50"))
+BEDROCK_CONNECT_TIMEOUT = float(os.getenv("BEDROCK_CONNECT_TIMEOUT", "5"))
+BEDROCK_READ_TIMEOUT = float(os.getenv("BEDROCK_READ_TIMEOUT", "60"))
+BEDROCK_MAX_ATTEMPTS = int(os.getenv("BEDROCK_MAX_ATTEMPTS", "4"))
+BEDROCK_RETRY_MODE = os.getenv("BEDROCK_RETRY_MODE", "adaptive")
+
+
+def build_client_config() -> "BotocoreConfig":
+    """Botocore settings shared by every Bedrock client."""
+    from botocore.config import Config as BotocoreConfig
+
+    return BotocoreConfig(
+        max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+        connect_timeout=BEDROCK_CONNECT_TIMEOUT,
+        read_timeout=BEDROCK_READ_TIMEOUT,
+        tcp_keepalive=True,
+        retries={
+            "mode": BEDROCK_RETRY_MODE,
+            "total_max_attempts": BEDROCK_MAX_ATTEMPTS,
+        },
+    )
+
+
+# boto3 sessions aren't safe to build clients from concurrently, so all
+# construction happens under one lock and the results are cached per region
+_lock = threading.Lock()
+_sessions: dict = {}
+_runtime_clients: dict = {}
+
+
+# HTTP statuses and error codes Bedrock uses to say "slow down"
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_CODES = ("ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException")
+
+_throttles = 0
+
+
+def throttle_count() -> int:
+    """Throttled Bedrock attempts since startup."""
+    return _throttles
+
+
+def _count_throttle(response_dict=None, exception=None, **kwargs):
+    """botocore response-received hook, called once per attempt."""
+    global _throttles
+    code = getattr(exception, "response", {}).get("Error", {}).get("Code") if exception else None
+    status = (response_dict or {}).get("status_code")
+    if status in THROTTLE_STATUSES or code in THROTTLE_CODES:
+        with _lock:
+            _throttles += 1
+
+
+def get_session(region: Optional[str] = None) -> "boto3.Session":
+    """Get the shared boto3 session for a region."""
+    import boto3
+
+    region = region or AWS_REGION
+    with _lock:
+        session = _sessions.get(region)
+        if session is None:
+            session = boto3.Session(region_name=region)
+            # Clients copy the session's hooks when they're built
+            session.events.register("response-received.bedrock-runtime", _count_throttle)
+            _sessions[region] = session
+        return session
+
+
+def get_bedrock_runtime(region: Optional[str] = None):
+    """Get the pooled bedrock-runtime client for a region (thread-safe, reused)."""
+    region = region or AWS_REGION
+    session = get_session(region)
+    with _lock:
+        client = _runtime_clients.get(region)
+        if client is None:
+            client = session.client(
+                service_name="bedrock-runtime",
+                config=build_client_config(),
+                endpoint_url=BEDROCK_ENDPOINT_URL
+            )
+            client = wrap_client(client)
+            _runtime_clients[region] = client
+        return client
+
+
+def build_bedrock_model(model_id: str, region: Optional[str] = None, **model_config) -> "BedrockModel":
+    """
+    Build a Strands BedrockModel on the shared session and connection settings.
+
+    Strands owns the client inside a BedrockModel, so build one model per
+    model ID and config (e.g. max_tokens) and share it between agents
+    rather than one per agent.
+    """
+    from strands.models import BedrockModel
+
+    session = get_session(region)
+    with _lock:
+        model = BedrockModel(
+            model_id=model_id,
+            boto_session=session,
+            boto_client_config=build_client_config(),
+            endpoint_url=BEDROCK_ENDPOINT_URL,
+            **model_config
+        )
+    model.client = wrap_client(model.client)
+    return model
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Lucky Loo - Benchmark
+Load-tests the Court API in-process, without AWS.
+
+Drives /api/judge, /api/judge/upload, /api/judge/image and /api/demo through the ASGI app at
+one or more concurrency levels, in MOCK_MODE with simulated per-agent
+Bedrock latency (see MOCK_LATENCY in mock_responses.py). Reports
+throughput, p50/p95/p99 latency, event-loop lag and the mean time spent
+in each Court stage, and saves the run as JSON so runs can be compared.
+
+With --fake-bedrock the mocks are skipped: the real Court pipeline (Strands
+agents, tool calls, streaming, vision) runs against fake_bedrock.py on a
+background thread, with the same latency spec plus optional throttling and
+errors. The fake server shares the process, so it costs some CPU too.
+
+With --replay the real pipeline runs against a Bedrock cassette recorded
+from live traffic (see cassette.py), at its recorded speed or instantly.
+
+With --startup it profiles process startup instead: how long importing the
+API takes in mock and live mode (next to app_simple.py as a baseline), how
+long the live warm-up takes, and which packages the import time goes to.
+
+Usage:
+    python benchmark.py                                    # every endpoint at 1, 4 and 16
+    python benchmark.py --endpoint judge --concurrency 8,32 --requests 200
+    python benchmark.py --latency "doctor=1.5:0.3,judge=2.5:0.4" --orchestration parallel
+    python benchmark.py --image --output after.json --compare before.json
+    python benchmark.py --fake-bedrock --throttle-rate 0.05 --orchestration agentic
+    python benchmark.py --replay cassettes/bedrock.jsonl --replay-latency instant
+    python benchmark.py --startup --output startup.json
+"""
+
+import os
+import io
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import statistics
+import contextlib
+import subprocess
+from datetime import datetime, timezone
+
+# A realistic deliberation: ~1s vision, ~1.2-1.6s per juror, ~2.5s Pit Boss
+DEFAULT_LATENCY = "vision=0.9:0.25,skeptic=1.2:0.3,doctor=1.6:0.3,gambler=1.2:0.3,judge=2.5:0.35"
+
+ENDPOINTS = ("judge", "upload", "image", "demo")
+
+PLEAS = [
+    "PLEASE! I've been holding it for 4 hours! I'm about to EXPLODE!",
+    "I had the all-you-can-eat shrimp at 4am. You know what that means.",
+    "Hey, I kinda need to use the bathroom when you get a chance.",
+    "Three margaritas, one bladder, zero patience. Let me in.",
+]
+
+# Fresh interpreters per startup profile - the median is reported
+STARTUP_RUNS = 3
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load-test the Court of Relief API in-process.")
+    parser.add_argument("--endpoint", default="all", choices=ENDPOINTS + ("all",))
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--latency", default=DEFAULT_LATENCY, help="MOCK_LATENCY spec ('' for instant mocks)")
+    parser.add_argument("--orchestration", default=None, choices=("agentic", "parallel", "rules"))
+    parser.add_argument("--image", action="store_true", help="Attach a webcam-sized photo to /api/judge pleas")
+    parser.add_argument("--output", default=None, help="Where to save the results (JSON)")
+    parser.add_argument("--compare", default=None, help="A previous results file to compare against")
+    parser.add_argument("--fake-bedrock", action="store_true", help="Run the real pipeline against fake_bedrock.py")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fake Bedrock: share of calls throttled")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake Bedrock: share of calls failed")
+    parser.add_argument("--replay", default=None, help="Run the real pipeline against a recorded Bedrock cassette")
+    parser.add_argument("--replay-latency", default="recorded", choices=("recorded", "instant"))
+    parser.add_argument("--startup", action="store_true", help="Profile API import and warm-up time instead")
+    parser.add_argument("--verbose", action="store_true", help="Show the Court's own logging")
+    return parser.parse_args()
+
+
+# ============================================================================
+# STATS
+# ============================================================================
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize_ms(values: list) -> dict:
+    """p50/p95/p99/mean/max of a list of seconds, in milliseconds."""
+    return {
+        "p50": round(percentile(values, 50) * 1000, 1),
+        "p95": round(percentile(values, 95) * 1000, 1),
+        "p99": round(percentile(values, 99) * 1000, 1),
+        "mean": round(sum(values) / len(values) * 1000, 1) if values else 0.0,
+        "max": round(max(values) * 1000, 1) if values else 0.0,
+    }
+
+
+def parse_server_timing(header: str) -> dict:
+    """Parse a Server-Timing header into {stage: milliseconds}."""
+    stages = {}
+    for entry in filter(None, (part.strip() for part in header.split(","))):
+        name, _, duration = entry.partition(";dur=")
+        if duration:
+            stages[name] = float(duration)
+    return stages
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes a sleeping task.
+
+    Anything that blocks the loop (sync I/O, CPU-heavy parsing, image work
+    done inline) shows up here as lag.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+
+def make_test_image() -> bytes:
+    """A 1280x720 JPEG, about the size of a kiosk webcam frame."""
+    from PIL import Image
+
+    image = Image.linear_gradient("L").resize((1280, 720)).convert("RGB")
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+
+# ============================================================================
+# LOAD
+# ============================================================================
+
+async def send(client, endpoint: str, index: int, image: bytes, image_base64: str):
+    # Numbered so no two requests are identical pleas that single-flight would coalesce
+    plea = f"{PLEAS[index % len(PLEAS)]} (#{index})"
+    if endpoint == "judge":
+        body = {"plea": plea}
+        if image_base64:
+            body["image_base64"] = image_base64
+        return await client.post("/api/judge", json=body)
+    if endpoint == "upload":
+        return await client.post(
+            "/api/judge/upload",
+            data={"plea": plea},
+            files={"image": ("face.jpg", image, "image/jpeg")}
+        )
+    if endpoint == "image":
+        return await client.post(
+            "/api/judge/image",
+            params={"plea": plea},
+            content=image,
+            headers={"Content-Type": "image/jpeg"}
+        )
+    return await client.post("/api/demo")
+
+
+async def run_level(client, endpoint: str, concurrency: int, total: int, image: bytes, image_base64: str) -> dict:
+    """Send `total` requests to an endpoint, `concurrency` at a time."""
+    from single_flight import plea_flights
+
+    latencies, stage_totals, errors, shed = [], {}, 0, 0
+    next_index = 0
+    monitor = LoopLagMonitor()
+
+    async def worker():
+        nonlocal next_index, errors, shed
+        while next_index < total:
+            index = next_index
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                response = await send(client, endpoint, index, image, image_base64)
+                ok = response.status_code == 200
+            except Exception:
+                response, ok = None, False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+                # Turned away by admission control rather than failed
+                if response is not None and response.status_code == 429:
+                    shed += 1
+            elif "server-timing" in response.headers:
+                for stage, ms in parse_server_timing(response.headers["server-timing"]).items():
+                    stage_totals[stage] = stage_totals.get(stage, 0.0) + ms
+
+    flights_before = plea_flights.stats()
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+    flights_after = plea_flights.stats()
+
+    completed = total - errors
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "shed": shed,
+        # Deliberations actually convened vs. requests that rode along on one
+        "executed": flights_after["leaders"] - flights_before["leaders"],
+        "coalesced": flights_after["coalesced"] - flights_before["coalesced"],
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize_ms(latencies),
+        "loop_lag_ms": summarize_ms(monitor.samples),
+        "stages_mean_ms": {
+            stage: round(ms / completed, 1) for stage, ms in sorted(stage_totals.items())
+        } if completed else {},
+    }
+
+
+async def run_benchmark(args) -> list:
+    import httpx
+    from app import app
+
+    image = make_test_image()
+    image_base64 = None
+    if args.image:
+        import base64
+        image_base64 = base64.b64encode(image).decode("utf-8")
+
+    endpoints = ENDPOINTS if args.endpoint == "all" else (args.endpoint,)
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for endpoint in endpoints:
+            for concurrency in levels:
+                with quiet(args.verbose):
+                    result = await run_level(client, endpoint, concurrency, args.requests, image, image_base64)
+                print_result(result)
+                results.append(result)
+    return results
+
+
+# ============================================================================
+# STARTUP
+# ============================================================================
+
+STARTUP_SCRIPT = """
+import time
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+if {warm}:
+    import agents
+    agents.warm_up()
+print(imported - started, time.perf_counter() - imported)
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Self import time per top-level package, in ms, from `python -X importtime` output."""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1000
+    return packages
+
+
+def profile_startup(module: str, mock: bool, warm: bool = False) -> dict:
+    """Import `module` in fresh interpreters and report where the time went."""
+    env = {**os.environ, "MOCK_MODE": "true" if mock else "false"}
+    # Building Bedrock clients resolves credentials, which shouldn't mean probing for them
+    env.setdefault("AWS_ACCESS_KEY_ID", "offline")
+    env.setdefault("AWS_SECRET_ACCESS_KEY", "offline")
+
+    imports, warm_ups, packages = [], [], []
+    for _ in range(STARTUP_RUNS):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT.format(module=module, warm=warm)],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        import_seconds, warm_seconds = completed.stdout.split()[-2:]
+        imports.append(float(import_seconds) * 1000)
+        warm_ups.append(float(warm_seconds) * 1000)
+        packages.append(parse_importtime(completed.stderr))
+
+    heaviest = sorted(packages[-1].items(), key=lambda item: item[1], reverse=True)[:8]
+    return {
+        "module": module,
+        "mode": "mock" if mock else "live",
+        "import_ms": round(statistics.median(imports), 1),
+        "warm_up_ms": round(statistics.median(warm_ups), 1) if warm else None,
+        "packages_ms": {package: round(ms, 1) for package, ms in heaviest},
+    }
+
+
+def run_startup_profile() -> list:
+    profiles = [
+        profile_startup("app_simple", mock=True),
+        profile_startup("app", mock=True),
+        profile_startup("app", mock=False, warm=True),
+    ]
+    for profile in profiles:
+        print_startup(profile)
+    return profiles
+
+
+@contextlib.contextmanager
+def quiet(verbose: bool):
+    """Swallow the Court's logging (and Strands' streamed tokens) unless verbose."""
+    if verbose:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def print_result(result: dict):
+    latency, lag = result["latency_ms"], result["loop_lag_ms"]
+    print(
+        f"  {result['endpoint']:<7} c={result['concurrency']:<4} "
+        f"{result['throughput_rps']:>8.2f} req/s   "
+        f"p50 {latency['p50']:>8.1f}  p95 {latency['p95']:>8.1f}  p99 {latency['p99']:>8.1f} ms   "
+        f"loop lag p99 {lag['p99']:>6.1f} ms   errors {result['errors']} (429s {result.get('shed', 0)})   "
+        f"executed {result.get('executed', 0)} coalesced {result.get('coalesced', 0)}"
+    )
+
+
+def print_startup(profile: dict):
+    warm_up = f"  + warm-up {profile['warm_up_ms']:>7.1f} ms" if profile["warm_up_ms"] is not None else ""
+    packages = ", ".join(f"{package} {ms:.0f}" for package, ms in profile["packages_ms"].items())
+    print(f"  {profile['module']:<10} {profile['mode']:<4} import {profile['import_ms']:>7.1f} ms{warm_up}")
+    print(f"      heaviest (ms): {packages}")
+
+
+def compare(previous: dict, results: list):
+    """Print throughput and tail latency changes against a previous run."""
+    before = {(r["endpoint"], r["concurrency"]): r for r in previous.get("results", [])}
+    print(f"\n📊 Compared with {previous.get('started_at', 'previous run')}:")
+    for result in results:
+        old = before.get((result["endpoint"], result["concurrency"]))
+        if old is None:
+            continue
+
+        def change(new_value, old_value):
+            return f"{(new_value - old_value) / old_value * 100:+.1f}%" if old_value else "n/a"
+
+        print(
+            f"  {result['endpoint']:<7} c={result['concurrency']:<4} "
+            f"throughput {change(result['throughput_rps'], old['throughput_rps']):>8}   "
+            f"p95 {change(result['latency_ms']['p95'], old['latency_ms']['p95']):>8}   "
+            f"p99 {change(result['latency_ms']['p99'], old['latency_ms']['p99']):>8}"
+        )
+
+
+def main():
+    args = parse_args()
+
+    if args.startup:
+        print(f"⏱️ Startup profile (median of {STARTUP_RUNS} fresh interpreters)\n")
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "config": {"python": sys.version.split()[0]},
+            "startup": run_startup_profile(),
+        }
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"\n💾 Results saved to {args.output}")
+        return
+
+    # The Court reads its configuration at import time
+    fake_server = None
+    if args.fake_bedrock:
+        from fake_bedrock import start_in_background
+        fake_server, endpoint_url = start_in_background(
+            latency=args.latency,
+            throttle_rate=args.throttle_rate,
+            error_rate=args.error_rate
+        )
+        os.environ["MOCK_MODE"] = "false"
+        os.environ["BEDROCK_ENDPOINT_URL"] = endpoint_url
+        # boto3 still signs requests, so it needs some credentials
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "offline")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "offline")
+    elif args.replay:
+        os.environ["MOCK_MODE"] = "false"
+        os.environ["BEDROCK_CASSETTE_MODE"] = "replay"
+        os.environ["BEDROCK_CASSETTE_PATH"] = args.replay
+        os.environ["BEDROCK_CASSETTE_LATENCY"] = args.replay_latency
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "offline")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "offline")
+    else:
+        os.environ["MOCK_MODE"] = "true"
+        os.environ["MOCK_LATENCY"] = args.latency
+    if args.orchestration:
+        os.environ["COURT_ORCHESTRATION"] = args.orchestration
+    # Synthetic pleas stay out of the verdict log that /api/stats reports
+    os.environ["VERDICT_LOG_PATH"] = "off"
+
+    print("""
+    🎰 ══════════════════════════════════════════ 🎰
+
+       LUCKY LOO - COURT OF RELIEF BENCHMARK
+
+    🎰 ══════════════════════════════════════════ 🎰
+    """)
+    if fake_server:
+        backend = "fake_bedrock"
+        print(f"Backend: fake Bedrock at {os.environ['BEDROCK_ENDPOINT_URL']}")
+    elif args.replay:
+        backend = "cassette"
+        print(f"Backend: cassette {args.replay} ({args.replay_latency} latency)")
+    else:
+        backend = "mock"
+        print("Backend: mock mode")
+    if backend != "cassette":
+        print(f"Simulated latency: {args.latency or 'none'}")
+    print(f"Requests per level: {args.requests}\n")
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with quiet(args.verbose):
+        import agents
+    results = asyncio.run(run_benchmark(args))
+    if fake_server is not None:
+        fake_server.should_exit = True
+
+    report = {
+        "started_at": started_at,
+        "config": {
+            "backend": backend,
+            "latency": args.latency,
+            "throttle_rate": args.throttle_rate,
+            "error_rate": args.error_rate,
+            "orchestration": agents.COURT_ORCHESTRATION,
+            "max_concurrency": agents.COURT_MAX_CONCURRENCY,
+            "image": args.image,
+            "requests": args.requests,
+            "python": sys.version.split()[0],
+        },
+        "results": results,
+        "admission": agents.court_admission.stats(),
+        "routing": agents.model_router.stats(),
+    }
+    if args.replay:
+        from cassette import get_cassette
+        report["cassette"] = get_cassette().stats()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""
+Lucky Loo - Bedrock Cassettes
+Records real Bedrock traffic to a cassette file and plays it back later,
+so a production deliberation can be rerun offline - for profiling, or as
+a regression benchmark - without a live (and nondeterministic) model.
+
+Every bedrock-runtime client from bedrock_gateway is wrapped: the vision
+call's invoke_model and the converse / converse_stream calls the Strands
+agents make. Each call is one JSON line in the cassette with the response
+(or the error) and its timing; streamed responses keep every event with
+its offset from the start of the call. A stream is only marked complete
+once it ran to the end: one the caller hung up on is kept as partial, and
+one that failed part-way keeps its error, so replay fails the same way.
+
+    BEDROCK_CASSETTE_MODE     off, record or replay
+    BEDROCK_CASSETTE_PATH     The cassette file (JSON lines, appended to when recording)
+    BEDROCK_CASSETTE_LATENCY  Replay with the "recorded" timings or "instant"ly
+
+Replay matches a call on everything in its request first. Failing that it
+falls back to any recorded call of the same operation, model and system
+prompt (i.e. the same agent), so a different plea can be replayed against
+a cassette too. Identical calls recorded more than once are served in turn.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Optional
+
+
+BEDROCK_CASSETTE_MODE = os.getenv("BEDROCK_CASSETTE_MODE", "off").lower()
+BEDROCK_CASSETTE_PATH = os.getenv("BEDROCK_CASSETTE_PATH", "cassettes/bedrock.jsonl")
+BEDROCK_CASSETTE_LATENCY = os.getenv("BEDROCK_CASSETTE_LATENCY", "recorded").lower()
+
+
+class CassetteMiss(Exception):
+    """Replay found no recording for a call (or only part of one)."""
+
+
+class RecordedStreamError(Exception):
+    """A non-Bedrock error (e.g. a dropped connection) recorded mid-stream, raised again on replay."""
+
+
+def _digest(value) -> str:
+    def encode(item):
+        if isinstance(item, (bytes, bytearray)):
+            return {"sha256": hashlib.sha256(item).hexdigest()}
+        raise TypeError(f"Can't key on {type(item).__name__}")
+
+    if isinstance(value, (bytes, bytearray)):
+        return hashlib.sha256(value).hexdigest()
+    text = json.dumps(value, sort_keys=True, default=encode)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def request_keys(operation: str, request: dict) -> tuple:
+    """
+    Keys a call is matched on.
+
+    Returns:
+        (exact, loose) - the whole request, and just operation + model +
+        system prompt
+    """
+    model_id = request.get("modelId", "")
+    exact = _digest({"operation": operation, "request": request})
+    loose = _digest({"operation": operation, "modelId": model_id, "system": request.get("system")})
+    return exact, loose
+
+
+class Cassette:
+    """A cassette file: appended to while recording, indexed for replay."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._exact = {}  # key -> [entries]
+        self._loose = {}
+        self._served = {}  # (index name, key) -> calls served
+        self._stats = {"recorded": 0, "replayed": 0, "loose_matches": 0, "misses": 0}
+
+    def load(self) -> "Cassette":
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    self._index(json.loads(line))
+        return self
+
+    def _index(self, entry: dict):
+        self._exact.setdefault(entry["key"], []).append(entry)
+        self._loose.setdefault(entry["loose_key"], []).append(entry)
+
+    def record(self, entry: dict):
+        """Append one call to the cassette file."""
+        line = json.dumps(entry)
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+            self._index(entry)
+            self._stats["recorded"] += 1
+
+    def find(self, operation: str, request: dict) -> dict:
+        """The recording to replay for a call, taking turns between repeats."""
+        exact, loose = request_keys(operation, request)
+        with self._lock:
+            for name, index, key in (("exact", self._exact, exact), ("loose", self._loose, loose)):
+                entries = index.get(key)
+                if entries:
+                    served = self._served.get((name, key), 0)
+                    self._served[(name, key)] = served + 1
+                    self._stats["replayed"] += 1
+                    if name == "loose":
+                        self._stats["loose_matches"] += 1
+                    return entries[served % len(entries)]
+            self._stats["misses"] += 1
+        raise CassetteMiss(f"No recording of {operation} for model {request.get('modelId')} in {self.path}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "calls": sum(len(entries) for entries in self._exact.values())}
+
+
+# ============================================================================
+# CLIENT WRAPPER
+# ============================================================================
+
+class CassetteClient:
+    """
+    A bedrock-runtime client that records its calls, or replays them.
+
+    Anything other than the recorded operations (client.meta and so on)
+    is passed through to the real client.
+    """
+
+    def __init__(self, client, cassette: Cassette, mode: str, latency: str = BEDROCK_CASSETTE_LATENCY):
+        self._client = client
+        self._cassette = cassette
+        self._mode = mode
+        self._instant = latency == "instant"
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+    def invoke_model(self, **request):
+        return self._call("invoke_model", request)
+
+    def converse(self, **request):
+        return self._call("converse", request)
+
+    def converse_stream(self, **request):
+        return self._call("converse_stream", request)
+
+    def _call(self, operation: str, request: dict):
+        if self._mode == "replay":
+            return self._replay(operation, self._cassette.find(operation, request))
+        return self._record(operation, request)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _record(self, operation: str, request: dict):
+        from botocore.exceptions import ClientError
+
+        exact, loose = request_keys(operation, request)
+        entry = {
+            "operation": operation,
+            "key": exact,
+            "loose_key": loose,
+            "model_id": request.get("modelId", ""),
+            "recorded_at": time.time(),
+        }
+        started = time.perf_counter()
+        try:
+            response = getattr(self._client, operation)(**request)
+        except ClientError as e:
+            entry["latency"] = time.perf_counter() - started
+            entry["error"] = recorded_error(e)
+            self._cassette.record(entry)
+            raise
+        entry["latency"] = time.perf_counter() - started
+
+        if operation == "invoke_model":
+            body = response["body"].read()
+            entry["response"] = {"body": body.decode("utf-8"), "contentType": response.get("contentType")}
+            self._cassette.record(entry)
+            return {**response, "body": _Body(body)}
+
+        if operation == "converse":
+            entry["response"] = {k: v for k, v in response.items() if k != "ResponseMetadata"}
+            self._cassette.record(entry)
+            return response
+
+        return {**response, "stream": _RecordingStream(response["stream"], entry, started, self._cassette)}
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def _replay(self, operation: str, entry: dict):
+        if not self._instant:
+            time.sleep(entry["latency"])
+
+        if "error" in entry:
+            raise_recorded(entry["error"], entry["operation"])
+
+        if operation == "invoke_model":
+            body = entry["response"]["body"].encode("utf-8")
+            return {"body": _Body(body), "contentType": entry["response"].get("contentType")}
+
+        if operation == "converse":
+            return dict(entry["response"])
+
+        return {"stream": _ReplayStream(entry, self._instant)}
+
+
+def recorded_error(error: Exception) -> dict:
+    """An error as kept in the cassette."""
+    from botocore.exceptions import ClientError, EventStreamError
+
+    if not isinstance(error, ClientError):
+        return {"exception": type(error).__name__, "message": str(error)}
+    return {
+        "code": error.response.get("Error", {}).get("Code", ""),
+        "message": error.response.get("Error", {}).get("Message", ""),
+        "status": error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 500),
+        "event_stream": isinstance(error, EventStreamError),
+    }
+
+
+def raise_recorded(error: dict, operation: str):
+    """Raise a recorded error again, as the same kind of exception."""
+    from botocore.exceptions import ClientError, EventStreamError
+
+    if "exception" in error:
+        raise RecordedStreamError(f"{error['exception']}: {error['message']}")
+    raise (EventStreamError if error.get("event_stream") else ClientError)(
+        {
+            "Error": {"Code": error["code"], "Message": error["message"]},
+            "ResponseMetadata": {"HTTPStatusCode": error["status"]},
+        },
+        operation
+    )
+
+
+class _Body:
+    """The read() side of a botocore StreamingBody, over bytes already in hand."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        if amt is None:
+            data, self._data = self._data, b""
+        else:
+            data, self._data = self._data[:amt], self._data[amt:]
+        return data
+
+    def close(self):
+        pass
+
+
+class _RecordingStream:
+    """
+    Passes a live event stream through, noting when each event arrived.
+
+    Saved once the stream ends, is closed or is dropped. Only a stream that
+    ran to its last event is complete; an error part-way is saved with it.
+    """
+
+    def __init__(self, stream, entry: dict, started: float, cassette: Cassette):
+        self._stream = stream
+        self._entry = entry
+        self._started = started
+        self._cassette = cassette
+        self._events = []
+        self._error = None
+        self._complete = False
+        self._saved = False
+
+    def __iter__(self):
+        try:
+            for event in self._stream:
+                self._events.append([time.perf_counter() - self._started, event])
+                yield event
+            self._complete = True
+        except Exception as e:
+            self._error = {**recorded_error(e), "at": time.perf_counter() - self._started}
+            raise
+        finally:
+            # Also reached when the caller stops iterating and drops the stream
+            self._save()
+
+    def close(self):
+        # The Court may hang up early (e.g. the JSON it wanted was complete)
+        self._save()
+        self._stream.close()
+
+    def _save(self):
+        if self._saved:
+            return
+        self._saved = True
+        entry = {**self._entry, "events": self._events, "partial": not self._complete}
+        if self._error is not None:
+            entry["stream_error"] = self._error
+        self._cassette.record(entry)
+
+
+class _ReplayStream:
+    """
+    Plays recorded stream events back on their original schedule (or at once),
+    then fails the way the recording did: with its error, or - if the caller
+    hung up on it - with CassetteMiss when asked for more than was recorded.
+    """
+
+    def __init__(self, entry: dict, instant: bool):
+        self._entry = entry
+        self._instant = instant
+        self._closed = False
+
+    def __iter__(self):
+        # The call's own latency (time to the response) has already passed
+        started = time.perf_counter() - self._entry["latency"]
+
+        def wait_until(offset: float):
+            if not self._instant:
+                delay = offset - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+        for offset, event in self._entry["events"]:
+            if self._closed:
+                return
+            wait_until(offset)
+            yield event
+
+        error = self._entry.get("stream_error")
+        if error is not None:
+            wait_until(error["at"])
+            raise_recorded(error, self._entry["operation"])
+        if self._entry.get("partial"):
+            raise CassetteMiss(
+                f"The recording of this {self._entry['operation']} call stops after "
+                f"{len(self._entry['events'])} events (the caller hung up on it)"
+            )
+
+    def close(self):
+        self._closed = True
+
+
+# ============================================================================
+# SETUP
+# ============================================================================
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """The process-wide cassette, loaded on first use (None when cassettes are off)."""
+    global _cassette
+    if BEDROCK_CASSETTE_MODE not in ("record", "replay"):
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            cassette = Cassette(BEDROCK_CASSETTE_PATH)
+            if BEDROCK_CASSETTE_MODE == "replay":
+                cassette.load()
+                print(f"📼 Replaying Bedrock from {BEDROCK_CASSETTE_PATH} ({BEDROCK_CASSETTE_LATENCY} latency)")
+            else:
+                print(f"📼 Recording Bedrock to {BEDROCK_CASSETTE_PATH}")
+            _cassette = cassette
+        return _cassette
+
+
+def wrap_client(client):
+    """Put a bedrock-runtime client behind the cassette, if one is in use."""
+    cassette = get_cassette()
+    if cassette is None:
+        return client
+    return CassetteClient(client, cassette, BEDROCK_CASSETTE_MODE)
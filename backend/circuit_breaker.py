@@ -0,0 +1,136 @@
+"""
+Lucky Loo - Circuit Breaker
+Stops sending pleas to Bedrock while it's throttling or crawling, so the
+kiosk answers instantly from canned verdicts instead of queueing every
+request until it times out.
+
+States:
+- closed:    calls flow normally; outcomes are tracked in a sliding window
+- open:      calls are refused until the cooldown expires
+- half_open: a single probe call is let through; success closes the
+             breaker, failure re-opens it for another cooldown
+"""
+
+import os
+import time
+import threading
+from collections import deque
+
+
+BREAKER_ENABLED = os.getenv("BREAKER_ENABLED", "true").lower() == "true"
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+BREAKER_ERROR_RATE = float(os.getenv("BREAKER_ERROR_RATE", "0.5"))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "20"))
+BREAKER_SLOW_CALL_RATE = float(os.getenv("BREAKER_SLOW_CALL_RATE", "0.5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+
+
+class CircuitBreaker:
+    """
+    Error-rate and latency circuit breaker.
+
+    Usage:
+        if breaker.allow_request():
+            started = time.monotonic()
+            try:
+                ...call the backend...
+                breaker.record(True, time.monotonic() - started)
+            except Exception:
+                breaker.record(False, time.monotonic() - started)
+        else:
+            ...serve the fallback...
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = BREAKER_WINDOW,
+        min_calls: int = BREAKER_MIN_CALLS,
+        error_rate: float = BREAKER_ERROR_RATE,
+        slow_call_seconds: float = BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate: float = BREAKER_SLOW_CALL_RATE,
+        cooldown: float = BREAKER_COOLDOWN,
+        enabled: bool = BREAKER_ENABLED
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.cooldown = cooldown
+        self.enabled = enabled
+
+        self.state = "closed"
+        self._outcomes = deque(maxlen=window)  # (succeeded, was_slow)
+        self._opened_at = 0.0
+        self._probe_started = None
+        self._lock = threading.Lock()
+        self._stats = {"trips": 0, "rejected": 0, "probes": 0}
+
+    def allow_request(self) -> bool:
+        """Should this call go to the backend? False means serve the fallback."""
+        if not self.enabled:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            if self.state == "closed":
+                return True
+
+            if self.state == "open" and now - self._opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._probe_started = None
+
+            # One probe at a time; a probe that never reported back is
+            # abandoned after a cooldown so the breaker can't wedge open
+            if self.state == "half_open" and (
+                self._probe_started is None or now - self._probe_started >= self.cooldown
+            ):
+                self._probe_started = now
+                self._stats["probes"] += 1
+                return True
+
+            self._stats["rejected"] += 1
+            return False
+
+    def record(self, succeeded: bool, latency: float):
+        """Report the outcome of a call that allow_request() let through."""
+        if not self.enabled:
+            return
+
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            if self.state == "half_open":
+                if succeeded and not slow:
+                    print(f"🟢 Circuit '{self.name}' closed - backend recovered")
+                    self.state = "closed"
+                    self._outcomes.clear()
+                else:
+                    self._trip()
+                return
+
+            if self.state == "open":
+                return
+
+            self._outcomes.append((succeeded, slow))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+
+            failures = sum(1 for ok, _ in self._outcomes if not ok)
+            slow_calls = sum(1 for _, was_slow in self._outcomes if was_slow)
+            if failures / calls >= self.error_rate or slow_calls / calls >= self.slow_call_rate:
+                self._trip()
+
+    def _trip(self):
+        print(f"🔴 Circuit '{self.name}' open - serving fallbacks for {self.cooldown:.0f}s")
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self._probe_started = None
+        self._outcomes.clear()
+        self._stats["trips"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "state": self.state, "window_calls": len(self._outcomes)}
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Lucky Loo - Fake Bedrock Runtime
+A local stand-in for the bedrock-runtime API, so the real Court pipeline
+(Strands agents, tool calls, streaming, vision) can run and be profiled
+on a machine with no network or AWS account.
+
+Implements the four operations the Court uses:
+- POST /model/{id}/invoke                        InvokeModel (vision)
+- POST /model/{id}/invoke-with-response-stream   InvokeModelWithResponseStream
+- POST /model/{id}/converse                      Converse
+- POST /model/{id}/converse-stream               ConverseStream (Strands agents)
+
+Answers come from the personas in mock_responses.py. The agent is picked
+from the system prompt. The Pit Boss calls every consult_* tool it's given
+and then rules on their testimony, so agentic mode runs its real tool loop.
+
+Failure injection (all optional):
+    FAKE_BEDROCK_LATENCY          agent=median[:sigma] seconds per model call
+                                  (same format as MOCK_LATENCY)
+    FAKE_BEDROCK_THROTTLE_RATE    share of calls answered 429 ThrottlingException
+    FAKE_BEDROCK_ERROR_RATE       share of calls answered 500 InternalServerException
+    FAKE_BEDROCK_MAX_CONCURRENCY  calls in flight beyond this are throttled (0 = no limit)
+
+Prompt caching is simulated for Converse: a cachePoint whose prefix reaches
+FAKE_BEDROCK_CACHE_MIN_TOKENS is written on first sight and read after
+that (no expiry), and usage reports cacheRead/WriteInputTokens like Bedrock.
+
+Usage:
+    python fake_bedrock.py                  # listens on FAKE_BEDROCK_PORT (8001)
+
+    # then, for the backend:
+    BEDROCK_ENDPOINT_URL=http://127.0.0.1:8001 AWS_ACCESS_KEY_ID=offline \\
+    AWS_SECRET_ACCESS_KEY=offline python app.py
+
+GET /stats reports calls per agent, throttled and failed counts, and cached tokens.
+"""
+
+import os
+import json
+import time
+import uuid
+import zlib
+import base64
+import random
+import socket
+import struct
+import asyncio
+import threading
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from mock_responses import (
+    MOCK_VERDICTS,
+    get_mock_jury_response,
+    get_mock_vision_response,
+    parse_latency_spec,
+    sample_latency,
+)
+
+
+FAKE_BEDROCK_PORT = int(os.getenv("FAKE_BEDROCK_PORT", "8001"))
+FAKE_BEDROCK_LATENCY = os.getenv("FAKE_BEDROCK_LATENCY", "")
+FAKE_BEDROCK_THROTTLE_RATE = float(os.getenv("FAKE_BEDROCK_THROTTLE_RATE", "0"))
+FAKE_BEDROCK_ERROR_RATE = float(os.getenv("FAKE_BEDROCK_ERROR_RATE", "0"))
+FAKE_BEDROCK_MAX_CONCURRENCY = int(os.getenv("FAKE_BEDROCK_MAX_CONCURRENCY", "0"))
+FAKE_BEDROCK_CACHE_MIN_TOKENS = int(os.getenv("FAKE_BEDROCK_CACHE_MIN_TOKENS", "1024"))
+
+# Share of a call's latency spent before the first token; the rest is spread
+# over the streamed chunks
+FIRST_TOKEN_SHARE = 0.3
+CHUNK_CHARS = 24
+
+PERSONAS = {
+    "skeptic": "You are **The Skeptic**",
+    "doctor": "You are **The Doctor**",
+    "gambler": "You are **The Gambler**",
+    "judge": "You are **The Pit Boss**",
+}
+
+
+# ============================================================================
+# PERSONAS - What each agent says
+# ============================================================================
+
+def identify_agent(system_text: str) -> str:
+    """Work out which Court agent is calling from its system prompt."""
+    for agent, marker in PERSONAS.items():
+        if marker in system_text:
+            return agent
+    return "judge"
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def judge_testimony(testimony: str) -> dict:
+    """Rule on the jury's testimony the way the Pit Boss usually does: majority wins."""
+    upper = testimony.upper()
+    votes = {
+        "skeptic": "REAL" if "VERDICT: REAL" in upper else "FAKE",
+        "doctor": "CRITICAL" if "URGENCY: CRITICAL" in upper else "STABLE",
+        "gambler": "IN" if "LET THEM IN" in upper else "OUT",
+    }
+    favorable = sum(vote in ("REAL", "CRITICAL", "IN") for vote in votes.values())
+    verdict = dict(MOCK_VERDICTS["granted" if favorable >= 2 else "denied"])
+    verdict.pop("door_code", None)
+    verdict["jury_votes"] = votes
+    return verdict
+
+
+def judge_reply(conversation: str, last_prompt: str) -> str:
+    """The Pit Boss's text: a little theatre, the JSON, then some more theatre."""
+    if "Deliver only your roast" in last_prompt:
+        granted = "has already ruled: GRANTED" in last_prompt
+        roast = MOCK_VERDICTS["granted" if granted else "denied"]["roast"]
+        return json.dumps({"roast": roast})
+
+    verdict = judge_testimony(conversation)
+    return (
+        "*adjusts cufflinks and surveys the jury*\n\n"
+        f"```json\n{json.dumps(verdict, indent=2)}\n```\n\n"
+        "The house has spoken. Next!"
+    )
+
+
+def message_text(message: dict) -> str:
+    """All the text in a Converse message, including tool results."""
+    parts = []
+    for block in message.get("content", []):
+        if "text" in block:
+            parts.append(block["text"])
+        elif "toolResult" in block:
+            parts.extend(item.get("text", "") for item in block["toolResult"].get("content", []))
+    return "\n".join(parts)
+
+
+def plan_tool_calls(body: dict) -> list:
+    """
+    The Pit Boss consults every juror he's given, once, before ruling.
+
+    Returns:
+        toolUse blocks to send, or [] if it's time to rule
+    """
+    tools = body.get("toolConfig", {}).get("tools", [])
+    already_consulted = any(
+        "toolResult" in block
+        for message in body.get("messages", [])
+        for block in message.get("content", [])
+    )
+    if not tools or already_consulted:
+        return []
+
+    case = message_text(body["messages"][-1])
+    calls = []
+    for tool in tools:
+        if "toolSpec" not in tool:
+            continue  # e.g. a cachePoint
+        spec = tool["toolSpec"]
+        schema = spec.get("inputSchema", {}).get("json", {})
+        arguments = {name: case for name in schema.get("required", [])}
+        calls.append({"toolUseId": f"tooluse_{uuid.uuid4().hex[:16]}", "name": spec["name"], "input": arguments})
+    return calls
+
+
+def converse_reply(body: dict) -> tuple:
+    """
+    Decide a Converse call's answer.
+
+    Returns:
+        (agent, content blocks, stop reason)
+    """
+    system_text = "\n".join(block.get("text", "") for block in body.get("system", []))
+    agent = identify_agent(system_text)
+
+    if agent != "judge":
+        return agent, [{"text": get_mock_jury_response(agent)}], "end_turn"
+
+    tool_calls = plan_tool_calls(body)
+    if tool_calls:
+        return agent, [{"toolUse": call} for call in tool_calls], "tool_use"
+
+    conversation = "\n".join(message_text(message) for message in body.get("messages", []))
+    last_prompt = message_text(body["messages"][-1]) if body.get("messages") else ""
+    return agent, [{"text": judge_reply(conversation, last_prompt)}], "end_turn"
+
+
+def cache_checkpoints(body: dict) -> list:
+    """
+    The prefixes a Converse request marks as cacheable, in Bedrock's order
+    (toolConfig, system, messages).
+
+    Returns:
+        (prefix hash, prefix tokens) for each cachePoint
+    """
+    sections = [
+        body.get("toolConfig", {}).get("tools", []),
+        body.get("system", []),
+        [block for message in body.get("messages", []) for block in message.get("content", [])],
+    ]
+    checkpoints = []
+    prefix = ""
+    for blocks in sections:
+        for block in blocks:
+            if "cachePoint" in block:
+                checkpoints.append((zlib.crc32(prefix.encode()), estimate_tokens(prefix)))
+            else:
+                prefix += json.dumps(block, sort_keys=True)
+    return checkpoints
+
+
+# ============================================================================
+# EVENT STREAM - application/vnd.amazon.eventstream framing
+# ============================================================================
+
+def _encode_header(name: str, value: str) -> bytes:
+    name_bytes, value_bytes = name.encode(), value.encode()
+    return (
+        struct.pack(">B", len(name_bytes)) + name_bytes
+        + b"\x07" + struct.pack(">H", len(value_bytes)) + value_bytes
+    )
+
+
+def encode_event(event_type: str, payload: dict) -> bytes:
+    """Frame one event the way Bedrock's streaming APIs do."""
+    headers = b"".join(
+        _encode_header(name, value)
+        for name, value in (
+            (":event-type", event_type),
+            (":content-type", "application/json"),
+            (":message-type", "event"),
+        )
+    )
+    body = json.dumps(payload).encode()
+    prelude = struct.pack(">II", 12 + len(headers) + len(body) + 4, len(headers))
+    message = prelude + struct.pack(">I", zlib.crc32(prelude)) + headers + body
+    return message + struct.pack(">I", zlib.crc32(message))
+
+
+def chunk_text(text: str) -> list:
+    return [text[i:i + CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)] or [""]
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+def create_app(
+    latency: str = FAKE_BEDROCK_LATENCY,
+    throttle_rate: float = FAKE_BEDROCK_THROTTLE_RATE,
+    error_rate: float = FAKE_BEDROCK_ERROR_RATE,
+    max_concurrency: int = FAKE_BEDROCK_MAX_CONCURRENCY,
+    cache_min_tokens: int = FAKE_BEDROCK_CACHE_MIN_TOKENS
+) -> FastAPI:
+    """Build a fake bedrock-runtime app with its own failure injection settings."""
+    distributions = parse_latency_spec(latency)
+    stats = {
+        "calls": {}, "throttled": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0,
+        "cache_read_tokens": 0, "cache_write_tokens": 0,
+    }
+    cached_prefixes = set()
+    fake = FastAPI(title="Fake Bedrock Runtime")
+
+    def error(status: int, code: str, message: str) -> JSONResponse:
+        return JSONResponse(
+            status_code=status,
+            content={"message": message},
+            headers={"x-amzn-ErrorType": f"{code}:http://internal.amazon.com/coral/com.amazonaws.bedrock/"}
+        )
+
+    def admit(agent: str) -> Optional[JSONResponse]:
+        """Apply failure injection; returns an error response or None to proceed."""
+        stats["calls"][agent] = stats["calls"].get(agent, 0) + 1
+        over_limit = max_concurrency and stats["in_flight"] >= max_concurrency
+        if over_limit or random.random() < throttle_rate:
+            stats["throttled"] += 1
+            return error(429, "ThrottlingException", "Too many requests, please wait before trying again.")
+        if random.random() < error_rate:
+            stats["errors"] += 1
+            return error(500, "InternalServerException", "The server encountered an internal error.")
+        return None
+
+    def enter():
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+
+    def leave():
+        stats["in_flight"] -= 1
+
+    def usage(prompt: str, output: str) -> dict:
+        input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(output)
+        return {"inputTokens": input_tokens, "outputTokens": output_tokens, "totalTokens": input_tokens + output_tokens}
+
+    def converse_usage(body: dict, content: list) -> dict:
+        """Usage for a Converse call, with the longest cached prefix read and the rest written."""
+        tokens = usage(json.dumps(body), json.dumps(content))
+        checkpoints = [point for point in cache_checkpoints(body) if point[1] >= cache_min_tokens]
+        if not checkpoints:
+            return tokens
+
+        read = max((size for key, size in checkpoints if key in cached_prefixes), default=0)
+        write = max(checkpoints[-1][1] - read, 0)
+        cached_prefixes.update(key for key, _ in checkpoints)
+        stats["cache_read_tokens"] += read
+        stats["cache_write_tokens"] += write
+
+        tokens["inputTokens"] = max(tokens["inputTokens"] - read - write, 0)
+        tokens["cacheReadInputTokens"] = read
+        tokens["cacheWriteInputTokens"] = write
+        tokens["totalTokens"] = tokens["inputTokens"] + read + write + tokens["outputTokens"]
+        return tokens
+
+    # ------------------------------------------------------------------
+    # InvokeModel (vision)
+    # ------------------------------------------------------------------
+
+    def vision_reply(body: dict) -> tuple:
+        prompt = json.dumps(body.get("messages", []))
+        text = get_mock_vision_response()
+        tokens = usage(prompt, text)
+        return text, {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": tokens["inputTokens"], "output_tokens": tokens["outputTokens"]},
+        }
+
+    @fake.post("/model/{model_id:path}/invoke")
+    async def invoke_model(model_id: str, request: Request):
+        if (rejected := admit("vision")) is not None:
+            return rejected
+        enter()
+        try:
+            await asyncio.sleep(sample_latency(distributions, "vision"))
+            _, response = vision_reply(await request.json())
+            return JSONResponse(response)
+        finally:
+            leave()
+
+    @fake.post("/model/{model_id:path}/invoke-with-response-stream")
+    async def invoke_model_stream(model_id: str, request: Request):
+        if (rejected := admit("vision")) is not None:
+            return rejected
+        text, response = vision_reply(await request.json())
+        delay = sample_latency(distributions, "vision")
+        chunks = chunk_text(text)
+
+        def chunk(payload: dict) -> bytes:
+            return encode_event("chunk", {"bytes": base64.b64encode(json.dumps(payload).encode()).decode()})
+
+        async def events():
+            enter()
+            try:
+                await asyncio.sleep(delay * FIRST_TOKEN_SHARE)
+                yield chunk({"type": "message_start", "message": {**response, "content": []}})
+                for piece in chunks:
+                    yield chunk({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": piece}})
+                    await asyncio.sleep(delay * (1 - FIRST_TOKEN_SHARE) / len(chunks))
+                yield chunk({"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": response["usage"]})
+                yield chunk({"type": "message_stop"})
+            finally:
+                leave()
+
+        return StreamingResponse(events(), media_type="application/vnd.amazon.eventstream")
+
+    # ------------------------------------------------------------------
+    # Converse (Strands agents)
+    # ------------------------------------------------------------------
+
+    @fake.post("/model/{model_id:path}/converse")
+    async def converse(model_id: str, request: Request):
+        body = await request.json()
+        agent, content, stop_reason = converse_reply(body)
+        if (rejected := admit(agent)) is not None:
+            return rejected
+        enter()
+        started = time.monotonic()
+        try:
+            await asyncio.sleep(sample_latency(distributions, agent))
+            return JSONResponse({
+                "output": {"message": {"role": "assistant", "content": content}},
+                "stopReason": stop_reason,
+                "usage": converse_usage(body, content),
+                "metrics": {"latencyMs": int((time.monotonic() - started) * 1000)},
+            })
+        finally:
+            leave()
+
+    @fake.post("/model/{model_id:path}/converse-stream")
+    async def converse_stream(model_id: str, request: Request):
+        body = await request.json()
+        agent, content, stop_reason = converse_reply(body)
+        if (rejected := admit(agent)) is not None:
+            return rejected
+        delay = sample_latency(distributions, agent)
+
+        async def events():
+            enter()
+            started = time.monotonic()
+            try:
+                await asyncio.sleep(delay * FIRST_TOKEN_SHARE)
+                yield encode_event("messageStart", {"role": "assistant"})
+
+                pieces = []
+                for index, block in enumerate(content):
+                    if "toolUse" in block:
+                        call = block["toolUse"]
+                        pieces.append((index, {"toolUse": {"toolUseId": call["toolUseId"], "name": call["name"]}},
+                                       [{"toolUse": {"input": json.dumps(call["input"])}}]))
+                    else:
+                        pieces.append((index, None, [{"text": piece} for piece in chunk_text(block["text"])]))
+
+                deltas = sum(len(blocks) for _, _, blocks in pieces)
+                for index, start, blocks in pieces:
+                    if start is not None:
+                        yield encode_event("contentBlockStart", {"start": start, "contentBlockIndex": index})
+                    for delta in blocks:
+                        yield encode_event("contentBlockDelta", {"delta": delta, "contentBlockIndex": index})
+                        await asyncio.sleep(delay * (1 - FIRST_TOKEN_SHARE) / deltas)
+                    yield encode_event("contentBlockStop", {"contentBlockIndex": index})
+
+                yield encode_event("messageStop", {"stopReason": stop_reason})
+                yield encode_event("metadata", {
+                    "usage": converse_usage(body, content),
+                    "metrics": {"latencyMs": int((time.monotonic() - started) * 1000)},
+                })
+            finally:
+                leave()
+
+        return StreamingResponse(events(), media_type="application/vnd.amazon.eventstream")
+
+    @fake.get("/stats")
+    async def fake_stats():
+        return stats
+
+    return fake
+
+
+app = create_app()
+
+
+# ============================================================================
+# IN-PROCESS SERVER - For benchmarks and tests
+# ============================================================================
+
+def start_in_background(port: int = 0, **config) -> tuple:
+    """
+    Run a fake Bedrock on a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+        **config: Passed to create_app (latency, throttle_rate, ...)
+
+    Returns:
+        (server, endpoint_url) - set server.should_exit = True to stop it
+    """
+    import uvicorn
+
+    if not port:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(**config), host="127.0.0.1", port=port, log_level="warning", lifespan="off"
+    ))
+    thread = threading.Thread(target=server.run, name="fake-bedrock", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"Fake Bedrock failed to start on port {port}")
+        time.sleep(0.01)
+
+    return server, f"http://127.0.0.1:{port}"
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    print(f"""
+    🎰 ══════════════════════════════════════════ 🎰
+
+       LUCKY LOO - FAKE BEDROCK RUNTIME
+
+       Listening on http://127.0.0.1:{FAKE_BEDROCK_PORT}
+       Latency: {FAKE_BEDROCK_LATENCY or 'none'}
+       Throttle rate: {FAKE_BEDROCK_THROTTLE_RATE}  Error rate: {FAKE_BEDROCK_ERROR_RATE}
+
+    🎰 ══════════════════════════════════════════ 🎰
+    """)
+    uvicorn.run(app, host="127.0.0.1", port=FAKE_BEDROCK_PORT)
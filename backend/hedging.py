@@ -0,0 +1,191 @@
+"""
+Lucky Loo - Hedged Requests
+Cuts the tail off slow Bedrock calls. If a call hasn't come back by the
+recent p95 (configurable) for its kind, a duplicate is sent to a secondary
+region / model and whichever answers first wins. The loser is cancelled.
+
+A primary that fails outright before the deadline is hedged immediately,
+so the secondary also doubles as a fast failover.
+
+Async calls (Strands agents) are cancelled for real. Sync calls (the boto3
+vision request) run on a thread pool; a losing thread can't be interrupted,
+so its result is simply discarded when it finishes.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Awaitable, Callable
+
+
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_REGION = os.getenv("HEDGE_REGION", "us-west-2")
+HEDGE_MODEL_ID = os.getenv("HEDGE_MODEL_ID", "")  # Empty = same model as the primary
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "8"))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "1"))
+HEDGE_WINDOW = int(os.getenv("HEDGE_WINDOW", "200"))
+HEDGE_WORKERS = int(os.getenv("HEDGE_WORKERS", "16"))
+
+
+class Hedger:
+    """
+    Per-kind latency tracking plus hedged execution.
+
+    Each kind of call ("vision", "juror_doctor", ...) keeps its own window of
+    primary latencies; the hedge deadline is their HEDGE_PERCENTILE, or
+    HEDGE_DEFAULT_DELAY until HEDGE_MIN_SAMPLES have been seen.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = HEDGE_ENABLED,
+        percentile: float = HEDGE_PERCENTILE,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        default_delay: float = HEDGE_DEFAULT_DELAY,
+        min_delay: float = HEDGE_MIN_DELAY,
+        window: int = HEDGE_WINDOW
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.window = window
+        self._latencies = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    def deadline(self, kind: str) -> float:
+        """Seconds to wait on the primary before hedging."""
+        with self._lock:
+            samples = sorted(self._latencies.get(kind, ()))
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return max(self.min_delay, samples[index])
+
+    def _record(self, kind: str, latency: float = None, **counts):
+        with self._lock:
+            if latency is not None:
+                self._latencies.setdefault(kind, deque(maxlen=self.window)).append(latency)
+            counters = self._counters.setdefault(
+                kind, {"calls": 0, "hedged": 0, "primary_wins": 0, "hedge_wins": 0, "failures": 0}
+            )
+            for name, value in counts.items():
+                counters[name] += value
+
+    def stats(self) -> dict:
+        """Hedge rate and win counters per kind of call."""
+        with self._lock:
+            kinds = dict(self._counters)
+        report = {}
+        for kind, counters in kinds.items():
+            report[kind] = {
+                **counters,
+                "hedge_rate": round(counters["hedged"] / counters["calls"], 3) if counters["calls"] else 0.0,
+                "deadline_seconds": round(self.deadline(kind), 3),
+            }
+        return {"enabled": self.enabled, "kinds": report}
+
+    # ------------------------------------------------------------------
+    # Async (Strands agents)
+    # ------------------------------------------------------------------
+
+    async def run(
+        self,
+        kind: str,
+        primary: Callable[[], Awaitable],
+        secondary: Callable[[], Awaitable]
+    ):
+        """Await primary(), hedging with secondary() if it's slow or fails."""
+        if not self.enabled:
+            return await primary()
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        primary_task = asyncio.ensure_future(primary())
+
+        done, _ = await asyncio.wait({primary_task}, timeout=self.deadline(kind))
+        if done and primary_task.exception() is None:
+            self._record(kind, loop.time() - started, calls=1, primary_wins=1)
+            return primary_task.result()
+
+        hedge_task = asyncio.ensure_future(secondary())
+        pending = {primary_task, hedge_task} - done
+        finished = list(done)
+        try:
+            while True:
+                for task in finished:
+                    if task.exception() is None:
+                        won = "primary_wins" if task is primary_task else "hedge_wins"
+                        latency = loop.time() - started
+                        self._record(kind, latency, calls=1, hedged=1, **{won: 1})
+                        return task.result()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                finished = list(done)
+        finally:
+            for task in (primary_task, hedge_task):
+                if not task.done():
+                    task.cancel()
+
+        self._record(kind, calls=1, hedged=1, failures=1)
+        raise primary_task.exception()
+
+    # ------------------------------------------------------------------
+    # Sync (boto3 calls)
+    # ------------------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+            return self._executor
+
+    def run_sync(self, kind: str, primary: Callable, secondary: Callable):
+        """Call primary(), hedging with secondary() on a thread if it's slow or fails."""
+        if not self.enabled:
+            return primary()
+
+        executor = self._get_executor()
+        started = time.monotonic()
+        primary_future = executor.submit(primary)
+
+        done, _ = wait({primary_future}, timeout=self.deadline(kind))
+        if done and primary_future.exception() is None:
+            self._record(kind, time.monotonic() - started, calls=1, primary_wins=1)
+            return primary_future.result()
+
+        hedge_future = executor.submit(secondary)
+        pending = {primary_future, hedge_future} - done
+        finished = list(done)
+        while True:
+            for future in finished:
+                if future.exception() is None:
+                    won = "primary_wins" if future is primary_future else "hedge_wins"
+                    self._record(kind, time.monotonic() - started, calls=1, hedged=1, **{won: 1})
+                    for loser in pending:
+                        loser.cancel()
+                    return future.result()
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            finished = list(done)
+
+        self._record(kind, calls=1, hedged=1, failures=1)
+        raise primary_future.exception()
+
+
+# Process-wide hedger shared by the vision call and the jurors
+hedger = Hedger()
@@ -0,0 +1,90 @@
+"""
+Lucky Loo - Streaming JSON Extraction
+Pulls the first valid JSON object out of a model's text stream as soon as
+it closes, so the Court doesn't wait for the model to finish rambling.
+
+The model is asked to "end with valid JSON", but in practice it wraps the
+object in markdown fences, prefixes it with commentary and trails it with
+more prose. The extractor only tracks top-level braces (string-aware), so
+all of that is ignored.
+"""
+
+import json
+from typing import Callable, Optional
+
+
+class JsonObjectExtractor:
+    """
+    Incremental extractor for the first valid JSON object in a text stream.
+
+    Feed it chunks as they arrive. Each time a top-level {...} closes it is
+    parsed and handed to `validate`; the first object that validates is
+    returned by feed() and the extractor is done. Objects that fail to parse
+    or validate are skipped and scanning resumes after them.
+    """
+
+    def __init__(self, validate: Callable[[dict], Optional[dict]]):
+        """
+        Args:
+            validate: Called with each parsed object. Returns the (possibly
+                cleaned up) object to accept it, or None to keep scanning.
+        """
+        self.validate = validate
+        self.text = ""
+        self.result: Optional[dict] = None
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def feed(self, chunk: str) -> Optional[dict]:
+        """Consume a chunk of text, returning the object once one validates."""
+        if self.done:
+            return self.result
+
+        self.text += chunk
+        text = self.text
+
+        while self._pos < len(text):
+            ch = text[self._pos]
+            self._pos += 1
+
+            if self._depth == 0:
+                if ch == "{":
+                    self._start = self._pos - 1
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._accept(text[self._start:self._pos]):
+                    return self.result
+
+        return None
+
+    def _accept(self, candidate: str) -> bool:
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError:
+            return False
+        if not isinstance(parsed, dict):
+            return False
+
+        self.result = self.validate(parsed)
+        return self.result is not None
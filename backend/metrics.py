@@ -0,0 +1,154 @@
+"""
+Lucky Loo - Latency Metrics
+Per-stage latency histograms for the Court, exported in Prometheus text
+format, plus per-request stage timings for the Server-Timing header.
+
+Usage:
+    with request_timer() as timings:      # once per API request
+        with timed("vision"):              # anywhere down the call stack
+            ...
+    response.headers["Server-Timing"] = server_timing(timings)
+
+Stage timings travel in a context variable holding a mutable dict, so they
+are picked up from worker threads (asyncio.to_thread copies the context)
+and from the agent tasks Strands spawns. The loop and those threads update
+the same dict, so it is only touched under a lock.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+# Bucket upper bounds in seconds - from image decode (ms) to a slow jury (tens of s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+
+class Histogram:
+    """A cumulative Prometheus-style histogram with one series per label value."""
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series = {}  # label value -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = [0] * len(self.buckets) + [0.0, 0]
+                self._series[label_value] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        """Prometheus exposition lines for this histogram."""
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = {key: list(values) for key, values in sorted(self._series.items())}
+        for label_value, values in series.items():
+            labels = f'{self.label}="{label_value}"'
+            for bound, count in zip(self.buckets, values):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{labels}}} {values[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {values[-1]}")
+        return lines
+
+
+stage_seconds = Histogram(
+    "court_stage_seconds",
+    "Time spent in each stage of a Court of Relief deliberation.",
+    label="stage",
+)
+
+
+# ============================================================================
+# TIMING
+# ============================================================================
+
+_request_timings: ContextVar[Optional[dict]] = ContextVar("request_timings", default=None)
+_timings_lock = threading.Lock()
+
+
+@contextmanager
+def request_timer():
+    """Collect stage timings for the duration of one API request."""
+    timings = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def current_timings() -> dict:
+    """A copy of the stage timings collected so far for the current request."""
+    timings = _request_timings.get()
+    if timings is None:
+        return {}
+    with _timings_lock:
+        return dict(timings)
+
+
+def record_stage(stage: str, seconds: float):
+    """Record a stage duration in the histogram and the current request's timings."""
+    stage_seconds.observe(stage, seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        with _timings_lock:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(stage: str):
+    """Time a block as a named stage (works around awaits too)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def server_timing(timings: dict) -> str:
+    """Format stage timings as a Server-Timing header value (milliseconds)."""
+    # A worker thread (e.g. a shared-cache write) may still be adding to them
+    with _timings_lock:
+        timings = dict(timings)
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+
+def render_gauges(prefix: str, values: dict, help_text: str) -> list:
+    """Render the numeric values of a stats dict as Prometheus gauges."""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return lines
+
+
+def render_prometheus(*extra_lines: list) -> str:
+    """The full /api/metrics payload."""
+    lines = stage_seconds.render()
+    for block in extra_lines:
+        lines.extend(block)
+    return "\n".join(lines) + "\n"
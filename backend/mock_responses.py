@@ -1,8 +1,19 @@
 """
 Lucky Loo - Mock Responses
 For testing without AWS credentials or when Bedrock is unavailable.
+
+Mock mode answers instantly by default. Set MOCK_LATENCY to make each mock
+"model call" take as long as the real one would, for load tests:
+
+    MOCK_LATENCY="vision=0.9,skeptic=1.4:0.3,doctor=1.6:0.3,gambler=1.2:0.3,judge=2.5:0.4"
+
+Each entry is agent=median[:sigma] in seconds. With a sigma the latency is
+drawn from a log-normal distribution (long right tail, like the real
+thing); without one it's constant. Agents that aren't listed take no time.
 """
 
+import os
+import math
 import random
 
 # Pre-written jury responses for offline testing
@@ -67,6 +78,25 @@ GAMBLER'S WISDOM: Bad juju in the air tonight. Mercury's in retrograde. Can't ri
     ]
 }
 
+MOCK_VISION_RESPONSES = {
+    "real": [
+        """VERDICT: REAL
+CONFIDENCE: HIGH
+ANALYSIS: Eyes like a man who just watched his last chip slide across the felt - this one's not acting.""",
+        """VERDICT: REAL
+CONFIDENCE: MEDIUM
+ANALYSIS: Jaw clenched tighter than a pit boss's wallet, and that's real sweat, not the mist machine.""",
+    ],
+    "fake": [
+        """VERDICT: FAKE
+CONFIDENCE: HIGH
+ANALYSIS: That grimace has the sincerity of a free buffet coupon - somebody's been practicing in the mirror.""",
+        """VERDICT: FAKE
+CONFIDENCE: MEDIUM
+ANALYSIS: Shoulders loose, eyes calm, the kind of face that's got all night and knows it.""",
+    ]
+}
+
 MOCK_VERDICTS = {
     "granted": {
         "verdict": "GRANTED",
@@ -113,6 +143,15 @@ def get_mock_response(force_win: bool = None) -> dict:
         ])
 
 
+def get_mock_vision_response(favorable: bool = None) -> str:
+    """Get a mock face analysis, in the format the vision prompt asks for."""
+    if favorable is True:
+        return random.choice(MOCK_VISION_RESPONSES["real"])
+    elif favorable is False:
+        return random.choice(MOCK_VISION_RESPONSES["fake"])
+    return random.choice(MOCK_VISION_RESPONSES["real"] + MOCK_VISION_RESPONSES["fake"])
+
+
 def get_mock_jury_response(juror: str, favorable: bool = None) -> str:
     """Get a mock response from a specific juror."""
     if juror == "skeptic":
@@ -147,3 +186,51 @@ def get_mock_jury_response(juror: str, favorable: bool = None) -> str:
     
     return "Unknown juror"
 
+
+# ============================================================================
+# SIMULATED LATENCY
+# ============================================================================
+
+MOCK_AGENTS = ("vision", "skeptic", "doctor", "gambler", "judge")
+
+
+def parse_latency_spec(spec: str) -> dict:
+    """Parse a MOCK_LATENCY spec into {agent: (median, sigma)}."""
+    latency = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        agent, _, value = entry.partition("=")
+        agent = agent.strip().lower()
+        if agent not in MOCK_AGENTS or not value:
+            raise ValueError(f"Bad MOCK_LATENCY entry: {entry!r}")
+        median, _, sigma = value.partition(":")
+        latency[agent] = (float(median), float(sigma or 0))
+    return latency
+
+
+_mock_latency = parse_latency_spec(os.getenv("MOCK_LATENCY", ""))
+
+
+def set_mock_latency(spec) -> None:
+    """Replace the latency distributions (a MOCK_LATENCY string or a dict)."""
+    global _mock_latency
+    _mock_latency = parse_latency_spec(spec) if isinstance(spec, str) else dict(spec)
+
+
+def mock_latency_enabled() -> bool:
+    return any(median > 0 for median, _ in _mock_latency.values())
+
+
+def get_mock_latency(agent: str) -> float:
+    """Draw how long a mock call to this agent should take, in seconds."""
+    return sample_latency(_mock_latency, agent)
+
+
+def sample_latency(latency: dict, agent: str) -> float:
+    """Draw a latency for an agent from parsed {agent: (median, sigma)} distributions."""
+    median, sigma = latency.get(agent, (0.0, 0.0))
+    if median <= 0:
+        return 0.0
+    if sigma <= 0:
+        return median
+    return random.lognormvariate(math.log(median), sigma)
+
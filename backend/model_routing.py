@@ -0,0 +1,148 @@
+"""
+Lucky Loo - Model Routing
+Which Bedrock model each agent of the Court runs on.
+
+Not every agent needs the flagship model: The Gambler barely reads his
+input, and vision.py's original face check ran on Haiku. The routing
+table gives each role (skeptic, doctor, gambler, judge, vision) its own
+model ID; anything left empty uses BEDROCK_MODEL_ID.
+
+When the Court is under load - pleas queueing for a slot, or the p95 of
+recent deliberations past a threshold - the roles in COURT_DOWNGRADE_ROLES
+(the jurors, by default) move to COURT_FAST_MODEL_ID. They stay there
+until the load has been back under both thresholds for
+COURT_DOWNGRADE_HOLD seconds, so the tier doesn't flap from one
+deliberation to the next. The Pit Boss keeps the expensive model.
+
+    COURT_MODEL_<ROLE>           Model ID for one role (empty = BEDROCK_MODEL_ID)
+    COURT_FAST_MODEL_ID          The faster tier (also the Gambler's default)
+    COURT_DOWNGRADE_ENABLED      Move roles to the fast tier under load
+    COURT_DOWNGRADE_ROLES        Roles that may be moved
+    COURT_DOWNGRADE_QUEUE_DEPTH  Pleas waiting for a slot that count as load
+    COURT_DOWNGRADE_P95          Deliberation p95 (seconds) that counts as load
+    COURT_DOWNGRADE_MIN_SAMPLES  Deliberations seen before the p95 is trusted
+    COURT_DOWNGRADE_HOLD         Seconds of calm before moving back
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Optional
+
+
+ROUTED_ROLES = ("skeptic", "doctor", "gambler", "judge", "vision")
+
+COURT_FAST_MODEL_ID = os.getenv("COURT_FAST_MODEL_ID", "us.anthropic.claude-haiku-4-5-20251001-v1:0")
+
+# Empty = the default model; The Gambler runs on the fast tier out of the box
+COURT_MODEL_ROUTES = {
+    "skeptic": os.getenv("COURT_MODEL_SKEPTIC", ""),
+    "doctor": os.getenv("COURT_MODEL_DOCTOR", ""),
+    "gambler": os.getenv("COURT_MODEL_GAMBLER", COURT_FAST_MODEL_ID),
+    "judge": os.getenv("COURT_MODEL_JUDGE", ""),
+    "vision": os.getenv("COURT_MODEL_VISION", ""),
+}
+
+COURT_DOWNGRADE_ENABLED = os.getenv("COURT_DOWNGRADE_ENABLED", "true").lower() == "true"
+COURT_DOWNGRADE_ROLES = tuple(
+    role.strip() for role in os.getenv("COURT_DOWNGRADE_ROLES", "skeptic,doctor,gambler").split(",") if role.strip()
+)
+COURT_DOWNGRADE_QUEUE_DEPTH = int(os.getenv("COURT_DOWNGRADE_QUEUE_DEPTH", "4"))
+COURT_DOWNGRADE_P95 = float(os.getenv("COURT_DOWNGRADE_P95", "12"))
+COURT_DOWNGRADE_MIN_SAMPLES = int(os.getenv("COURT_DOWNGRADE_MIN_SAMPLES", "20"))
+COURT_DOWNGRADE_HOLD = float(os.getenv("COURT_DOWNGRADE_HOLD", "30"))
+
+
+class ModelRouter:
+    """
+    Routing table plus the load-aware downgrade policy.
+
+    Usage:
+        router = ModelRouter(MODEL_ID, load=court_admission.load)
+        router.model_id("doctor")
+
+    `load` returns {"waiting", "p95_seconds", "samples"} (see
+    AdmissionController.load).
+    """
+
+    def __init__(
+        self,
+        default_model_id: str,
+        routes: dict = COURT_MODEL_ROUTES,
+        fast_model_id: str = COURT_FAST_MODEL_ID,
+        load: Optional[Callable[[], dict]] = None,
+        enabled: bool = COURT_DOWNGRADE_ENABLED,
+        downgrade_roles: tuple = COURT_DOWNGRADE_ROLES,
+        queue_depth: int = COURT_DOWNGRADE_QUEUE_DEPTH,
+        p95_seconds: float = COURT_DOWNGRADE_P95,
+        min_samples: int = COURT_DOWNGRADE_MIN_SAMPLES,
+        hold_seconds: float = COURT_DOWNGRADE_HOLD
+    ):
+        unknown = set(routes) - set(ROUTED_ROLES) or set(downgrade_roles) - set(ROUTED_ROLES)
+        if unknown:
+            raise ValueError(f"Unknown Court role(s) in model routing: {', '.join(sorted(unknown))}")
+
+        self.routes = {role: routes.get(role) or default_model_id for role in ROUTED_ROLES}
+        self.fast_model_id = fast_model_id
+        self.load = load
+        self.enabled = enabled and load is not None
+        self.downgrade_roles = downgrade_roles
+        self.queue_depth = queue_depth
+        self.p95_seconds = p95_seconds
+        self.min_samples = min_samples
+        self.hold_seconds = hold_seconds
+
+        self._downgraded = False
+        self._last_overload = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"downgrades": 0, "restores": 0, "fast_routes": 0}
+
+    def model_id(self, role: str) -> str:
+        """The model a role should use right now."""
+        model_id = self._route(role, role in self.downgrade_roles and self.downgraded())
+        if model_id != self.routes[role]:
+            with self._lock:
+                self._stats["fast_routes"] += 1
+        return model_id
+
+    def _route(self, role: str, downgraded: bool) -> str:
+        return self.fast_model_id if downgraded and role in self.downgrade_roles else self.routes[role]
+
+    def overloaded(self, load: dict) -> bool:
+        """Does this load reading call for the fast tier?"""
+        if load["waiting"] >= self.queue_depth:
+            return True
+        return load["samples"] >= self.min_samples and load["p95_seconds"] >= self.p95_seconds
+
+    def downgraded(self) -> bool:
+        """Whether the downgradable roles are on the fast tier, updating it from the current load."""
+        if not self.enabled:
+            return False
+        load = self.load()
+        now = time.monotonic()
+        with self._lock:
+            if self.overloaded(load):
+                self._last_overload = now
+                if not self._downgraded:
+                    self._downgraded = True
+                    self._stats["downgrades"] += 1
+                    print(
+                        f"🐇 Court under load (queue {load['waiting']}, p95 {load['p95_seconds']:.1f}s) - "
+                        f"{', '.join(self.downgrade_roles)} moved to {self.fast_model_id}"
+                    )
+            elif self._downgraded and now - self._last_overload >= self.hold_seconds:
+                self._downgraded = False
+                self._stats["restores"] += 1
+                print(f"🐢 Load back to normal - {', '.join(self.downgrade_roles)} restored")
+            return self._downgraded
+
+    def stats(self) -> dict:
+        downgraded = self.downgraded()
+        with self._lock:
+            return {
+                **self._stats,
+                "downgraded": downgraded,
+                "routes": {role: self._route(role, downgraded) for role in ROUTED_ROLES},
+                "fast_model_id": self.fast_model_id,
+                "enabled": self.enabled,
+            }
@@ -0,0 +1,311 @@
+"""
+Lucky Loo - Plea Cache
+Remembers The Doctor's recent diagnoses so repeat pleas ("I've been holding
+it for 3 hours!") skip his Bedrock round-trip.
+
+The Doctor only ever sees the plea text, so his testimony can be reused for
+any plea that says the same thing. Pleas are normalized (case, punctuation,
+repeated letters, whitespace) and matched exactly first. Failing that, a
+MinHash signature of their character shingles finds near-duplicates whose
+estimated Jaccard similarity is at least `min_similarity`. LSH banding keeps
+that lookup from scanning the whole cache.
+
+With SHARED_CACHE_PATH set, diagnoses are also written to the shared store
+(indexed by LSH band) so every worker process can reuse them. The store is
+SQLite and may wait on other workers' writes, so on the event loop use
+get_async/put_async, which only leave the loop for the shared store.
+"""
+
+import os
+import re
+import time
+import zlib
+import random
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from shared_cache import SharedStore, open_shared_store
+
+
+PLEA_CACHE_ENABLED = os.getenv("PLEA_CACHE_ENABLED", "true").lower() == "true"
+PLEA_CACHE_SIZE = int(os.getenv("PLEA_CACHE_SIZE", "1024"))
+PLEA_CACHE_TTL = float(os.getenv("PLEA_CACHE_TTL", "1800"))
+PLEA_CACHE_MAX_BYTES = int(os.getenv("PLEA_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+PLEA_CACHE_MIN_SIMILARITY = float(os.getenv("PLEA_CACHE_MIN_SIMILARITY", "0.8"))
+
+# Character shingle length, and the MinHash signature split into LSH bands
+SHINGLE_SIZE = 4
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+MINHASH_PERMUTATIONS = MINHASH_BANDS * MINHASH_ROWS
+
+# Fixed seed so signatures are stable across processes and restarts
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x100)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+# ============================================================================
+# NORMALIZATION & MINHASH
+# ============================================================================
+
+def normalize_plea(plea: str) -> str:
+    """
+    Reduce a plea to the words that matter.
+
+    "PLEASE!!! I've been holding it for 3 hourssss" and
+    "please i've been holding it for 3 hours" normalize the same.
+    """
+    text = plea.lower().replace("'", "")
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    text = re.sub(r"(.)\1{2,}", r"\1", text)  # sooooo -> so
+    return " ".join(text.split())
+
+
+def shingles(text: str) -> set:
+    """Overlapping character shingles of normalized text, hashed to 32 bits."""
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode("utf-8"))}
+    return {
+        zlib.crc32(text[i:i + SHINGLE_SIZE].encode("utf-8"))
+        for i in range(len(text) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signature(text: str) -> tuple:
+    """MinHash signature of a normalized plea's shingle set."""
+    values = shingles(text)
+    return tuple(
+        min((a * value + b) % _MERSENNE_PRIME for value in values)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimated_similarity(a: tuple, b: tuple) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def plea_cache_key(plea: str) -> tuple:
+    """
+    Build a cache key for a plea.
+
+    Returns:
+        (normalized text, MinHash signature)
+    """
+    normalized = normalize_plea(plea)
+    return (normalized, minhash_signature(normalized))
+
+
+def _bands(signature: tuple) -> list:
+    return [
+        (band, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])
+        for band in range(MINHASH_BANDS)
+    ]
+
+
+def _band_keys(signature: tuple) -> list:
+    """LSH bands as shared-store index keys."""
+    return [f"{band}:{zlib.crc32(repr(rows).encode())}" for band, rows in _bands(signature)]
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class PleaCache:
+    """
+    Thread-safe LRU + TTL cache of Doctor testimony keyed on plea text.
+
+    Bounded both by entry count and by an approximate memory cap, whichever
+    is hit first. A local miss falls back to the shared store, if any.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PLEA_CACHE_SIZE,
+        ttl_seconds: float = PLEA_CACHE_TTL,
+        max_bytes: int = PLEA_CACHE_MAX_BYTES,
+        min_similarity: float = PLEA_CACHE_MIN_SIMILARITY,
+        shared: Optional[SharedStore] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.min_similarity = min_similarity
+        self.shared = shared
+        self._entries = OrderedDict()  # normalized -> (stored_at, signature, testimony, size)
+        self._buckets = {}  # (band, rows) -> set of normalized pleas
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0, "near_hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0, "expirations": 0
+        }
+
+    @staticmethod
+    def _entry_size(normalized: str, testimony: str) -> int:
+        # Text plus the signature tuple and bucket references, roughly
+        return len(normalized) + len(testimony) + MINHASH_PERMUTATIONS * 36 + 200
+
+    def _remove(self, normalized: str):
+        _, signature, _, size = self._entries.pop(normalized)
+        self._bytes -= size
+        for band in _bands(signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(normalized)
+                if not bucket:
+                    del self._buckets[band]
+
+    def _find_near(self, signature: tuple) -> Optional[str]:
+        candidates = set()
+        for band in _bands(signature):
+            candidates |= self._buckets.get(band, set())
+
+        best, best_similarity = None, self.min_similarity
+        for normalized in candidates:
+            similarity = estimated_similarity(signature, self._entries[normalized][1])
+            if similarity >= best_similarity:
+                best, best_similarity = normalized, similarity
+        return best
+
+    def get(self, key: tuple) -> Optional[str]:
+        """Look up the Doctor's testimony for an identical or near-duplicate plea."""
+        testimony = self._get_local(key)
+        if testimony is not None:
+            return testimony
+        return self._get_shared_counted(key)
+
+    async def get_async(self, key: tuple) -> Optional[str]:
+        """get() for the event loop: a local miss reads the shared store on a worker thread."""
+        testimony = self._get_local(key)
+        if testimony is not None:
+            return testimony
+        if self.shared is None:
+            return self._get_shared_counted(key)  # Just counts the miss
+        return await asyncio.to_thread(self._get_shared_counted, key)
+
+    def _get_local(self, key: tuple) -> Optional[str]:
+        """Look a plea up in this process only."""
+        normalized, signature = key
+        now = time.monotonic()
+
+        with self._lock:
+            match = normalized if normalized in self._entries else None
+            if match is None and self.min_similarity < 1:
+                match = self._find_near(signature)
+
+            if match is not None:
+                stored_at, _, testimony, _ = self._entries[match]
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(match)
+                    self._stats["hits" if match == normalized else "near_hits"] += 1
+                    return testimony
+                self._remove(match)
+                self._stats["expirations"] += 1
+        return None
+
+    def _get_shared_counted(self, key: tuple) -> Optional[str]:
+        testimony = self._get_shared(key) if self.shared is not None else None
+        with self._lock:
+            self._stats["shared_hits" if testimony is not None else "misses"] += 1
+        return testimony
+
+    def _get_shared(self, key: tuple) -> Optional[str]:
+        """Look a plea up in the shared store, copying any hit into this process."""
+        normalized, signature = key
+        try:
+            entry = self.shared.get(normalized)
+            if entry is None and self.min_similarity < 1:
+                best_similarity = self.min_similarity
+                for other, candidate in self.shared.candidates(_band_keys(signature)).items():
+                    similarity = estimated_similarity(signature, tuple(candidate["signature"]))
+                    if similarity >= best_similarity:
+                        normalized, entry, best_similarity = other, candidate, similarity
+        except sqlite3.Error as e:
+            print(f"⚠️ Shared plea cache unavailable: {e}")
+            return None
+
+        if entry is None:
+            return None
+        self._put_local((normalized, tuple(entry["signature"])), entry["testimony"])
+        return entry["testimony"]
+
+    def put(self, key: tuple, testimony: str):
+        """Store testimony here and in the shared store."""
+        self._put_local(key, testimony)
+        if self.shared is not None:
+            self._put_shared(key, testimony)
+
+    def put_async(self, key: tuple, testimony: str) -> Optional[asyncio.Future]:
+        """
+        put() for the event loop: stores locally at once and hands the shared
+        store write to a worker thread. The caller needn't wait for it.
+        """
+        self._put_local(key, testimony)
+        if self.shared is None:
+            return None
+        return asyncio.get_running_loop().run_in_executor(None, self._put_shared, key, testimony)
+
+    def _put_shared(self, key: tuple, testimony: str):
+        normalized, signature = key
+        try:
+            self.shared.put(
+                normalized,
+                {"signature": list(signature), "testimony": testimony},
+                _band_keys(signature)
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️ Shared plea cache unavailable: {e}")
+
+    def _put_local(self, key: tuple, testimony: str):
+        """Store testimony in this process, evicting least recently used pleas past either limit."""
+        normalized, signature = key
+        size = self._entry_size(normalized, testimony)
+
+        with self._lock:
+            if normalized in self._entries:
+                self._remove(normalized)
+
+            self._entries[normalized] = (time.monotonic(), signature, testimony, size)
+            self._bytes += size
+            for band in _bands(signature):
+                self._buckets.setdefault(band, set()).add(normalized)
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._bytes = 0
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters plus current size."""
+        with self._lock:
+            hits = self._stats["hits"] + self._stats["near_hits"] + self._stats["shared_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "min_similarity": self.min_similarity,
+                "shared": self.shared is not None,
+            }
+
+
+# Process-wide cache used by agents.ask_doctor
+plea_cache = PleaCache(shared=open_shared_store("plea", PLEA_CACHE_TTL))
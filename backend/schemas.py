@@ -0,0 +1,51 @@
+"""
+Lucky Loo - API Schemas
+Pydantic models shared by the API (app.py) and the Court (agents.py)
+"""
+
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+# ============================================================================
+# PYDANTIC MODELS
+# ============================================================================
+
+class PleaRequest(BaseModel):
+    """Request body for bathroom access plea."""
+    plea: str
+    image_base64: Optional[str] = None
+    demo_mode: bool = False
+
+
+class JuryVotes(BaseModel):
+    """Individual jury member votes."""
+    skeptic: str
+    doctor: str
+    gambler: str
+
+
+class TokenUsage(BaseModel):
+    """Tokens one agent used during a deliberation."""
+    calls: int
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int = 0  # Input served from Bedrock's prompt cache
+    cache_write_tokens: int = 0  # Input stored in Bedrock's prompt cache
+    estimated_calls: int = 0  # Calls cut off before Bedrock reported usage
+
+
+class VerdictResponse(BaseModel):
+    """Response from the Court of Relief."""
+    verdict: str  # "GRANTED" or "DENIED"
+    reasoning: str
+    roast: str
+    jury_votes: JuryVotes
+    token_usage: Optional[Dict[str, TokenUsage]] = None  # Per agent; absent for demo/mock verdicts
+
+
+class HealthResponse(BaseModel):
+    """Health check response."""
+    status: str
+    service: str
+    version: str
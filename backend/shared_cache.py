@@ -0,0 +1,179 @@
+"""
+Lucky Loo - Shared Cache Store
+A SQLite file that every worker process reads and writes, so a face
+analysis or diagnosis cached by one worker is a hit for all of them.
+
+The in-process caches (vision_cache, plea_cache) stay in front as a fast
+first tier and fall back to this store on a miss. Entries carry optional
+index keys (LSH bands, hash chunks) so near-duplicates can be found
+without scanning the table.
+
+    SHARED_CACHE_PATH    SQLite file shared by the workers ("off" or empty =
+                         not shared). `python app.py --workers N` defaults it
+                         to a file in the temp directory.
+    SHARED_CACHE_SIZE    Max entries kept per cache
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Optional
+
+
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "")
+SHARED_CACHE_SIZE = int(os.getenv("SHARED_CACHE_SIZE", "4096"))
+
+# Expired and surplus entries are pruned once every this many writes
+PRUNE_EVERY = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS entry_index (
+    namespace TEXT NOT NULL,
+    index_key TEXT NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entry_index_lookup ON entry_index (namespace, index_key);
+CREATE INDEX IF NOT EXISTS entry_index_key ON entry_index (namespace, key);
+CREATE INDEX IF NOT EXISTS entries_age ON entries (namespace, stored_at);
+"""
+
+
+class SharedStore:
+    """
+    One cache's slice of the shared SQLite file.
+
+    Values are JSON. Timestamps are wall-clock so they mean the same thing
+    in every process. Each thread gets its own connection; WAL mode lets
+    readers in all workers proceed while one of them writes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        ttl_seconds: float,
+        max_entries: int = SHARED_CACHE_SIZE
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+        with self._connection() as db:
+            db.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def get(self, key: str) -> Optional[dict]:
+        """The live value stored under a key, if any."""
+        row = self._connection().execute(
+            "SELECT value FROM entries WHERE namespace = ? AND key = ? AND stored_at >= ?",
+            (self.namespace, key, time.time() - self.ttl_seconds)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def candidates(self, index_keys: list) -> dict:
+        """Live entries sharing at least one index key, as {key: value}."""
+        if not index_keys:
+            return {}
+        placeholders = ",".join("?" * len(index_keys))
+        rows = self._connection().execute(
+            f"""
+            SELECT DISTINCT e.key, e.value FROM entry_index i
+            JOIN entries e ON e.namespace = i.namespace AND e.key = i.key
+            WHERE i.namespace = ? AND i.index_key IN ({placeholders}) AND e.stored_at >= ?
+            """,
+            (self.namespace, *index_keys, time.time() - self.ttl_seconds)
+        ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def put(self, key: str, value: dict, index_keys: list = ()):
+        """Store a value (replacing any under the same key) with its index keys."""
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM entry_index WHERE namespace = ? AND key = ?", (self.namespace, key))
+            db.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), time.time())
+            )
+            db.executemany(
+                "INSERT INTO entry_index (namespace, index_key, key) VALUES (?, ?, ?)",
+                [(self.namespace, index_key, key) for index_key in index_keys]
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+        with self._writes_lock:
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Drop expired entries, then the oldest past max_entries."""
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "DELETE FROM entries WHERE namespace = ? AND stored_at < ?",
+                (self.namespace, time.time() - self.ttl_seconds)
+            )
+            db.execute(
+                """
+                DELETE FROM entries WHERE namespace = ? AND key IN (
+                    SELECT key FROM entries WHERE namespace = ?
+                    ORDER BY stored_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.namespace, self.namespace, self.max_entries)
+            )
+            db.execute(
+                """
+                DELETE FROM entry_index WHERE namespace = ? AND key NOT IN (
+                    SELECT key FROM entries WHERE namespace = ?
+                )
+                """,
+                (self.namespace, self.namespace)
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        db = self._connection()
+        db.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+        db.execute("DELETE FROM entry_index WHERE namespace = ?", (self.namespace,))
+
+
+def open_shared_store(namespace: str, ttl_seconds: float) -> Optional[SharedStore]:
+    """The shared store for a cache, or None when it's off or can't be opened."""
+    if SHARED_CACHE_PATH in ("", "off"):
+        return None
+    try:
+        return SharedStore(SHARED_CACHE_PATH, namespace, ttl_seconds)
+    except sqlite3.Error as e:
+        print(f"⚠️ Shared {namespace} cache unavailable, caching per process: {e}")
+        return None
@@ -0,0 +1,91 @@
+"""
+Lucky Loo - Single-Flight Pleas
+Coalesces identical pleas that arrive while one is already being heard.
+
+Double-taps on the kiosk button and frontend retries send the same plea
+and photo several times in a row. Rather than convening the Court for
+each, later copies attach to the deliberation already in progress and
+get its verdict when it lands. A plea is identical when its text, photo
+bytes and demo flag all match.
+
+The shared deliberation runs in its own task, so a client that hangs up
+doesn't cancel it for the others still waiting.
+"""
+
+import os
+import asyncio
+import hashlib
+import threading
+from typing import Awaitable, Callable, Optional
+
+from metrics import timed
+
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+
+def plea_flight_key(plea: str, image: Optional[bytes] = None, demo_mode: bool = False) -> str:
+    """Hash of everything that decides a plea's verdict."""
+    digest = hashlib.sha256()
+    digest.update(b"demo" if demo_mode else b"plea")
+    digest.update(plea.encode("utf-8"))
+    digest.update(b"\0")
+    if image:
+        digest.update(image)
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """
+    At most one in-flight call per key; concurrent callers share its result.
+
+    Usage:
+        result = await flights.run(key, lambda: deliberate(...))
+    """
+
+    def __init__(self, enabled: bool = SINGLE_FLIGHT_ENABLED):
+        self.enabled = enabled
+        self._flights = {}  # key -> task
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    async def run(self, key: str, call: Callable[[], Awaitable]):
+        """Await call(), or the identical call already in flight."""
+        if not self.enabled:
+            return await call()
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._flights.get(key)
+            # Tasks from another (e.g. finished) event loop can't be awaited here
+            leader = task is None or task.get_loop() is not loop
+            if leader:
+                task = loop.create_task(call())
+                self._flights[key] = task
+                task.add_done_callback(lambda done: self._land(key, done))
+            self._stats["leaders" if leader else "coalesced"] += 1
+
+        if leader:
+            return await asyncio.shield(task)
+        print("🪢 Identical plea already before the Court - waiting on its verdict")
+        with timed("coalesced"):
+            return await asyncio.shield(task)
+
+    def _land(self, key: str, task: asyncio.Task):
+        with self._lock:
+            if self._flights.get(key) is task:
+                del self._flights[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self._stats["leaders"] + self._stats["coalesced"]
+            return {
+                **self._stats,
+                "in_flight": len(self._flights),
+                "coalesce_rate": round(self._stats["coalesced"] / requests, 3) if requests else 0.0,
+                "enabled": self.enabled,
+            }
+
+
+# Process-wide flights used by the judge endpoints
+plea_flights = SingleFlight()
@@ -11,12 +11,32 @@ Usage:
 import sys
 import json
 import os
+import asyncio
+import tempfile
 
 # Set mock mode for testing without AWS
 if "--live" not in sys.argv:
     os.environ["MOCK_MODE"] = "true"
 
-from agents import run_court_of_relief
+# Keep test verdicts out of the real verdict log
+os.environ.setdefault("VERDICT_LOG_PATH", os.path.join(tempfile.mkdtemp(), "verdict_log.sqlite3"))
+
+from agents import (
+    run_court_of_relief,
+    run_court_of_relief_async,
+    stream_court_of_relief,
+    judge_by_rules,
+    validate_verdict,
+    build_case_presentation,
+    CourtPool,
+)
+from json_stream import JsonObjectExtractor
+from circuit_breaker import CircuitBreaker
+from hedging import Hedger
+from metrics import request_timer, timed, server_timing, stage_seconds
+from token_usage import TokenLedger, request_usage, estimate_tokens
+from plea_cache import PleaCache, plea_cache_key
+from mock_responses import get_mock_jury_response, set_mock_latency, get_mock_latency
 
 
 def print_verdict(result: dict):
@@ -99,6 +119,997 @@ def test_with_image_claim():
     return result
 
 
+def test_async_court():
+    """Test the non-blocking court runs several pleas concurrently."""
+    print("\n🧪 TEST 5: Async Court (concurrent pleas)")
+    print("-" * 40)
+    
+    async def run_pleas():
+        return await asyncio.gather(
+            run_court_of_relief_async(user_plea="I NEED TO GO NOW!!!"),
+            run_court_of_relief_async(user_plea="Testing demo mode", demo_mode=True),
+        )
+    
+    result, demo_result = asyncio.run(run_pleas())
+    print_verdict(result)
+    assert result["verdict"] in ("GRANTED", "DENIED")
+    assert demo_result["verdict"] == "GRANTED", "Demo mode should always grant access"
+    print("✅ Async court working correctly!")
+    return result
+
+
+def test_court_pool():
+    """Test courts are recycled with a clean history."""
+    print("\n🧪 TEST 6: Court Pool")
+    print("-" * 40)
+    
+    import threading
+    
+    class WatchedPool(CourtPool):
+        def _build(self):
+            builders.append(threading.current_thread())
+            return super()._build()
+    
+    builders = []
+    pool = CourtPool(size=1, recycle_after=2)
+    
+    async def borrow_courts():
+        async with pool.court() as court:
+            court["judge"].messages.append({"role": "user", "content": [{"text": "Let me in!"}]})
+        
+        async with pool.court() as reused:
+            assert reused is court, "Idle courts should be reused"
+            assert reused["judge"].messages == [], "History should be wiped on checkin"
+        
+        async with pool.court() as recycled:
+            assert recycled is not court, "Courts should be rebuilt after recycle_after uses"
+        
+        # An empty pool builds the extra court off the event loop
+        async with WatchedPool(size=0).court() as extra:
+            assert extra["judge"].messages == []
+        assert builders and threading.main_thread() not in builders, "Courts are built on a worker thread"
+    
+    asyncio.run(borrow_courts())
+    print(f"Pool stats: {pool.stats()}")
+    assert pool.stats()["recycled"] == 1
+    
+    # Courts built while admission lets more pleas in are kept, up to its limit
+    limit = 3
+    elastic = CourtPool(size=1, capacity=lambda: limit)
+    
+    async def borrow_at_once(count):
+        entries = [await elastic.checkout() for _ in range(count)]
+        for entry in entries:
+            await elastic.checkin(entry)
+    
+    asyncio.run(borrow_at_once(4))
+    assert elastic.stats()["idle"] == 3 and elastic.stats()["discarded"] == 1, "Kept up to the admission limit"
+    asyncio.run(borrow_at_once(3))
+    assert elastic.stats()["built"] == 4, "No rebuilds once the pool has grown"
+    limit = 1
+    asyncio.run(borrow_at_once(3))
+    assert elastic.stats()["idle"] == 1, "Shrinks back with the limit"
+    
+    # A plea arriving mid warm-up waits for the pool without stalling the loop
+    import agents
+    
+    async def plea_during_warm_up():
+        agents._court_pools.pop(False, None)
+        agents._court_pools_lock.acquire()  # As warm_up does while it builds
+        waiting = asyncio.ensure_future(agents.get_court_pool_async(jury_tools=False))
+        await asyncio.sleep(0.05)
+        assert not waiting.done(), "The plea waits for warm-up to finish..."
+        agents._court_pools_lock.release()
+        return await waiting
+    
+    assert isinstance(asyncio.run(plea_during_warm_up()), CourtPool), "...without blocking the event loop"
+    print("✅ Court pool working correctly!")
+
+
+def test_vision_cache():
+    """Test near-identical frames hit the vision cache."""
+    print("\n🧪 TEST 7: Vision Cache")
+    print("-" * 40)
+    
+    import io
+    from PIL import Image, ImageDraw
+    from vision_cache import VisionCache, image_cache_key
+    
+    face = Image.new("RGB", (640, 480), "white")
+    ImageDraw.Draw(face).ellipse((200, 100, 440, 400), fill=(200, 150, 120))
+    
+    def encode(image, quality):
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=quality)
+        return buffer.getvalue()
+    
+    cache = VisionCache(max_distance=6)
+    cache.put(image_cache_key(encode(face, 90)), {"verdict": "REAL", "analysis": "Sweating bullets."})
+    
+    # Same face, re-compressed - should reuse the analysis
+    assert cache.get(image_cache_key(encode(face, 40)))["verdict"] == "REAL"
+    # Undecodable data only matches exactly
+    assert cache.get(image_cache_key(b"fake image data here")) is None
+    
+    print(f"Cache stats: {cache.stats()}")
+    print("✅ Vision cache working correctly!")
+
+
+def test_stream_court():
+    """Test the streaming court reports every juror before the verdict."""
+    print("\n🧪 TEST 8: Streaming Court")
+    print("-" * 40)
+    
+    async def collect():
+        return [event async for event in stream_court_of_relief(user_plea="I CAN'T HOLD IT!!")]
+    
+    events = asyncio.run(collect())
+    for name, data in events:
+        print(f"   {name}: {data}")
+    
+    names = [name for name, _ in events]
+    assert names == ["juror", "juror", "juror", "verdict", "roast"]
+    assert {data["juror"] for name, data in events if name == "juror"} == {"skeptic", "doctor", "gambler"}
+    print("✅ Streaming court working correctly!")
+
+
+def test_verdict_engine():
+    """Test the local verdict engine follows the Pit Boss's rules."""
+    print("\n🧪 TEST 9: Verdict Engine")
+    print("-" * 40)
+    
+    def rule(skeptic, doctor, gambler):
+        return judge_by_rules({
+            "skeptic": get_mock_jury_response("skeptic", favorable=skeptic),
+            "doctor": get_mock_jury_response("doctor", favorable=doctor),
+            "gambler": get_mock_jury_response("gambler", favorable=gambler),
+        })
+    
+    granted = rule(True, True, False)
+    print_verdict({**granted, "roast": "(rules engine)"})
+    assert granted["verdict"] == "GRANTED", "2+ favorable jurors should grant access"
+    assert granted["jury_votes"] == {"skeptic": "REAL", "doctor": "CRITICAL", "gambler": "OUT"}
+    
+    assert rule(False, False, True)["verdict"] == "DENIED", "2+ unfavorable jurors should deny access"
+    assert judge_by_rules({"skeptic": "", "doctor": "", "gambler": ""})["verdict"] == "DENIED"
+    print("✅ Verdict engine working correctly!")
+
+
+def test_streaming_json_extraction():
+    """Test the verdict is extracted the moment its JSON object closes."""
+    print("\n🧪 TEST 10: Streaming JSON Extraction")
+    print("-" * 40)
+    
+    response = (
+        "Well well well {what a mess}. Here's my ruling:\n```json\n"
+        '{"verdict": "DENIED", "door_code": null, "reasoning": "Braces } in \\"strings\\" are fine.", '
+        '"roast": "House wins.", "jury_votes": {"skeptic": "FAKE", "doctor": "STABLE", "gambler": "OUT"}}'
+        "\n```\nAnd another thing..."
+    )
+    
+    extractor = JsonObjectExtractor(validate_verdict)
+    chunks = [response[i:i + 5] for i in range(0, len(response), 5)]
+    for consumed, chunk in enumerate(chunks, start=1):
+        if extractor.feed(chunk) is not None:
+            break
+    
+    print(f"Stopped after {consumed} of {len(chunks)} chunks")
+    assert extractor.result["verdict"] == "DENIED"
+    assert extractor.result["reasoning"] == 'Braces } in "strings" are fine.'
+    assert "door_code" not in extractor.result
+    assert consumed < len(chunks), "Trailing prose should never be waited on"
+    print("✅ Streaming JSON extraction working correctly!")
+
+
+def test_circuit_breaker():
+    """Test the breaker trips on errors and recovers after a good probe."""
+    print("\n🧪 TEST 11: Circuit Breaker")
+    print("-" * 40)
+    
+    breaker = CircuitBreaker("test", window=4, min_calls=4, error_rate=0.5, cooldown=0.05, enabled=True)
+    
+    for succeeded in (True, False, True, False):
+        assert breaker.allow_request()
+        breaker.record(succeeded, latency=0.1)
+    assert breaker.state == "open", "50% errors should trip the breaker"
+    assert not breaker.allow_request(), "An open breaker should refuse calls"
+    
+    import time
+    time.sleep(0.06)
+    assert breaker.allow_request(), "After the cooldown one probe should be let through"
+    assert not breaker.allow_request(), "Only one probe at a time"
+    breaker.record(True, latency=0.1)
+    assert breaker.state == "closed"
+    
+    # Jurors that fall back to "unavailable" must still count as failures
+    import agents
+    
+    async def unreachable(*args):
+        raise ConnectionError("Bedrock is down")
+    
+    ask_juror, ask_doctor = agents.ask_juror, agents.ask_doctor
+    agents.ask_juror = agents.ask_doctor = unreachable
+    try:
+        court = {"skeptic": None, "doctor": None, "gambler": None}
+        testimony, absent = asyncio.run(agents.consult_jury_in_parallel(court, "Let me in!", None))
+    finally:
+        agents.ask_juror, agents.ask_doctor = ask_juror, ask_doctor
+    assert sorted(absent) == ["doctor", "gambler", "skeptic"], "Failed jurors are reported as absent"
+    assert "unavailable" in testimony["skeptic"]
+    
+    # So must jurors the agentic Pit Boss called as tools, though he rules anyway
+    async def pit_boss_with_failed_juror(judge, presentation):
+        try:
+            await agents.testify_as_tool("gambler", lambda: unreachable())
+        except ConnectionError:
+            pass  # Strands hands it to the Pit Boss as a tool error
+        return {"verdict": "DENIED", "reasoning": "Ruled without The Gambler", "jury_votes": {}}
+    
+    stream_judge_verdict = agents.stream_judge_verdict
+    agents.stream_judge_verdict = pit_boss_with_failed_juror
+    try:
+        ruling, healthy = asyncio.run(agents.deliberate("Let me in!", orchestration="agentic"))
+    finally:
+        agents.stream_judge_verdict = stream_judge_verdict
+    assert ruling["verdict"] == "DENIED" and not healthy, "Agentic juror failures count against the breaker"
+    
+    print(f"Breaker stats: {breaker.stats()}")
+    print("✅ Circuit breaker working correctly!")
+
+
+def test_hedged_requests():
+    """Test a slow primary is beaten by the hedge."""
+    print("\n🧪 TEST 12: Hedged Requests")
+    print("-" * 40)
+    
+    import time
+    hedger = Hedger(enabled=True, default_delay=0.05)
+    
+    def slow_primary():
+        time.sleep(0.5)
+        return "primary"
+    
+    started = time.monotonic()
+    assert hedger.run_sync("vision", slow_primary, lambda: "secondary") == "secondary"
+    assert time.monotonic() - started < 0.4, "The hedge should not wait for the straggler"
+    assert hedger.run_sync("vision", lambda: "primary", lambda: "secondary") == "primary"
+    
+    stats = hedger.stats()["kinds"]["vision"]
+    print(f"Hedge stats: {stats}")
+    assert stats["hedge_wins"] == 1 and stats["primary_wins"] == 1
+    
+    # Stand-in jurors run on the hedge region's model, built once and reused
+    from agents import build_hedge_juror, get_agent_model
+    stand_ins = [build_hedge_juror("gambler") for _ in range(2)]
+    assert stand_ins[0] is not stand_ins[1], "Each hedged question gets a fresh stand-in"
+    assert stand_ins[0].model is stand_ins[1].model is get_agent_model("gambler", hedge=True)
+    print("✅ Hedged requests working correctly!")
+
+
+def test_stage_metrics():
+    """Test per-stage timings are collected for a request and exported."""
+    print("\n🧪 TEST 13: Stage Metrics")
+    print("-" * 40)
+    
+    def decode():
+        with timed("image_decode"):
+            pass
+    
+    async def request():
+        with timed("vision"):
+            await asyncio.sleep(0.01)
+        # Stages timed on worker threads land in the same request
+        await asyncio.to_thread(decode)
+    
+    with request_timer() as timings:
+        asyncio.run(request())
+    
+    header = server_timing(timings)
+    print(f"Server-Timing: {header}")
+    assert set(timings) == {"vision", "image_decode"}
+    assert timings["vision"] >= 0.01
+    assert header.startswith("vision;dur=")
+    
+    # Worker threads and the loop adding to one request's timings lose nothing
+    import sys
+    from metrics import record_stage
+    
+    def cache_lookups():
+        for _ in range(2000):
+            record_stage("plea_cache", 0.001)
+    
+    async def busy_request():
+        await asyncio.gather(*(asyncio.to_thread(cache_lookups) for _ in range(8)))
+    
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible
+    try:
+        with request_timer() as busy:
+            asyncio.run(busy_request())
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert abs(busy["plea_cache"] - 16) < 1e-6, f"Every lookup counted ({busy['plea_cache']:.3f}s of 16s)"
+    
+    exposition = "\n".join(stage_seconds.render())
+    assert 'court_stage_seconds_count{stage="vision"}' in exposition
+    assert 'court_stage_seconds_bucket{stage="vision",le="+Inf"}' in exposition
+    print("✅ Stage metrics working correctly!")
+
+
+def test_token_accounting():
+    """Test token usage is tallied per agent and per deliberation."""
+    print("\n🧪 TEST 14: Token Accounting")
+    print("-" * 40)
+    
+    ledger = TokenLedger()
+    ledger.record("doctor", 500, 120)
+    
+    with request_usage() as usage:
+        ledger.record("doctor", 480, 100)
+        ledger.record("judge", estimate_tokens("x" * 4000), estimate_tokens("y" * 401), estimated=True)
+    
+    print(f"Deliberation usage: {usage}")
+    assert usage["doctor"] == {
+        "calls": 1, "input_tokens": 480, "output_tokens": 100,
+        "cache_read_tokens": 0, "cache_write_tokens": 0, "estimated_calls": 0,
+    }
+    assert usage["judge"]["input_tokens"] == 1000 and usage["judge"]["output_tokens"] == 101
+    
+    stats = ledger.stats()
+    assert stats["agents"]["doctor"]["calls"] == 2
+    assert stats["total"]["input_tokens"] == 500 + 480 + 1000
+    print("✅ Token accounting working correctly!")
+
+
+def test_mock_latency():
+    """Test mock mode can simulate Bedrock latency for load tests."""
+    print("\n🧪 TEST 15: Simulated Latency")
+    print("-" * 40)
+    
+    set_mock_latency("skeptic=0.02,doctor=0.03:0.2,gambler=0.02,judge=0.02")
+    try:
+        samples = [get_mock_latency("doctor") for _ in range(50)]
+        assert min(samples) > 0 and max(samples) != min(samples), "sigma should add jitter"
+        assert get_mock_latency("vision") == 0.0, "Unlisted agents take no time"
+        
+        with request_timer() as timings:
+            result = asyncio.run(run_court_of_relief_async(
+                user_plea="I NEED TO GO NOW!!!",
+                orchestration="parallel"
+            ))
+        print(f"Server-Timing: {server_timing(timings)}")
+        assert result["verdict"] in ("GRANTED", "DENIED")
+        assert {"juror_skeptic", "juror_doctor", "juror_gambler", "judge"} <= set(timings)
+        assert timings["judge"] >= 0.02
+    finally:
+        set_mock_latency("")
+    
+    print("✅ Simulated latency working correctly!")
+
+
+def test_fake_bedrock():
+    """Test boto3 can talk to the fake Bedrock runtime, streaming included."""
+    print("\n🧪 TEST 16: Fake Bedrock Runtime")
+    print("-" * 40)
+    
+    import boto3
+    from fake_bedrock import start_in_background
+    
+    server, endpoint_url = start_in_background(throttle_rate=0.0)
+    try:
+        client = boto3.client(
+            "bedrock-runtime",
+            region_name="us-east-1",
+            endpoint_url=endpoint_url,
+            aws_access_key_id="offline",
+            aws_secret_access_key="offline"
+        )
+        
+        response = client.invoke_model(
+            modelId="fake-model",
+            body=json.dumps({"anthropic_version": "bedrock-2023-05-31", "max_tokens": 300, "messages": []})
+        )
+        vision = json.loads(response["body"].read())
+        assert vision["content"][0]["text"].startswith("VERDICT:")
+        
+        stream = client.converse_stream(
+            modelId="fake-model",
+            system=[{"text": "You are **The Doctor**, an overly dramatic medical professional."}],
+            messages=[{"role": "user", "content": [{"text": "I need to go!"}]}]
+        )
+        events = list(stream["stream"])
+        text = "".join(e["contentBlockDelta"]["delta"]["text"] for e in events if "contentBlockDelta" in e)
+        print(f"Streamed {len(events)} events from The Doctor")
+        assert "URGENCY:" in text
+        assert events[-1]["metadata"]["usage"]["outputTokens"] > 0
+    finally:
+        server.should_exit = True
+    
+    print("✅ Fake Bedrock runtime working correctly!")
+
+
+def test_plea_cache():
+    """Test repeat and near-duplicate pleas reuse The Doctor's diagnosis."""
+    print("\n🧪 TEST 17: Plea Cache")
+    print("-" * 40)
+    
+    cache = PleaCache(max_entries=2, ttl_seconds=60, min_similarity=0.8)
+    diagnosis = get_mock_jury_response("doctor", favorable=True)
+    cache.put(plea_cache_key("I've been holding it for 3 hours!"), diagnosis)
+    
+    assert cache.get(plea_cache_key("ive been holding it for 3 HOURS")) == diagnosis, "Normalized repeat"
+    assert cache.get(plea_cache_key("I have been holding it for 3 hours!!!")) == diagnosis, "Near-duplicate"
+    assert cache.get(plea_cache_key("I had the buffet and regret everything")) is None
+    
+    cache.put(plea_cache_key("plea two"), diagnosis)
+    cache.put(plea_cache_key("a completely different third plea"), diagnosis)
+    stats = cache.stats()
+    print(f"Plea cache stats: {stats}")
+    assert stats["hits"] == 1 and stats["near_hits"] == 1 and stats["misses"] == 1
+    assert stats["size"] == 2 and stats["evictions"] == 1
+    
+    tiny = PleaCache(max_bytes=1)
+    tiny.put(plea_cache_key("anything at all"), diagnosis)
+    assert tiny.stats()["size"] == 0, "Memory cap should be enforced"
+    print("✅ Plea cache working correctly!")
+
+
+def test_prompt_cache():
+    """Test static prompt prefixes are marked cacheable and cache reads are counted."""
+    print("\n🧪 TEST 18: Prompt Caching")
+    print("-" * 40)
+    
+    import boto3
+    from fake_bedrock import start_in_background
+    
+    case = build_case_presentation("I NEED TO GO NOW!!!")
+    assert [list(block) for block in case] == [["text"], ["cachePoint"], ["text"]]
+    assert "I NEED TO GO NOW" not in case[0]["text"], "The plea must come after the cache point"
+    assert case[0] == build_case_presentation("Let me in!")[0], "Same prefix for every plea"
+    
+    server, endpoint_url = start_in_background(cache_min_tokens=16)
+    try:
+        client = boto3.client(
+            "bedrock-runtime",
+            region_name="us-east-1",
+            endpoint_url=endpoint_url,
+            aws_access_key_id="offline",
+            aws_secret_access_key="offline"
+        )
+        system = [{"text": "You are **The Pit Boss**. " * 20}, {"cachePoint": {"type": "default"}}]
+        
+        ledger = TokenLedger()
+        for plea in ("I need to go!", "Let me in!"):
+            usage = client.converse(
+                modelId="fake-model",
+                system=system,
+                messages=[{"role": "user", "content": [case[0], case[1], {"text": plea}]}]
+            )["usage"]
+            ledger.record(
+                "judge", usage["inputTokens"], usage["outputTokens"],
+                cache_read=usage.get("cacheReadInputTokens", 0),
+                cache_write=usage.get("cacheWriteInputTokens", 0)
+            )
+            print(f"Usage: {usage}")
+        
+        judge = ledger.stats()["agents"]["judge"]
+        assert judge["cache_write_tokens"] > 0, "First call writes the prefix"
+        assert judge["cache_read_tokens"] == judge["cache_write_tokens"], "Second call reads it back"
+        assert ledger.stats()["total"]["cache_hit_rate"] > 0
+    finally:
+        server.should_exit = True
+    
+    print("✅ Prompt caching working correctly!")
+
+
+def test_shared_cache():
+    """Test a cache hit in one worker process is a hit in the others."""
+    print("\n🧪 TEST 19: Shared Cross-Worker Cache")
+    print("-" * 40)
+    
+    import tempfile
+    from shared_cache import SharedStore
+    from vision_cache import VisionCache
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        
+        # Two caches on the same file stand in for two workers
+        worker_a = PleaCache(shared=SharedStore(path, "plea", ttl_seconds=60))
+        worker_b = PleaCache(shared=SharedStore(path, "plea", ttl_seconds=60))
+        diagnosis = get_mock_jury_response("doctor", favorable=True)
+        worker_a.put(plea_cache_key("I've been holding it for 3 hours!"), diagnosis)
+        
+        assert worker_b.get(plea_cache_key("I have been holding it for 3 hours!!!")) == diagnosis
+        assert worker_b.get(plea_cache_key("I have been holding it for 3 hours!!!")) == diagnosis
+        assert worker_b.get(plea_cache_key("I had the buffet and regret everything")) is None
+        stats = worker_b.stats()
+        print(f"Worker B plea cache: {stats}")
+        assert stats["shared_hits"] == 1 and stats["near_hits"] == 1, "Shared hits are kept locally"
+        
+        vision_a = VisionCache(shared=SharedStore(path, "vision", ttl_seconds=60))
+        vision_b = VisionCache(shared=SharedStore(path, "vision", ttl_seconds=60))
+        face = 0x0F0F_3C3C_F0F0_5A5A
+        vision_a.put(("phash", face), {"verdict": "REAL", "analysis": "Sweating bullets."})
+        assert vision_b.get(("phash", face ^ 0b101))["verdict"] == "REAL", "2 bits apart"
+        assert vision_b.get(("phash", ~face & (2 ** 64 - 1))) is None
+        
+        # On the event loop, only the shared store leaves it (for a worker thread)
+        import threading
+        
+        class WatchedStore(SharedStore):
+            def get(self, key):
+                store_threads.append(threading.current_thread())
+                return super().get(key)
+            
+            def put(self, key, value, index_keys=()):
+                store_threads.append(threading.current_thread())
+                return super().put(key, value, index_keys)
+        
+        store_threads = []
+        worker_c = PleaCache(shared=WatchedStore(path, "plea", ttl_seconds=60))
+        
+        async def diagnose_on_loop():
+            assert await worker_c.get_async(plea_cache_key("I've been holding it for 3 hours!")) == diagnosis
+            assert await worker_c.get_async(plea_cache_key("I've been holding it for 3 hours!")) == diagnosis
+            await worker_c.put_async(plea_cache_key("The buffet is fighting back"), diagnosis)
+        
+        asyncio.run(diagnose_on_loop())
+        assert len(store_threads) == 2, "Local hits never touch the shared store"
+        assert threading.main_thread() not in store_threads, "Shared store calls stay off the event loop"
+        assert worker_a.get(plea_cache_key("The buffet is fighting back")) == diagnosis
+        
+        assert SharedStore(path, "plea", ttl_seconds=60).get("ive been holding it for 3 hours") is not None
+        assert SharedStore(path, "plea", ttl_seconds=0).get("ive been holding it for 3 hours") is None, "Entries expire"
+    
+    print("✅ Shared cache working correctly!")
+
+
+def test_image_ingestion():
+    """Test photos arrive as raw bytes and are base64-encoded once, for Bedrock."""
+    print("\n🧪 TEST 20: Binary Image Ingestion")
+    print("-" * 40)
+    
+    import io
+    import base64
+    import httpx
+    from PIL import Image
+    from app import app, MAX_REQUEST_BYTES
+    from agents import invoke_vision_model
+    from vision import preprocess_image, IMAGE_MAX_BYTES
+    
+    buffer = io.BytesIO()
+    Image.new("RGB", (1280, 720), (200, 150, 120)).save(buffer, "PNG")
+    frame = buffer.getvalue()
+    
+    image, media_type = preprocess_image(frame)
+    assert isinstance(image, bytes) and media_type == "image/jpeg"
+    assert image.startswith(b"\xff\xd8"), "Frames are re-encoded as JPEG bytes"
+    assert preprocess_image(image)[0] is image, "Small JPEGs pass through without a copy"
+    
+    class FakeClient:
+        def invoke_model(self, modelId, body):
+            self.body = body
+            return {"body": io.BytesIO(json.dumps({"content": [{"text": "VERDICT: REAL"}]}).encode())}
+    
+    client = FakeClient()
+    assert invoke_vision_model(image, media_type, client, "fake-model")["verdict"] == "REAL"
+    source = json.loads(client.body)["messages"][0]["content"][0]["source"]
+    assert source["data"] == base64.b64encode(image).decode(), "Image spliced into the body intact"
+    
+    async def submit():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://court") as http:
+            raw = await http.post(
+                "/api/judge/image", params={"plea": "Look at my face!"},
+                content=frame, headers={"Content-Type": "image/png"}
+            )
+            upload = await http.post(
+                "/api/judge/upload", data={"plea": "Look at my face!"},
+                files={"image": ("face.png", frame, "image/png")}
+            )
+            too_big = await http.post(
+                "/api/judge/image", params={"plea": "Look at my face!"},
+                content=b"\0" * (IMAGE_MAX_BYTES + 1)
+            )
+            way_too_big = await http.post(
+                "/api/judge", content=b"{" + b" " * MAX_REQUEST_BYTES + b"}",
+                headers={"Content-Type": "application/json"}
+            )
+            not_base64 = await http.post("/api/judge", json={"plea": "Look at my face!", "image_base64": "a"})
+            return raw, upload, too_big, way_too_big, not_base64
+    
+    raw, upload, too_big, way_too_big, not_base64 = asyncio.run(submit())
+    print(f"Raw: {raw.status_code}, upload: {upload.status_code}, oversized: {too_big.status_code}/"
+          f"{way_too_big.status_code}, bad base64: {not_base64.status_code}")
+    assert raw.status_code == 200 and upload.status_code == 200
+    assert too_big.status_code == 413 and way_too_big.status_code == 413
+    assert not_base64.status_code == 400
+    
+    # Characters outside the alphabet are rejected, not skipped over
+    from vision import decode_image
+    assert decode_image(base64.b64encode(image).decode()[:64] + "\n") == image[:48], "Line breaks are allowed"
+    for garbage in ("not base64 at all!", "data:image/jpeg;base64,/9j/4AAQ***"):
+        try:
+            decode_image(garbage)
+            assert False, f"{garbage!r} should not decode"
+        except ValueError:
+            pass
+    print("✅ Binary image ingestion working correctly!")
+
+
+def test_admission_control():
+    """Test the AIMD limit grows under clean load, backs off on throttling and sheds with 429s."""
+    print("\n🧪 TEST 21: Admission Control")
+    print("-" * 40)
+    
+    import httpx
+    import bedrock_gateway
+    from admission import AdmissionController, CourtOverloaded
+    from agents import court_admission
+    from app import app
+    
+    admission = AdmissionController(initial_limit=1, min_limit=1, max_limit=4, queue_size=1, latency_target=5)
+    
+    async def deliberate(throttle: bool = False):
+        async with admission.admit():
+            await asyncio.sleep(0.01)
+            if throttle:
+                bedrock_gateway._count_throttle(response_dict={"status_code": 429})
+    
+    async def burst():
+        results = await asyncio.gather(*(deliberate() for _ in range(3)), return_exceptions=True)
+        return [r for r in results if isinstance(r, CourtOverloaded)]
+    
+    rejected = asyncio.run(burst())
+    assert len(rejected) == 1 and rejected[0].retry_after >= 1, "One runs, one queues, one is turned away"
+    
+    for _ in range(4):
+        asyncio.run(burst())
+    grown = admission.stats()["limit"]
+    assert grown > 1, "Clean deliberations at the limit raise it"
+    
+    asyncio.run(deliberate(throttle=True))
+    stats = admission.stats()
+    print(f"Admission stats: {stats}")
+    assert stats["limit"] < grown and stats["throttled"] == 1
+    assert stats["in_flight"] == 0 and stats["waiting"] == 0
+    
+    async def submit():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://court") as http:
+            return await http.post("/api/judge", json={"plea": "I NEED TO GO NOW!!!"})
+    
+    # A court with no free slots and no room in the queue
+    limit, queue_size = court_admission.limit, court_admission.queue_size
+    court_admission.limit, court_admission.queue_size = 0, 0
+    try:
+        response = asyncio.run(submit())
+    finally:
+        court_admission.limit, court_admission.queue_size = limit, queue_size
+    print(f"Overloaded court: {response.status_code}, Retry-After {response.headers.get('retry-after')}")
+    assert response.status_code == 429 and int(response.headers["retry-after"]) >= 1
+    print("✅ Admission control working correctly!")
+
+
+def test_single_flight():
+    """Test identical pleas in flight together share one deliberation."""
+    print("\n🧪 TEST 22: Single-Flight Pleas")
+    print("-" * 40)
+    
+    import httpx
+    from app import app
+    from single_flight import SingleFlight, plea_flight_key, plea_flights
+    
+    flights = SingleFlight(enabled=True)
+    calls = []
+    
+    async def deliberate(plea: str):
+        calls.append(plea)
+        await asyncio.sleep(0.05)
+        return {"verdict": "GRANTED", "plea": plea}
+    
+    async def double_tap():
+        key = plea_flight_key("LET ME IN", b"face")
+        impatient = asyncio.ensure_future(flights.run(key, lambda: deliberate("LET ME IN")))
+        await asyncio.sleep(0)
+        patient = [flights.run(key, lambda: deliberate("LET ME IN")) for _ in range(2)]
+        other = flights.run(plea_flight_key("LET ME IN", b"other face"), lambda: deliberate("other"))
+        await asyncio.sleep(0.01)
+        impatient.cancel()  # One client hangs up; the others still get the verdict
+        return await asyncio.gather(*patient, other)
+    
+    first, second, other = asyncio.run(double_tap())
+    assert first is second and first["verdict"] == "GRANTED"
+    assert calls == ["LET ME IN", "other"], "Identical pleas convene the Court once"
+    assert plea_flight_key("LET ME IN", b"face") != plea_flight_key("LET ME IN", b"face", demo_mode=True)
+    print(f"Flight stats: {flights.stats()}")
+    assert flights.stats()["coalesced"] == 2 and flights.stats()["in_flight"] == 0
+    
+    async def retry_storm():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://court") as http:
+            return await asyncio.gather(*(
+                http.post("/api/judge", json={"plea": "Double tap! I NEED TO GO!!!"}) for _ in range(3)
+            ))
+    
+    set_mock_latency("skeptic=0.05,doctor=0.05,gambler=0.05,judge=0.05")
+    coalesced = plea_flights.stats()["coalesced"]
+    try:
+        responses = asyncio.run(retry_storm())
+    finally:
+        set_mock_latency("")
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.json()["roast"] for response in responses}) == 1, "Everyone hears the same verdict"
+    assert plea_flights.stats()["coalesced"] - coalesced == 2
+    print("✅ Single-flight pleas working correctly!")
+
+
+def test_verdict_log():
+    """Test verdicts are logged in batches off the request path and aggregated for /api/stats."""
+    print("\n🧪 TEST 23: Verdict Log & Stats")
+    print("-" * 40)
+    
+    import sqlite3
+    import httpx
+    from app import app
+    from verdict_log import VerdictLog, percentiles_ms, latency_bucket, verdict_log
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        log = VerdictLog(os.path.join(tmp, "verdicts.sqlite3"), batch_size=8, flush_interval=0.05)
+        for i in range(20):
+            granted = i % 4 == 0
+            log.record(
+                f"hash{i}",
+                {"verdict": "GRANTED" if granted else "DENIED",
+                 "jury_votes": {"skeptic": "REAL" if granted else "FAKE", "doctor": "CRITICAL", "gambler": "IN"}},
+                {"judge": 0.5 + i / 100, "vision": 0.2},
+                latency_seconds=1 + i / 10,
+                has_image=i % 2 == 0
+            )
+        log.close()
+        
+        stats = log.stats()
+        print(f"Stats: {json.dumps({k: v for k, v in stats.items() if k != 'log'})}")
+        assert stats["deliberations"] == 20 and stats["grant_rate"] == 0.25
+        assert stats["votes"]["skeptic"] == {"REAL": 5, "FAKE": 15}
+        assert 1.9 <= stats["latency_ms"]["p50"] / 1000 <= 1.9 * 1.1, "Percentiles within one bucket"
+        assert set(stats["stages_ms"]) == {"judge", "vision"}
+        assert stats["log"]["written"] == 20 and stats["log"]["batches"] >= 3, "Written in batches"
+        
+        rows = sqlite3.connect(log.path).execute("SELECT COUNT(*), SUM(has_image) FROM verdicts").fetchone()
+        assert rows == (20, 10), "Every deliberation is in the append-only log"
+    
+    assert percentiles_ms({latency_bucket(0.1): 99, latency_bucket(10): 1})["p99"] <= 110
+    
+    import threading
+    
+    stats_threads = []
+    
+    def watched_stats():
+        stats_threads.append(threading.current_thread())
+        return VerdictLog.stats(verdict_log)
+    
+    async def plead_and_check():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://court") as http:
+            verdict_log.close()  # Flush verdicts from earlier tests
+            before = (await http.get("/api/stats")).json()["deliberations"]
+            await http.post("/api/judge", json={"plea": "Logged plea! I NEED TO GO!!!"})
+            await http.post("/api/demo")
+            verdict_log.close()
+            return before, (await http.get("/api/stats")).json()
+    
+    verdict_log.stats = watched_stats
+    try:
+        before, stats = asyncio.run(plead_and_check())
+    finally:
+        del verdict_log.stats
+    print(f"/api/stats: {stats['deliberations']} deliberations, grant rate {stats['grant_rate']}")
+    assert stats["enabled"] and stats["deliberations"] == before + 1, "Demo verdicts aren't logged"
+    assert stats_threads and threading.main_thread() not in stats_threads, "Stats are read off the event loop"
+    print("✅ Verdict log working correctly!")
+
+
+def test_bedrock_cassette():
+    """Test Bedrock calls are recorded to a cassette and replayed from it offline."""
+    print("\n🧪 TEST 24: Bedrock Cassettes")
+    print("-" * 40)
+    
+    import io
+    import time
+    from botocore.exceptions import ClientError, EventStreamError
+    from cassette import Cassette, CassetteClient, CassetteMiss
+    
+    class LiveClient:
+        """Stands in for a bedrock-runtime client."""
+        meta = "live client meta"
+        
+        def invoke_model(self, **request):
+            time.sleep(0.05)
+            return {"body": io.BytesIO(b'{"content": [{"text": "A face of pure panic"}]}'), "contentType": "application/json"}
+        
+        def converse(self, **request):
+            raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "Slow down"},
+                               "ResponseMetadata": {"HTTPStatusCode": 429}}, "Converse")
+        
+        def converse_stream(self, **request):
+            def events():
+                for word in ("Objection", " sustained", " - GRANTED"):
+                    time.sleep(0.02)
+                    yield {"contentBlockDelta": {"delta": {"text": word}}}
+                    if request["messages"] == ["overloaded"]:
+                        raise EventStreamError({"Error": {"Code": "modelStreamErrorException", "Message": "Lost it"},
+                                                "ResponseMetadata": {"HTTPStatusCode": 424}}, "ConverseStream")
+            
+            class Stream:
+                def __iter__(self):
+                    return events()
+                
+                def close(self):
+                    pass
+            return {"stream": Stream()}
+    
+    def stream_text(response, stop_after=None):
+        text, stream = "", response["stream"]
+        for i, event in enumerate(stream):
+            text += event["contentBlockDelta"]["delta"]["text"]
+            if stop_after and i + 1 == stop_after:
+                stream.close()
+                break
+        return text
+    
+    juror = {"modelId": "claude", "system": [{"text": "You are The Skeptic"}]}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cassettes", "bedrock.jsonl")
+        recorder = CassetteClient(LiveClient(), Cassette(path), "record")
+        
+        body = recorder.invoke_model(modelId="claude", body=b'{"image": "..."}')["body"].read()
+        assert b"panic" in body, "The caller still gets the live response"
+        assert stream_text(recorder.converse_stream(**juror, messages=["plea 1"])) == "Objection sustained - GRANTED"
+        assert stream_text(recorder.converse_stream(**juror, messages=["plea 2"]), stop_after=1) == "Objection"
+        try:
+            recorder.converse(**juror, messages=["plea 1"])
+            assert False, "Errors pass through"
+        except ClientError:
+            pass
+        assert recorder.meta == "live client meta", "Everything else reaches the real client"
+        try:
+            stream_text(recorder.converse_stream(**juror, messages=["overloaded"]))
+            assert False, "Stream errors pass through"
+        except EventStreamError:
+            pass
+        for event in recorder.converse_stream(**juror, messages=["plea 3"])["stream"]:
+            break  # Dropped without close()
+        
+        entries = [json.loads(line) for line in open(path)]
+        print(f"Recorded: {[(e['operation'], len(e.get('events', []))) for e in entries]}")
+        assert len(entries) == 6 and not entries[1]["partial"], "A stream that ran to the end is complete"
+        assert entries[2]["partial"], "A stream closed early is kept as far as it got"
+        assert entries[4]["partial"] and entries[4]["stream_error"]["code"] == "modelStreamErrorException"
+        assert entries[5]["partial"] and len(entries[5]["events"]) == 1, "So is one dropped mid-way"
+        assert all(offset >= 0.02 for offset, _ in entries[1]["events"]), "Events keep their timing"
+        
+        replay = CassetteClient(None, Cassette(path).load(), "replay", latency="recorded")
+        started = time.perf_counter()
+        assert replay.invoke_model(modelId="claude", body=b'{"image": "..."}')["body"].read() == body
+        assert stream_text(replay.converse_stream(**juror, messages=["plea 1"])) == "Objection sustained - GRANTED"
+        replayed_in = time.perf_counter() - started
+        print(f"Replayed with recorded latency in {replayed_in * 1000:.0f}ms")
+        assert replayed_in >= 0.1, "Recorded timings are kept"
+        
+        instant = CassetteClient(None, Cassette(path).load(), "replay", latency="instant")
+        started = time.perf_counter()
+        # An unseen plea to the same agent falls back to its recordings, in turn
+        assert stream_text(instant.converse_stream(**juror, messages=["new plea"])) == "Objection sustained - GRANTED"
+        assert stream_text(instant.converse_stream(**juror, messages=["new plea"]), stop_after=1) == "Objection"
+        assert time.perf_counter() - started < 0.02, "Instant replay doesn't wait"
+        try:
+            stream_text(instant.converse_stream(**juror, messages=["plea 2"]))
+            assert False, "A stream recorded partway doesn't replay as complete"
+        except CassetteMiss:
+            pass
+        try:
+            stream_text(instant.converse_stream(**juror, messages=["overloaded"]))
+            assert False, "Recorded stream errors are raised again"
+        except EventStreamError as e:
+            assert e.response["Error"]["Code"] == "modelStreamErrorException"
+        try:
+            instant.converse(**juror, messages=["plea 1"])
+            assert False, "Recorded errors are raised again"
+        except ClientError as e:
+            assert e.response["Error"]["Code"] == "ThrottlingException"
+        try:
+            instant.converse_stream(modelId="claude", system=[{"text": "You are The Gambler"}], messages=[])
+            assert False, "Calls never recorded are a miss"
+        except CassetteMiss:
+            pass
+        print(f"Stats: {instant._cassette.stats()}")
+    print("✅ Bedrock cassettes working correctly!")
+
+
+def test_model_routing():
+    """Test each agent gets its routed model, and jurors move to the fast tier under load."""
+    print("\n🧪 TEST 25: Model Routing")
+    print("-" * 40)
+    
+    import time
+    import threading
+    import agents
+    from model_routing import ModelRouter
+    
+    load = {"waiting": 0, "p95_seconds": 2.0, "samples": 50}
+    router = ModelRouter(
+        "sonnet",
+        routes={"gambler": "haiku", "vision": ""},
+        fast_model_id="haiku",
+        load=lambda: dict(load),
+        queue_depth=4,
+        p95_seconds=12,
+        min_samples=20,
+        hold_seconds=0.1
+    )
+    assert router.routes == {"skeptic": "sonnet", "doctor": "sonnet", "gambler": "haiku",
+                             "judge": "sonnet", "vision": "sonnet"}, "Unset routes use the default model"
+    assert router.model_id("doctor") == "sonnet"
+    
+    load["waiting"] = 5
+    assert router.model_id("doctor") == "haiku", "A backed-up queue moves jurors to the fast tier"
+    assert router.model_id("judge") == "sonnet" and router.model_id("vision") == "sonnet"
+    
+    load.update(waiting=0, p95_seconds=15.0, samples=5)
+    time.sleep(0.1)
+    assert router.model_id("doctor") == "sonnet", "A p95 from too few deliberations is ignored"
+    load["samples"] = 50
+    assert router.model_id("skeptic") == "haiku", "A slow p95 moves jurors to the fast tier"
+    
+    load["p95_seconds"] = 2.0
+    assert router.model_id("skeptic") == "haiku", "Jurors stay on the fast tier for the hold time"
+    time.sleep(0.1)
+    assert router.model_id("skeptic") == "sonnet", "...then move back"
+    stats = router.stats()
+    print(f"Router stats: {stats}")
+    assert stats["downgrades"] == 2 and stats["restores"] == 2
+    
+    try:
+        ModelRouter("sonnet", routes={"bouncer": "haiku"})
+        assert False, "Unknown roles are rejected"
+    except ValueError:
+        pass
+    
+    # Pooled courts switch models on checkout, building new ones off the loop
+    build_bedrock_model = agents.build_bedrock_model
+    model_threads = []
+    
+    def watched_build(*args, **kwargs):
+        model_threads.append(threading.current_thread())
+        return build_bedrock_model(*args, **kwargs)
+    
+    router, agents.model_router = agents.model_router, ModelRouter(
+        "sonnet", routes={}, fast_model_id="haiku", load=lambda: dict(load), queue_depth=4
+    )
+    try:
+        pool = CourtPool(size=1)
+        
+        async def borrow_courts():
+            async with pool.court() as court:
+                assert court["skeptic"].model.get_config()["model_id"] == "sonnet"
+            load["waiting"] = 5
+            agents.build_bedrock_model = watched_build
+            async with pool.court() as busy:
+                assert busy is court
+                return {role: busy[role].model.get_config()["model_id"] for role in ("skeptic", "doctor", "gambler", "judge")}
+        
+        models = asyncio.run(borrow_courts())
+    finally:
+        agents.model_router = router
+        agents.build_bedrock_model = build_bedrock_model
+    print(f"Under load: {models}")
+    assert models == {"skeptic": "haiku", "doctor": "haiku", "gambler": "haiku", "judge": "sonnet"}
+    assert model_threads and threading.main_thread() not in model_threads, "Fast-tier models are built off the event loop"
+    print("✅ Model routing working correctly!")
+
+
 def main():
     print("""
     🎰 ══════════════════════════════════════════ 🎰
@@ -116,6 +1127,27 @@ def main():
     test_desperate_plea()
     test_casual_plea()
     test_with_image_claim()
+    test_async_court()
+    test_court_pool()
+    test_vision_cache()
+    test_stream_court()
+    test_verdict_engine()
+    test_streaming_json_extraction()
+    test_circuit_breaker()
+    test_hedged_requests()
+    test_stage_metrics()
+    test_token_accounting()
+    test_mock_latency()
+    test_fake_bedrock()
+    test_plea_cache()
+    test_prompt_cache()
+    test_shared_cache()
+    test_image_ingestion()
+    test_admission_control()
+    test_single_flight()
+    test_verdict_log()
+    test_bedrock_cassette()
+    test_model_routing()
     
     print("\n✅ All tests completed!")
     print("\nTo run with real AWS Bedrock, use: python test_court.py --live")
@@ -0,0 +1,126 @@
+"""
+Lucky Loo - Token Accounting
+Input/output token counts for every agent in the Court (skeptic, doctor,
+gambler, judge) and the vision call - cumulative for the process and per
+deliberation.
+
+Counts come from Bedrock's usage reports. Input tokens served from the
+prompt cache (read) or stored in it (write) are counted separately from
+the uncached input. A streamed call that the Court
+cuts off as soon as its JSON closes never gets that report, so its tokens
+are estimated from the text instead and flagged as estimated.
+
+Usage:
+    with request_usage() as usage:        # once per deliberation
+        ...
+        token_ledger.record("doctor", input_tokens, output_tokens)
+    print(format_usage(usage))
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+# Rough characters-per-token for Claude on English text
+CHARS_PER_TOKEN = 4
+
+
+# Counters kept for every agent
+USAGE_FIELDS = (
+    "calls", "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens", "estimated_calls"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of some text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+# Usage for the deliberation running in the current context. The dict is
+# shared (not copied) with worker threads and tool tasks, so every agent's
+# calls land in the same place.
+_request_usage: ContextVar[Optional[dict]] = ContextVar("request_usage", default=None)
+
+
+@contextmanager
+def request_usage():
+    """Collect token usage for the duration of one deliberation."""
+    usage = {}
+    token = _request_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _request_usage.reset(token)
+
+
+class TokenLedger:
+    """Thread-safe token counters, one entry per agent."""
+
+    def __init__(self):
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _add(table: dict, agent: str, counts: dict):
+        entry = table.setdefault(agent, dict.fromkeys(USAGE_FIELDS, 0))
+        for key, value in counts.items():
+            entry[key] += value
+
+    def record(
+        self,
+        agent: str,
+        input_tokens: int,
+        output_tokens: int,
+        estimated: bool = False,
+        cache_read: int = 0,
+        cache_write: int = 0
+    ):
+        """Count one model call against an agent (and the current deliberation)."""
+        counts = {
+            "calls": 1,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_read_tokens": cache_read,
+            "cache_write_tokens": cache_write,
+            "estimated_calls": int(estimated),
+        }
+        with self._lock:
+            self._add(self._totals, agent, counts)
+            usage = _request_usage.get()
+            if usage is not None:
+                self._add(usage, agent, counts)
+
+    def stats(self) -> dict:
+        """Cumulative counters per agent, plus a total and the prompt cache hit rate."""
+        with self._lock:
+            agents = {agent: dict(entry) for agent, entry in self._totals.items()}
+        total = dict.fromkeys(USAGE_FIELDS, 0)
+        for entry in agents.values():
+            for key in total:
+                total[key] += entry[key]
+        cached = total["cache_read_tokens"] + total["cache_write_tokens"] + total["input_tokens"]
+        total["cache_hit_rate"] = round(total["cache_read_tokens"] / cached, 3) if cached else 0.0
+        return {"agents": agents, "total": total}
+
+
+def format_usage(usage: dict) -> str:
+    """
+    One log line for a deliberation's usage, e.g.
+    'doctor in=812 out=143, judge ~in=400 out=260 cache_r=1650 cache_w=0'.
+    """
+    if not usage:
+        return "none"
+    
+    parts = []
+    for agent, entry in usage.items():
+        part = f"{agent} {'~' if entry['estimated_calls'] else ''}in={entry['input_tokens']} out={entry['output_tokens']}"
+        if entry["cache_read_tokens"] or entry["cache_write_tokens"]:
+            part += f" cache_r={entry['cache_read_tokens']} cache_w={entry['cache_write_tokens']}"
+        parts.append(part)
+    return ", ".join(parts)
+
+
+# Process-wide ledger shared by every court
+token_ledger = TokenLedger()
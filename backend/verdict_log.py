@@ -0,0 +1,314 @@
+"""
+Lucky Loo - Verdict Log
+An append-only record of every deliberation (a hash of its inputs, the
+juror votes, the verdict and the stage timings) in a SQLite file, plus
+running aggregates for GET /api/stats.
+
+Requests never touch the database: record() drops the entry on a queue
+and a background thread writes entries in batches, one transaction per
+batch. The same transaction bumps a small table of counters (verdicts,
+votes, latency histogram buckets), so stats are read from a few hundred
+rows no matter how long the log grows - and, the file being shared, they
+cover every worker process.
+
+    VERDICT_LOG_PATH            SQLite file ("off" = no log, empty = data/ next to this file)
+    VERDICT_LOG_BATCH           Most entries written per transaction
+    VERDICT_LOG_FLUSH_INTERVAL  Longest an entry waits to be written, in seconds
+    VERDICT_LOG_QUEUE_SIZE      Entries buffered before new ones are dropped
+"""
+
+import os
+import json
+import math
+import time
+import queue
+import sqlite3
+import threading
+from typing import Optional
+
+
+# Anchored to the backend, not the working directory, so every worker (and
+# every way of starting the API) writes the same log
+VERDICT_LOG_PATH = os.getenv("VERDICT_LOG_PATH") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "verdict_log.sqlite3"
+)
+VERDICT_LOG_BATCH = int(os.getenv("VERDICT_LOG_BATCH", "64"))
+VERDICT_LOG_FLUSH_INTERVAL = float(os.getenv("VERDICT_LOG_FLUSH_INTERVAL", "1"))
+VERDICT_LOG_QUEUE_SIZE = int(os.getenv("VERDICT_LOG_QUEUE_SIZE", "10000"))
+
+# Latency histogram buckets grow 10% at a time from 1ms, so percentiles read
+# from them are within 10%. The last bucket catches everything slower.
+LATENCY_BASE = 0.001
+LATENCY_GROWTH = 1.1
+LATENCY_BUCKETS = 150  # Up to ~27 minutes
+
+JURORS = ("skeptic", "doctor", "gambler")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    id INTEGER PRIMARY KEY,
+    logged_at REAL NOT NULL,
+    inputs_hash TEXT NOT NULL,
+    has_image INTEGER NOT NULL,
+    verdict TEXT NOT NULL,
+    skeptic TEXT,
+    doctor TEXT,
+    gambler TEXT,
+    latency_seconds REAL NOT NULL,
+    stages TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verdict_counts (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (name, key)
+);
+"""
+
+
+def latency_bucket(seconds: float) -> int:
+    """Index of the histogram bucket a latency falls in."""
+    if seconds <= LATENCY_BASE:
+        return 0
+    index = math.ceil(math.log(seconds / LATENCY_BASE, LATENCY_GROWTH))
+    return min(index, LATENCY_BUCKETS - 1)
+
+
+def bucket_bound(index: int) -> float:
+    """Upper bound of a histogram bucket, in seconds."""
+    return LATENCY_BASE * LATENCY_GROWTH ** index
+
+
+def percentiles_ms(buckets: dict, pcts: tuple = (50, 95, 99)) -> dict:
+    """Percentiles (ms) from {bucket index: count}, each the bound of its bucket."""
+    total = sum(buckets.values())
+    if not total:
+        return {f"p{pct}": 0.0 for pct in pcts}
+    report = {}
+    ordered = sorted(buckets.items())
+    for pct in pcts:
+        rank, seen = math.ceil(total * pct / 100), 0
+        for index, count in ordered:
+            seen += count
+            if seen >= rank:
+                report[f"p{pct}"] = round(bucket_bound(index) * 1000, 1)
+                break
+    return report
+
+
+def counter_updates(entry: dict) -> list:
+    """The (name, key) counters one logged deliberation bumps."""
+    updates = [("verdict", entry["verdict"]), ("latency", str(latency_bucket(entry["latency_seconds"])))]
+    for juror in JURORS:
+        if entry["jury_votes"].get(juror):
+            updates.append((f"vote:{juror}", entry["jury_votes"][juror]))
+    for stage, seconds in entry["stages"].items():
+        updates.append((f"stage:{stage}", str(latency_bucket(seconds))))
+    return updates
+
+
+class VerdictLog:
+    """
+    Batched, off-request-path writer for the verdict log.
+
+    Usage:
+        verdict_log.record(inputs_hash, result, timings, latency_seconds, has_image)
+        verdict_log.stats()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = VERDICT_LOG_BATCH,
+        flush_interval: float = VERDICT_LOG_FLUSH_INTERVAL,
+        queue_size: int = VERDICT_LOG_QUEUE_SIZE
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {"logged": 0, "written": 0, "batches": 0, "dropped": 0, "write_errors": 0}
+        self._stats_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Recording (request path)
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        inputs_hash: str,
+        result: dict,
+        stages: dict,
+        latency_seconds: float,
+        has_image: bool = False
+    ):
+        """Queue one deliberation for the log. Never blocks."""
+        entry = {
+            "logged_at": time.time(),
+            "inputs_hash": inputs_hash,
+            "has_image": has_image,
+            "verdict": result.get("verdict", "DENIED"),
+            "jury_votes": dict(result.get("jury_votes") or {}),
+            "latency_seconds": latency_seconds,
+            "stages": dict(stages),
+        }
+        self._start_writer()
+        try:
+            self._queue.put_nowait(entry)
+            self._count("logged")
+        except queue.Full:
+            self._count("dropped")
+
+    def _count(self, name: str, value: int = 1):
+        with self._stats_lock:
+            self._stats[name] += value
+
+    def _start_writer(self):
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="verdict-log", daemon=True)
+                self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Writing (background thread)
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._local.db = db
+        return db
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            batch = [entry]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._write(batch)
+                    return
+                batch.append(entry)
+            self._write(batch)
+
+    def _write(self, batch: list):
+        counts = {}
+        for entry in batch:
+            for update in counter_updates(entry):
+                counts[update] = counts.get(update, 0) + 1
+
+        try:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(
+                    """
+                    INSERT INTO verdicts (logged_at, inputs_hash, has_image, verdict, skeptic, doctor,
+                                          gambler, latency_seconds, stages)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            entry["logged_at"], entry["inputs_hash"], int(entry["has_image"]), entry["verdict"],
+                            *(entry["jury_votes"].get(juror) for juror in JURORS),
+                            entry["latency_seconds"], json.dumps(entry["stages"])
+                        )
+                        for entry in batch
+                    ]
+                )
+                db.executemany(
+                    """
+                    INSERT INTO verdict_counts (name, key, count) VALUES (?, ?, ?)
+                    ON CONFLICT (name, key) DO UPDATE SET count = count + excluded.count
+                    """,
+                    [(name, key, count) for (name, key), count in counts.items()]
+                )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            print(f"⚠️ Verdict log write failed, {len(batch)} entries lost: {e}")
+            self._count("write_errors")
+            return
+
+        self._count("written", len(batch))
+        self._count("batches")
+
+    def close(self):
+        """Write everything still queued, then stop the writer."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+
+    # ------------------------------------------------------------------
+    # Aggregates
+    # ------------------------------------------------------------------
+
+    def counters(self) -> dict:
+        """All counters as {name: {key: count}}."""
+        try:
+            rows = self._connection().execute("SELECT name, key, count FROM verdict_counts").fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️ Verdict log unavailable: {e}")
+            rows = []
+        counters = {}
+        for name, key, count in rows:
+            counters.setdefault(name, {})[key] = count
+        return counters
+
+    def stats(self) -> dict:
+        """Grant rate, vote distribution and latency percentiles over the whole log."""
+        counters = self.counters()
+        verdicts = counters.get("verdict", {})
+        total = sum(verdicts.values())
+
+        def histogram(name: str) -> dict:
+            return {int(key): count for key, count in counters.get(name, {}).items()}
+
+        with self._stats_lock:
+            log = {**self._stats, "pending": self._queue.qsize(), "path": self.path}
+
+        return {
+            "deliberations": total,
+            "grant_rate": round(verdicts.get("GRANTED", 0) / total, 3) if total else 0.0,
+            "verdicts": verdicts,
+            "votes": {juror: counters.get(f"vote:{juror}", {}) for juror in JURORS},
+            "latency_ms": percentiles_ms(histogram("latency")),
+            "stages_ms": {
+                name.split(":", 1)[1]: percentiles_ms(histogram(name))
+                for name in sorted(counters) if name.startswith("stage:")
+            },
+            "log": log,
+        }
+
+
+def open_verdict_log() -> Optional[VerdictLog]:
+    """The process-wide verdict log, or None when it's turned off."""
+    if VERDICT_LOG_PATH == "off":
+        return None
+    return VerdictLog(VERDICT_LOG_PATH)
+
+
+# Process-wide log used by the API
+verdict_log = open_verdict_log()
@@ -1,13 +1,36 @@
 """
 Lucky Loo - Vision Analysis Module
 Uses Claude 3's vision capabilities via Bedrock to analyze "desperation faces"
+
+Also home to the image preprocessing stage that shrinks webcam frames
+before they are sent to the model. Frames travel through the Court as raw
+bytes; they are base64-encoded once, when the Bedrock request is built.
 """
 
+import io
 import os
 import json
 import base64
-import boto3
+import asyncio
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from bedrock_gateway import get_bedrock_runtime
+
+
+# Preprocessing - longest edge sent to the model, JPEG re-encode quality,
+# and how many frames may be processed at once
+IMAGE_MAX_EDGE = int(os.getenv("IMAGE_MAX_EDGE", "768"))
+IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "80"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+# Largest image accepted from a client, in bytes (before any base64 encoding)
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(5 * 1024 * 1024)))
+
+# Pillow releases the GIL while decoding and resizing, so threads are enough
+_image_pool = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image-prep")
 
 
 def analyze_desperation_face(
@@ -30,11 +53,8 @@ def analyze_desperation_face(
     """
     region = region or os.getenv("AWS_REGION", "us-east-1")
     
-    # Initialize Bedrock runtime client
-    bedrock = boto3.client(
-        service_name="bedrock-runtime",
-        region_name=region
-    )
+    # Pooled client from the shared gateway (built once per region)
+    bedrock = get_bedrock_runtime(region)
     
     # Build the message with vision
     message = {
@@ -44,7 +64,7 @@ def analyze_desperation_face(
                 "type": "image",
                 "source": {
                     "type": "base64",
-                    "media_type": "image/jpeg",  # Adjust based on actual image type
+                    "media_type": get_image_media_type(image_base64),
                     "data": image_base64
                 }
             },
@@ -135,6 +155,99 @@ def get_image_media_type(image_base64: str) -> str:
         return "image/jpeg"  # Default to JPEG
 
 
+# ============================================================================
+# IMAGE PREPROCESSING
+# ============================================================================
+
+def strip_data_url(image_base64: str) -> str:
+    """Drop a `data:image/...;base64,` prefix if the client left one on."""
+    if image_base64.startswith("data:") and "," in image_base64:
+        return image_base64.split(",", 1)[1]
+    return image_base64
+
+
+def decode_image(image_base64: str) -> bytes:
+    """
+    Decode a base64 image (a data URL is also accepted) to raw bytes.
+    
+    Raises:
+        ValueError: if the data isn't base64 (binascii.Error is one)
+    """
+    # Line breaks are fine (MIME-wrapped base64), anything else outside the
+    # alphabet is rejected rather than skipped over into garbage bytes
+    image_base64 = "".join(strip_data_url(image_base64).split())
+    return base64.b64decode(image_base64 + "=" * (-len(image_base64) % 4), validate=True)
+
+
+def sniff_media_type(image: bytes) -> str:
+    """Detect image type from its leading magic bytes."""
+    if image.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    elif image.startswith(b"\x89PNG"):
+        return "image/png"
+    elif image.startswith(b"GIF8"):
+        return "image/gif"
+    elif image.startswith(b"RIFF") and image[8:12] == b"WEBP":
+        return "image/webp"
+    else:
+        return "image/jpeg"  # Default to JPEG
+
+
+def preprocess_image(
+    image: bytes,
+    max_edge: int = None,
+    quality: int = None
+) -> tuple:
+    """
+    Prepare a webcam frame for the vision model.
+    
+    Sniffs the image's real format, downscales it so the longest edge is
+    at most `max_edge` and re-encodes it as JPEG. Frames that are already
+    small JPEGs are passed through untouched (no copy is made), as is
+    anything Pillow can't decode (the model call will report on it).
+    
+    Args:
+        image: Raw image bytes
+        max_edge: Longest edge in pixels (defaults to IMAGE_MAX_EDGE)
+        quality: JPEG quality 1-95 (defaults to IMAGE_JPEG_QUALITY)
+    
+    Returns:
+        (image bytes, media_type) ready for the Bedrock request
+    """
+    max_edge = max_edge or IMAGE_MAX_EDGE
+    quality = quality or IMAGE_JPEG_QUALITY
+    
+    media_type = sniff_media_type(image)
+    
+    try:
+        with Image.open(io.BytesIO(image)) as frame:
+            if max(frame.size) <= max_edge and frame.format == "JPEG":
+                return image, "image/jpeg"
+            
+            # JPEG can decode straight to a reduced size, skipping most of the work
+            frame.draft("RGB", (max_edge, max_edge))
+            frame = frame.convert("RGB")
+            frame.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            
+            output = io.BytesIO()
+            frame.save(output, format="JPEG", quality=quality, optimize=True)
+    except Exception as e:
+        print(f"Image preprocessing skipped: {e}")
+        return image, media_type
+    
+    encoded = output.getvalue()
+    if len(encoded) >= len(image) and media_type == "image/jpeg":
+        return image, media_type
+    
+    return encoded, "image/jpeg"
+
+
+async def preprocess_image_async(image: bytes) -> tuple:
+    """Run preprocess_image on the image worker pool, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_image_pool, preprocess_image, image)
+
+
 # Mock response for testing without AWS
 MOCK_VISION_RESPONSES = [
     {
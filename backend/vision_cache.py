@@ -0,0 +1,216 @@
+"""
+Lucky Loo - Vision Cache
+Remembers recent face analyses so retries with the same (or a nearly
+identical) webcam frame skip the Bedrock vision round-trip.
+
+Frames are keyed on a 64-bit difference hash (dHash) of the decoded image.
+Two frames whose hashes differ in at most `max_distance` bits are treated
+as the same face. Images that can't be decoded fall back to an exact hash
+of their bytes.
+
+With SHARED_CACHE_PATH set, analyses are also written to the shared store
+so every worker process can reuse them. Its entries are indexed by each
+byte of the hash: two hashes at most 7 bits apart share at least one byte,
+so near-duplicates are found there too (for max_distance up to 7).
+"""
+
+import io
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from PIL import Image
+
+from shared_cache import SharedStore, open_shared_store
+
+
+VISION_CACHE_ENABLED = os.getenv("VISION_CACHE_ENABLED", "true").lower() == "true"
+VISION_CACHE_SIZE = int(os.getenv("VISION_CACHE_SIZE", "256"))
+VISION_CACHE_TTL = float(os.getenv("VISION_CACHE_TTL", "300"))
+VISION_CACHE_MAX_DISTANCE = int(os.getenv("VISION_CACHE_MAX_DISTANCE", "6"))
+
+
+# ============================================================================
+# HASHING
+# ============================================================================
+
+def perceptual_hash(image_bytes: bytes) -> Optional[int]:
+    """
+    Compute a 64-bit difference hash of an image.
+
+    The image is shrunk to 9x8 grayscale and each bit records whether a pixel
+    is brighter than its right-hand neighbour, so small changes in lighting,
+    compression or framing barely move the hash.
+
+    Returns:
+        The hash as an int, or None if the bytes aren't a decodable image.
+    """
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image.draft("L", (64, 64))  # Let JPEG decode at reduced size
+            pixels = image.convert("L").resize((9, 8), Image.BILINEAR).tobytes()
+    except Exception:
+        return None
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def image_cache_key(image: bytes) -> tuple:
+    """
+    Build a cache key for a raw image.
+
+    Returns:
+        ("phash", int) for decodable images, ("exact", str) otherwise.
+    """
+    phash = perceptual_hash(image) if image else None
+    if phash is not None:
+        return ("phash", phash)
+    return ("exact", hashlib.sha256(image).hexdigest())
+
+
+def _store_key(key: tuple) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def _hash_chunks(key: tuple) -> list:
+    """The eight bytes of a perceptual hash as shared-store index keys."""
+    if key[0] != "phash":
+        return []
+    return [f"{i}:{(key[1] >> (8 * i)) & 0xFF}" for i in range(8)]
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class VisionCache:
+    """
+    Thread-safe LRU + TTL cache of vision analyses keyed on image hashes.
+
+    Lookups first try an exact key match, then scan for a perceptual hash
+    within `max_distance` bits. The cache is small, so the scan is cheap
+    next to a model call. A local miss falls back to the shared store, if any.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = VISION_CACHE_SIZE,
+        ttl_seconds: float = VISION_CACHE_TTL,
+        max_distance: int = VISION_CACHE_MAX_DISTANCE,
+        shared: Optional[SharedStore] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self.shared = shared
+        self._entries = OrderedDict()  # key -> (stored_at, result)
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0, "near_hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0, "expirations": 0
+        }
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return now - stored_at > self.ttl_seconds
+
+    def get(self, key: tuple) -> Optional[dict]:
+        """Look up a cached analysis for an exact or near-duplicate image."""
+        now = time.monotonic()
+
+        with self._lock:
+            match = None
+            entry = self._entries.get(key)
+            if entry is not None:
+                match = key
+            elif key[0] == "phash" and self.max_distance > 0:
+                for other in self._entries:
+                    if other[0] == "phash" and hamming_distance(other[1], key[1]) <= self.max_distance:
+                        match = other
+                        break
+
+            if match is not None:
+                stored_at, result = self._entries[match]
+                if not self._expired(stored_at, now):
+                    self._entries.move_to_end(match)
+                    self._stats["hits" if match == key else "near_hits"] += 1
+                    return dict(result)
+                del self._entries[match]
+                self._stats["expirations"] += 1
+
+        result = self._get_shared(key) if self.shared is not None else None
+        with self._lock:
+            self._stats["shared_hits" if result is not None else "misses"] += 1
+        return result
+
+    def _get_shared(self, key: tuple) -> Optional[dict]:
+        """Look an image up in the shared store, copying any hit into this process."""
+        try:
+            entry = self.shared.get(_store_key(key))
+            if entry is None and key[0] == "phash" and self.max_distance > 0:
+                for candidate in self.shared.candidates(_hash_chunks(key)).values():
+                    if hamming_distance(int(candidate["hash"]), key[1]) <= self.max_distance:
+                        entry = candidate
+                        break
+        except sqlite3.Error as e:
+            print(f"⚠️ Shared vision cache unavailable: {e}")
+            return None
+
+        if entry is None:
+            return None
+        self._put_local(key, entry["result"])
+        return dict(entry["result"])
+
+    def put(self, key: tuple, result: dict):
+        """Store an analysis here and in the shared store."""
+        self._put_local(key, result)
+        if self.shared is not None:
+            try:
+                self.shared.put(_store_key(key), {"hash": str(key[1]), "result": result}, _hash_chunks(key))
+            except sqlite3.Error as e:
+                print(f"⚠️ Shared vision cache unavailable: {e}")
+
+    def _put_local(self, key: tuple, result: dict):
+        """Store an analysis in this process, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters plus current size."""
+        with self._lock:
+            hits = self._stats["hits"] + self._stats["near_hits"] + self._stats["shared_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "max_distance": self.max_distance,
+                "shared": self.shared is not None,
+            }
+
+
+# Process-wide cache used by agents.analyze_face_with_vision
+vision_cache = VisionCache(shared=open_shared_store("vision", VISION_CACHE_TTL))
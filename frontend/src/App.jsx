@@ -33,6 +33,33 @@ function JuryCard({ member, vote, loading }) {
   )
 }
 
+// Read Server-Sent Events from a fetch() response, calling onEvent(name, data)
+async function readEvents(res, onEvent) {
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+
+    let boundary
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const chunk = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+
+      let event = 'message'
+      let data = ''
+      for (const line of chunk.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim()
+        else if (line.startsWith('data:')) data += line.slice(5).trim()
+      }
+      if (data) onEvent(event, JSON.parse(data))
+    }
+  }
+}
+
 function SlotMachine({ spinning, result }) {
   const symbols = result === 'GRANTED' ? ['✅', '✅', '✅'] : 
                   result === 'DENIED' ? ['❌', '❌', '❌'] : ['🎰', '🎰', '🎰']
@@ -54,6 +81,7 @@ export default function App() {
   const [image, setImage] = useState(null)
   const [loading, setLoading] = useState(false)
   const [verdict, setVerdict] = useState(null)
+  const [votes, setVotes] = useState({})
   const [confetti, setConfetti] = useState(false)
   const [shake, setShake] = useState(false)
   const [demo, setDemo] = useState(false)
@@ -70,16 +98,30 @@ export default function App() {
   const submit = async () => {
     if (!plea.trim()) return
     setLoading(true)
+    setVotes({})
     setStage('deliberating')
 
     try {
-      const res = await fetch('/api/judge', {
+      const res = await fetch('/api/judge/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ plea, image_base64: image, demo_mode: demo })
       })
-      const data = await res.json()
-      await new Promise(r => setTimeout(r, 2500))
+      if (!res.ok) throw new Error(`Court returned ${res.status}`)
+
+      let data = null
+      await readEvents(res, (event, payload) => {
+        if (event === 'juror') {
+          setVotes(v => ({ ...v, [payload.juror]: payload.vote }))
+        } else if (event === 'verdict') {
+          data = { ...payload }
+        } else if (event === 'roast' && data) {
+          data.roast = payload.roast
+        } else if (event === 'error') {
+          throw new Error(payload.detail)
+        }
+      })
+      if (!data) throw new Error('The court adjourned without a verdict')
       
       setVerdict(data)
       setStage('verdict')
@@ -109,6 +151,7 @@ export default function App() {
     setPlea('')
     setImage(null)
     setVerdict(null)
+    setVotes({})
   }
 
   return (
@@ -227,7 +270,14 @@ export default function App() {
           </div>
           
           <div className="grid grid-cols-3 gap-3">
-            {JURY.map(m => <JuryCard key={m.id} member={m} loading={true} />)}
+            {JURY.map(m => (
+              <JuryCard
+                key={m.id}
+                member={m}
+                vote={votes[m.id]?.toUpperCase()}
+                loading={!votes[m.id]}
+              />
+            ))}
           </div>
         </div>
       )}